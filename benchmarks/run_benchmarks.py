@@ -0,0 +1,490 @@
+"""
+Render benchmarks for the shipped templates.
+
+Renders every template in dolze_image_templates/templates with local fixture
+images, so no network access is needed, and reports per template:
+
+- cold render time (first render in a fresh process: fonts, fixture
+  decoding and static layers included)
+- warm p50/p95 render latency
+- peak RSS of the process
+- peak Python heap growth and Python blocks retained by one render
+- encode time and encoded output size
+
+It also reports p50/p95 draw time per component type. Results can be saved
+as a JSON baseline and compared against a later run, e.g. before and after
+a change:
+
+    python benchmarks/run_benchmarks.py --save baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json
+
+Each template runs in its own process by default, so peak RSS and cold
+times are not affected by earlier templates (see --no-isolate).
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import PIL
+from PIL import Image, ImageDraw
+
+from dolze_image_templates import (
+    ImageFetcher,
+    get_encoding_profile,
+    get_font_manager,
+    set_image_fetcher,
+    trace_renders,
+)
+from dolze_image_templates.core.template_registry import get_template_registry
+from dolze_image_templates.data.template_variables import TEMPLATE_VARIABLES_REGISTRY
+
+# Directory the fixture images are generated into
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Fixture served for URLs containing one of SMALL_IMAGE_KEYWORDS...
+LOGO_FIXTURE = "logo.png"
+SMALL_IMAGE_KEYWORDS = ("logo", "avatar", "icon")
+
+# ...and for every other URL
+PHOTO_FIXTURE = "photo.jpg"
+
+# Timed renders per template, after the warm-up renders
+DEFAULT_ITERATIONS = 20
+DEFAULT_WARMUP = 2
+
+# Relative p50 slowdown reported as a regression by --compare
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+# Values for variables the template variables registry has no example for
+SAMPLE_COLOR = "#44EC9D"
+SAMPLE_URL = "https://fixtures.invalid/photo.jpg"
+SAMPLE_LOGO_URL = "https://fixtures.invalid/logo.png"
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+RSS_UNIT_BYTES = 1 if sys.platform == "darwin" else 1024
+
+
+def create_fixtures(fixtures_dir: Path = FIXTURES_DIR) -> None:
+    """
+    Generate the fixture images, if they do not exist yet.
+
+    The images are generated deterministically: a 1600x1200 photo-like JPEG
+    and a 400x400 PNG logo with transparency.
+
+    Args:
+        fixtures_dir: Directory to write the fixtures to
+    """
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+
+    photo_path = fixtures_dir / PHOTO_FIXTURE
+    if not photo_path.exists():
+        rng = np.random.default_rng(0)
+        height, width = 1200, 1600
+        y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+        pixels = np.stack(
+            [
+                128 + 90 * np.sin(x / 170.0) * np.cos(y / 230.0),
+                128 + 90 * np.sin((x + y) / 310.0),
+                128 + 90 * np.cos(x / 120.0 - y / 190.0),
+            ],
+            axis=-1,
+        )
+        pixels += rng.normal(0, 12, pixels.shape)
+        photo = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), "RGB")
+        photo.save(photo_path, quality=90)
+
+    logo_path = fixtures_dir / LOGO_FIXTURE
+    if not logo_path.exists():
+        logo = Image.new("RGBA", (400, 400), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(logo)
+        draw.ellipse((20, 20, 380, 380), fill=(68, 236, 157, 255))
+        draw.rectangle((130, 130, 270, 270), fill=(30, 30, 30, 230))
+        logo.save(logo_path)
+
+
+class FixtureFetcher(ImageFetcher):
+    """Image fetcher that serves local fixture images for every URL."""
+
+    def __init__(self, fixtures_dir: Path = FIXTURES_DIR):
+        """
+        Initialize the fetcher.
+
+        Args:
+            fixtures_dir: Directory containing the fixture images
+        """
+        super().__init__(use_disk_cache=False)
+        self._fixtures = {
+            name: (fixtures_dir / name).read_bytes()
+            for name in (LOGO_FIXTURE, PHOTO_FIXTURE)
+        }
+
+    def fetch_bytes(self, url: str) -> bytes:
+        lowered = url.lower()
+        if any(keyword in lowered for keyword in SMALL_IMAGE_KEYWORDS):
+            return self._fixtures[LOGO_FIXTURE]
+        return self._fixtures[PHOTO_FIXTURE]
+
+
+def sample_variables(template_name: str) -> Dict[str, Any]:
+    """
+    Build the variables a template is benchmarked with.
+
+    Example values come from the template variables registry; variables it
+    has no example for get generic values based on their name.
+
+    Args:
+        template_name: Name of the template
+
+    Returns:
+        Dictionary of template variables
+    """
+    registry = get_template_registry()
+    examples = TEMPLATE_VARIABLES_REGISTRY.get(template_name, {}).get("variables", {})
+    variables: Dict[str, Any] = {}
+    for name in registry.get_template_variables(template_name) or []:
+        if name in examples:
+            variables[name] = examples[name]
+        elif "color" in name:
+            variables[name] = SAMPLE_COLOR
+        elif any(keyword in name for keyword in SMALL_IMAGE_KEYWORDS):
+            variables[name] = SAMPLE_LOGO_URL
+        elif "image" in name:
+            variables[name] = SAMPLE_URL
+        else:
+            variables[name] = f"Sample {name.replace('_', ' ')}"
+    return variables
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of a list of values, interpolating between ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * fraction
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def peak_rss_bytes() -> int:
+    """Get the peak resident set size of this process in bytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT_BYTES
+
+
+def _init_process(fixtures_dir: str, cache_dir: str) -> None:
+    """Point the process at the fixtures, the package fonts and a private cache directory."""
+    tempfile.tempdir = cache_dir
+    set_image_fetcher(FixtureFetcher(Path(fixtures_dir)))
+    get_font_manager()
+
+
+def benchmark_template(
+    template_name: str, iterations: int, warmup: int, encoding: str
+) -> Dict[str, Any]:
+    """
+    Benchmark one template in the current process.
+
+    Args:
+        template_name: Name of the template
+        iterations: Number of timed renders
+        warmup: Number of untimed renders after the cold render
+        encoding: Encoding profile used to measure output size
+
+    Returns:
+        Dictionary of results for the template
+    """
+    registry = get_template_registry()
+    variables = sample_variables(template_name)
+    rss_before = peak_rss_bytes()
+
+    start = time.perf_counter()
+    image = registry.render_template(template_name, variables)
+    cold_ms = (time.perf_counter() - start) * 1000
+    for _ in range(warmup):
+        registry.render_template(template_name, variables)
+
+    render_ms = []
+    with trace_renders() as recorder:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            registry.render_template(template_name, variables)
+            render_ms.append((time.perf_counter() - start) * 1000)
+
+    component_samples: Dict[str, List[float]] = {}
+    for trace in recorder.traces:
+        for component in trace.components:
+            component_samples.setdefault(component.component_type, []).append(
+                component.wall_ms
+            )
+
+    # Allocations are measured on a separate render, as tracing slows it down
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    traced_before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    registry.render_template(template_name, variables)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained_blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, "filename")
+    )
+
+    profile = get_encoding_profile(encoding=encoding)
+    buffer = BytesIO()
+    start = time.perf_counter()
+    profile.save(image, buffer)
+    encode_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "size": list(image.size),
+        "cold_ms": cold_ms,
+        "p50_ms": percentile(render_ms, 0.50),
+        "p95_ms": percentile(render_ms, 0.95),
+        "mean_ms": statistics.fmean(render_ms),
+        "peak_rss_mb": peak_rss_bytes() / (1024 * 1024),
+        "rss_growth_mb": (peak_rss_bytes() - rss_before) / (1024 * 1024),
+        "py_alloc_peak_kb": (traced_peak - traced_before) / 1024,
+        "py_blocks_retained": retained_blocks,
+        "encode_ms": encode_ms,
+        "output_bytes": buffer.tell(),
+        "components": {
+            component_type: {
+                "calls_per_render": len(durations) / iterations,
+                "ms_per_render": sum(durations) / iterations,
+            }
+            for component_type, durations in component_samples.items()
+        },
+        "_component_samples": component_samples,
+    }
+
+
+def _benchmark_task(args: tuple) -> Dict[str, Any]:
+    """Worker entry point for benchmark_template."""
+    return benchmark_template(*args)
+
+
+def run_benchmarks(
+    template_names: List[str],
+    iterations: int = DEFAULT_ITERATIONS,
+    warmup: int = DEFAULT_WARMUP,
+    encoding: str = "png",
+    isolate: bool = True,
+) -> Dict[str, Any]:
+    """
+    Benchmark several templates.
+
+    Args:
+        template_names: Names of the templates to benchmark
+        iterations: Number of timed renders per template
+        warmup: Number of untimed renders per template after the cold render
+        encoding: Encoding profile used to measure output size
+        isolate: Run each template in a fresh process
+
+    Returns:
+        Dictionary with run metadata, per-template and per-component-type results
+    """
+    create_fixtures()
+    tasks = [(name, iterations, warmup, encoding) for name in template_names]
+
+    with tempfile.TemporaryDirectory(prefix="dolze-bench-") as cache_dir:
+        init_args = (str(FIXTURES_DIR), cache_dir)
+        if isolate:
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(
+                1, initializer=_init_process, initargs=init_args, maxtasksperchild=1
+            ) as pool:
+                results = pool.map(_benchmark_task, tasks, chunksize=1)
+        else:
+            _init_process(*init_args)
+            results = [_benchmark_task(task) for task in tasks]
+
+    # Aggregate individual draw times per component type across templates
+    all_samples: Dict[str, List[float]] = {}
+    for result in results:
+        for component_type, durations in result.pop("_component_samples").items():
+            all_samples.setdefault(component_type, []).extend(durations)
+    component_types = {
+        component_type: {
+            "calls": len(durations),
+            "p50_ms": percentile(durations, 0.50),
+            "p95_ms": percentile(durations, 0.95),
+            "total_ms": sum(durations),
+        }
+        for component_type, durations in sorted(all_samples.items())
+    }
+
+    return {
+        "metadata": _run_metadata(iterations, warmup, encoding, isolate),
+        "templates": dict(zip(template_names, results)),
+        "component_types": component_types,
+    }
+
+
+def _run_metadata(
+    iterations: int, warmup: int, encoding: str, isolate: bool
+) -> Dict[str, Any]:
+    """Describe the environment of a benchmark run."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "iterations": iterations,
+        "warmup": warmup,
+        "encoding": encoding,
+        "isolated": isolate,
+    }
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    """Print benchmark results as tables."""
+    print(
+        f"{'template':<26}{'cold ms':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'rss MB':>9}{'alloc KB':>10}{'enc ms':>9}{'out KB':>9}"
+    )
+    for name, r in results["templates"].items():
+        print(
+            f"{name:<26}{r['cold_ms']:>9.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+            f"{r['peak_rss_mb']:>9.1f}{r['py_alloc_peak_kb']:>10.1f}"
+            f"{r['encode_ms']:>9.1f}{r['output_bytes'] / 1024:>9.1f}"
+        )
+
+    print()
+    print(f"{'component type':<26}{'calls':>9}{'p50 ms':>9}{'p95 ms':>9}{'total ms':>11}")
+    for component_type, r in results["component_types"].items():
+        print(
+            f"{component_type:<26}{r['calls']:>9}{r['p50_ms']:>9.2f}"
+            f"{r['p95_ms']:>9.2f}{r['total_ms']:>11.1f}"
+        )
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    results: Dict[str, Any],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> List[str]:
+    """
+    Print the change of each template's results against a baseline.
+
+    Args:
+        baseline: Results of an earlier run
+        results: Results of this run
+        threshold: Relative p50 slowdown reported as a regression
+
+    Returns:
+        Names of the templates whose p50 latency regressed
+    """
+    regressions = []
+    print(
+        f"\nCompared to {baseline['metadata'].get('commit') or 'baseline'}"
+        f" ({baseline['metadata'].get('timestamp')}):"
+    )
+    print(f"{'template':<26}{'p50':>10}{'p95':>10}{'rss':>10}{'out':>10}")
+    for name, r in results["templates"].items():
+        old = baseline["templates"].get(name)
+        if old is None:
+            print(f"{name:<26}{'new':>10}")
+            continue
+        changes = [
+            _relative_change(old[key], r[key])
+            for key in ("p50_ms", "p95_ms", "peak_rss_mb", "output_bytes")
+        ]
+        flag = ""
+        if changes[0] > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<26}" + "".join(f"{c:>+10.1%}" for c in changes) + flag)
+    return regressions
+
+
+def _relative_change(old: float, new: float) -> float:
+    """Relative change from old to new (0 if old is 0)."""
+    return (new - old) / old if old else 0.0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--templates", nargs="+", help="Templates to benchmark (default: all)"
+    )
+    parser.add_argument(
+        "-n", "--iterations", type=int, default=DEFAULT_ITERATIONS,
+        help="Timed renders per template",
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=DEFAULT_WARMUP,
+        help="Untimed renders per template after the cold render",
+    )
+    parser.add_argument(
+        "--encoding", default="png", help="Encoding profile used for output size"
+    )
+    parser.add_argument(
+        "--no-isolate", action="store_true",
+        help="Run all templates in this process (faster, but RSS accumulates)",
+    )
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare against this JSON baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Relative p50 slowdown reported as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    template_names = args.templates or sorted(get_template_registry().get_template_names())
+    results = run_benchmarks(
+        template_names,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        encoding=args.encoding,
+        isolate=not args.no_isolate,
+    )
+    print_report(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} template(s) regressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
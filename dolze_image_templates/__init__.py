@@ -3,50 +3,111 @@ Dolze Templates - A flexible template generation library for creating social med
 
 This package provides a powerful and extensible system for generating images with text, shapes, and other
 components in a template-based approach.
+
+Importing the package has no side effects: submodules are imported, and
+caches, settings and directories are created, the first time they are used.
+Logging is only configured by the package when the DOLZE_LOG_LEVEL
+environment variable is set or setup_logging() is called.
 """
 
 import os
+import sys
 import logging
+import importlib
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Dict, Any, BinaryIO, Tuple, Union
 
-# Version information
-__version__ = "0.1.4"
+if TYPE_CHECKING:
+    from .core import EncodingProfile
 
-# Set up logging
-from .utils.logging_config import setup_logging
+# Version
+__version__ = "0.1.2"
 
-# Default log level (can be overridden by applications using this package)
+# Package metadata
+__author__ = "Dolze Team"
+__email__ = "support@dolze.com"
+__license__ = "MIT"
+__description__ = "A flexible template generation library for creating social media posts, banners, and more."
+
+# Default log level used by setup_logging() (can be overridden by applications using this package)
 LOG_LEVEL = os.environ.get("DOLZE_LOG_LEVEL", "WARNING").upper()
 LOG_LEVEL = getattr(logging, LOG_LEVEL, logging.WARNING)
 
-# Set up logging with default level
-setup_logging(level=LOG_LEVEL)
+# Configure logging on import only when explicitly requested, since it
+# replaces the application's root handlers
+if "DOLZE_LOG_LEVEL" in os.environ:
+    from .utils.logging_config import setup_logging
+
+    setup_logging(level=LOG_LEVEL)
+
+# Public names imported from submodules on first access, as name -> (module, attribute)
+_LAZY_EXPORTS: Dict[str, Tuple[str, str]] = {
+    # Core
+    "Template": (".core", "Template"),
+    "TemplateEngine": (".core", "TemplateEngine"),
+    "TemplateRegistry": (".core", "TemplateRegistry"),
+    "get_template_registry": (".core", "get_template_registry"),
+    "FontManager": (".core", "FontManager"),
+    "EncodingProfile": (".core", "EncodingProfile"),
+    "get_encoding_profile": (".core", "get_encoding_profile"),
+    "register_encoding_profile": (".core", "register_encoding_profile"),
+    "RenderTracer": (".core", "RenderTracer"),
+    "TraceRecorder": (".core", "TraceRecorder"),
+    "set_render_tracer": (".core", "set_render_tracer"),
+    "trace_renders": (".core", "trace_renders"),
+    # Resources
+    "load_image": (".resources", "load_image"),
+    "load_font": (".resources", "load_font"),
+    "clear_cache": (".utils.cache", "clear_cache"),
+    "get_cache_info": (".utils.cache", "get_cache_info"),
+    "ImageFetcher": (".fetcher", "ImageFetcher"),
+    "get_image_fetcher": (".fetcher", "get_image_fetcher"),
+    "set_image_fetcher": (".fetcher", "set_image_fetcher"),
+    # Metrics
+    "get_metrics": (".utils.metrics", "get_metrics"),
+    "get_metrics_snapshot": (".utils.metrics", "get_metrics_snapshot"),
+    "get_prometheus_metrics": (".utils.metrics", "get_prometheus_metrics"),
+    # Components
+    "Component": (".components", "Component"),
+    "TextComponent": (".components", "TextComponent"),
+    "ImageComponent": (".components", "ImageComponent"),
+    "CircleComponent": (".components", "CircleComponent"),
+    "RectangleComponent": (".components", "RectangleComponent"),
+    "CTAButtonComponent": (".components", "CTAButtonComponent"),
+    "FooterComponent": (".components", "FooterComponent"),
+    "create_component_from_config": (".components", "create_component_from_config"),
+    # Configuration
+    "Settings": (".config", "Settings"),
+    "get_settings": (".config", "get_settings"),
+    "configure": (".config", "configure"),
+    "DEFAULT_TEMPLATES_DIR": (".config", "DEFAULT_TEMPLATES_DIR"),
+    "DEFAULT_FONTS_DIR": (".config", "DEFAULT_FONTS_DIR"),
+    "DEFAULT_OUTPUT_DIR": (".config", "DEFAULT_OUTPUT_DIR"),
+    # Logging
+    "setup_logging": (".utils.logging_config", "setup_logging"),
+}
+
 
-# Core functionality
-from .core import (
-    Template,
-    TemplateEngine,
-    TemplateRegistry,
-    get_template_registry,
-    FontManager,
-    get_font_manager as _get_font_manager,
-)
+def __getattr__(name: str) -> Any:
+    """Import a public name from its submodule on first access."""
+    try:
+        module_name, attribute = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    # Cache on the module so later lookups skip __getattr__
+    globals()[name] = value
+    return value
 
 
-# Initialize font manager with the package's fonts directory
-import os
-import sys
-from pathlib import Path
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 # Get the absolute path to the package directory
 package_dir = Path(os.path.abspath(os.path.dirname(__file__)))
 fonts_dir = package_dir / "fonts"
 
-# Debug information
-print(f"[DEBUG] Package directory: {package_dir}")
-print(f"[DEBUG] Fonts directory: {fonts_dir}")
-print(f"[DEBUG] Fonts directory exists: {fonts_dir.exists()}")
-
 
 # Create a new get_font_manager function that uses the package's fonts directory
 def get_font_manager():
@@ -79,24 +140,23 @@ def get_font_manager():
         ),  # User site-packages
     ]
 
+    from .core import get_font_manager as _get_font_manager
+
+    logger = logging.getLogger(__name__)
+
     # Find the first existing fonts directory
     for font_dir in possible_font_dirs:
         if os.path.isdir(font_dir):
-            print(f"[DEBUG] Using fonts from: {font_dir}")
+            logger.debug(f"Using fonts from: {font_dir}")
             return _get_font_manager(font_dir)
 
     # If no directory found, use the default one and log a warning
-    print(
-        f"[WARNING] No fonts directory found in any standard location. Using: {fonts_dir}"
+    logger.warning(
+        f"No fonts directory found in any standard location. Using: {fonts_dir}"
     )
     return _get_font_manager(str(fonts_dir.absolute()))
 
 
-from typing import Optional, Dict, Any, Union
-
-# Import template variables function
-
-
 def get_all_image_templates() -> list[str]:
     """
     Get a list of all available template names.
@@ -104,6 +164,8 @@ def get_all_image_templates() -> list[str]:
     Returns:
         List[str]: A list of all available template names
     """
+    from .core import get_template_registry
+
     return get_template_registry().get_all_templates()
 
 
@@ -114,7 +176,10 @@ def render_template(
     return_bytes: bool = True,
     output_dir: str = "output",
     output_path: Optional[str] = None,
-) -> Union[bytes, str]:
+    encoding: Optional[Union[str, "EncodingProfile"]] = None,
+    output_stream: Optional[BinaryIO] = None,
+    return_memoryview: bool = False,
+) -> Union[bytes, str, memoryview, BinaryIO]:
     """
     Render a template with the given variables.
 
@@ -128,9 +193,16 @@ def render_template(
         return_bytes: If True, returns the image as bytes instead of saving to disk
         output_dir: Directory to save the rendered image (used if return_bytes is False and output_path is None)
         output_path: Full path to save the rendered image. If None and return_bytes is False, a path will be generated.
+        encoding: Encoding profile name (e.g. 'png-fast', 'png-palette', 'jpeg', 'webp')
+            or EncodingProfile, overriding output_format
+        output_stream: Writable binary file object or connected socket to encode the
+            image into directly (e.g. an HTTP response body), instead of returning it
+        return_memoryview: With return_bytes, return a memoryview of the encoded buffer
+            instead of copying it into bytes
 
     Returns:
-        If return_bytes is True: Image bytes
+        If output_stream is given: output_stream
+        If return_bytes is True: Image bytes (or a memoryview of them)
         If return_bytes is False: Path to the rendered image
 
     Example:
@@ -157,6 +229,8 @@ def render_template(
             f.write(image_bytes)
         ```
     """
+    from .core import TemplateEngine
+
     engine = TemplateEngine(output_dir=output_dir)
     return engine.render_template(
         template_name=template_name,
@@ -164,52 +238,22 @@ def render_template(
         output_path=output_path if not return_bytes else None,
         output_format=output_format,
         return_bytes=return_bytes,
+        encoding=encoding,
+        output_stream=output_stream,
+        return_memoryview=return_memoryview,
     )
 
 
-# Resource management and caching
-from .resources import load_image, load_font
-from .utils.cache import clear_cache, get_cache_info
-
-# Components
-from .components import (
-    Component,
-    TextComponent,
-    ImageComponent,
-    CircleComponent,
-    RectangleComponent,
-    CTAButtonComponent,
-    FooterComponent,
-    create_component_from_config,
-)
-
-# Configuration
-from .config import (
-    Settings,
-    get_settings,
-    configure,
-    DEFAULT_TEMPLATES_DIR,
-    DEFAULT_FONTS_DIR,
-    DEFAULT_OUTPUT_DIR,
-)
-
-# Version
-__version__ = "0.1.2"
-
-
-# Package metadata
-__author__ = "Dolze Team"
-__email__ = "support@dolze.com"
-__license__ = "MIT"
-__description__ = "A flexible template generation library for creating social media posts, banners, and more."
-
-
-# Package-level initialization
 def init() -> None:
     """
     Initialize the Dolze Templates package.
-    This function ensures all required directories exist and performs any necessary setup.
+
+    Creates the configured templates, fonts and output directories. This is
+    no longer done on import; call it if your application relies on them
+    existing up front.
     """
+    from .config import get_settings
+
     logger = logging.getLogger(__name__)
     logger.info("Initializing Dolze Templates package")
 
@@ -223,48 +267,12 @@ def init() -> None:
     logger.debug("Package initialization complete")
 
 
-# Initialize the package when imported
-init()
-
-# Re-export the function for direct import
 __all__ = [
     "get_all_image_templates",
     "render_template",
-    "clear_cache",
-    "get_cache_info",
-    "load_image",
-    "load_font",
     "init",
-]
-
-
-# Clean up namespace
-del init
-
-__all__ = [
-    # Core
-    "Template",
-    "TemplateEngine",
-    "TemplateRegistry",
-    "get_template_registry",
-    "FontManager",
     "get_font_manager",
-    # Components
-    "Component",
-    "TextComponent",
-    "ImageComponent",
-    "CircleComponent",
-    "RectangleComponent",
-    "CTAButtonComponent",
-    "FooterComponent",
-    "create_component_from_config",
-    # Configuration
-    "Settings",
-    "get_settings",
-    "configure",
-    "DEFAULT_TEMPLATES_DIR",
-    "DEFAULT_FONTS_DIR",
-    "DEFAULT_OUTPUT_DIR",
+    *_LAZY_EXPORTS,
     # Metadata
     "__version__",
     "__author__",
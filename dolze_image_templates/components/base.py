@@ -1,14 +1,152 @@
 """
 Base component module containing the abstract Component class.
 """
+import copy
+import math
 from abc import ABC, abstractmethod
-from typing import Tuple, Dict, Any
-from PIL import Image
+from typing import Tuple, Dict, Any, Iterable, List, Optional, Union
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+# A pixel region (left, top, right, bottom); right and bottom are exclusive
+Box = Tuple[int, int, int, int]
+
+# A color as drawn: an RGB or RGBA tuple (alpha 0-255) or a color string
+Color = Union[Tuple[int, ...], str]
+
+
+def parse_alpha_color(color: Any) -> Any:
+    """
+    Convert a configured RGB or RGBA color list to a color tuple.
+
+    As in validate_color, a fourth element is an alpha from 0.0 to 1.0.
+
+    Args:
+        color: Color from a template configuration
+
+    Returns:
+        (r, g, b), or (r, g, b, a) with a from 0 to 255 if the color is
+        translucent. Values that are not color lists are returned unchanged.
+    """
+    if not isinstance(color, (list, tuple)) or len(color) < 3:
+        return color
+    rgb = tuple(color[:3])
+    if len(color) > 3:
+        alpha = int(max(0.0, min(1.0, float(color[3]))) * 255)
+        if alpha < 255:
+            return rgb + (alpha,)
+    return rgb
+
+
+def _color_tuple(color: Optional[Color]) -> Optional[Tuple[int, ...]]:
+    """Get a color as a tuple, or None if it is not a valid color."""
+    if isinstance(color, str):
+        try:
+            return ImageColor.getrgb(color)
+        except ValueError:
+            return None
+    if isinstance(color, (list, tuple)) and len(color) >= 3:
+        return tuple(color)
+    return None
+
+
+def is_translucent_color(color: Optional[Color]) -> bool:
+    """Check whether a color has an alpha below 255."""
+    rgba = _color_tuple(color)
+    return rgba is not None and len(rgba) > 3 and rgba[3] < 255
+
+
+def with_opacity(color: Optional[Color], opacity: float) -> Optional[Color]:
+    """
+    Scale the alpha of a color by an opacity.
+
+    Args:
+        color: RGB or RGBA tuple or color string
+        opacity: Opacity from 0.0 to 1.0
+
+    Returns:
+        The color, as an RGBA tuple if its alpha changed
+    """
+    rgba = _color_tuple(color)
+    if opacity >= 1.0 or rgba is None:
+        return color
+    alpha = rgba[3] if len(rgba) > 3 else 255
+    return tuple(rgba[:3]) + (int(alpha * opacity),)
+
+
+def fade_image(image: Image.Image, opacity: float) -> Image.Image:
+    """
+    Scale the alpha channel of an RGBA image by an opacity.
+
+    Args:
+        image: RGBA image (not modified)
+        opacity: Opacity from 0.0 to 1.0
+
+    Returns:
+        The image itself if opacity is 1.0, else a faded copy
+    """
+    if opacity >= 1.0:
+        return image
+    faded = image.copy()
+    faded.putalpha(faded.getchannel("A").point(lambda a: int(a * opacity)))
+    return faded
+
+
+def union_box(
+    boxes: Iterable[Tuple[float, float, float, float]],
+    canvas_size: Tuple[int, int],
+) -> Box:
+    """
+    Get the smallest whole-pixel box containing the given boxes, clipped to a canvas.
+
+    Args:
+        boxes: (left, top, right, bottom) boxes, possibly fractional
+        canvas_size: Canvas size (width, height) to clip to
+
+    Returns:
+        The union box, empty (right <= left) if there are no boxes or the
+        union lies outside the canvas
+    """
+    boxes = list(boxes)
+    if not boxes:
+        return (0, 0, 0, 0)
+    left = max(0, math.floor(min(box[0] for box in boxes)))
+    top = max(0, math.floor(min(box[1] for box in boxes)))
+    right = min(canvas_size[0], math.ceil(max(box[2] for box in boxes)))
+    bottom = min(canvas_size[1], math.ceil(max(box[3] for box in boxes)))
+    return (left, top, max(left, right), max(top, bottom))
+
+
+def measure_text(
+    xy: Tuple[float, float], text: str, font: ImageFont.FreeTypeFont
+) -> Tuple[float, float, float, float]:
+    """
+    Get the box draw.text(xy, text, font=font) covers on an RGB or RGBA canvas.
+
+    The box is padded by a pixel on each side, as glyphs are placed at
+    sub-pixel offsets.
+
+    Args:
+        xy: Text position
+        text: Text (may contain newlines)
+        font: Font the text is drawn with
+
+    Returns:
+        (left, top, right, bottom) box
+    """
+    draw = ImageDraw.Draw(Image.new("L", (1, 1)))
+    left, top, right, bottom = draw.textbbox(xy, text, font=font)
+    return (left - 1, top - 1, right + 1, bottom + 1)
 
 
 class Component(ABC):
     """Base class for all template components"""
 
+    # Config fields a compiled template plan may bind into a copy of a
+    # component built from the same config (see bind_fields): field name ->
+    # (attribute it sets, name of the method parsing the config value, or
+    # None to use the value as is)
+    BINDABLE_FIELDS: Dict[str, Tuple[str, Optional[str]]] = {}
+
     def __init__(self, position: Tuple[int, int] = (0, 0)):
         """
         Initialize a component.
@@ -31,6 +169,176 @@ class Component(ABC):
         """
         pass
 
+    def draw(self, image: Image.Image) -> Image.Image:
+        """
+        Draw the component directly onto an image, modifying it in place.
+
+        Template.render uses this to composite all components onto a single
+        canvas. The default falls back to render() so components that only
+        implement render() keep working.
+
+        Args:
+            image: The image to draw the component on
+
+        Returns:
+            The image with the component drawn on it
+        """
+        if self.is_translucent():
+            # Callers composite translucent components through a layer
+            return self.render(image)
+        return self.render_clipped(image)
+
+    def is_translucent(self) -> bool:
+        """
+        Check whether the component draws with any transparency.
+
+        ImageDraw replaces the pixels it draws on an RGBA image rather than
+        blending with them, so Template.render draws translucent components
+        onto a transparent layer and alpha-composites it onto the canvas.
+
+        Returns:
+            True if the component must be composited through a layer
+        """
+        return False
+
+    def get_bounding_box(self, canvas_size: Tuple[int, int]) -> Optional[Box]:
+        """
+        Get the region of the canvas the component may change.
+
+        Args:
+            canvas_size: Size (width, height) of the canvas
+
+        Returns:
+            (left, top, right, bottom) box clipped to the canvas, or None if
+            the component does not know its extent (it is then rendered onto
+            the whole canvas)
+        """
+        return None
+
+    def translated(self, dx: int, dy: int) -> "Component":
+        """
+        Get a copy of the component moved by (dx, dy) pixels.
+
+        The default moves position. Components that place pixels by other
+        absolute coordinates must override this along with get_bounding_box.
+
+        Args:
+            dx: Horizontal offset
+            dy: Vertical offset
+
+        Returns:
+            The moved copy (the component itself is not modified)
+        """
+        moved = copy.copy(self)
+        moved.position = (self.position[0] + dx, self.position[1] + dy)
+        return moved
+
+    def bind_fields(self, values: Dict[str, Any]) -> "Component":
+        """
+        Get a copy of the component with some config fields replaced.
+
+        The result matches building the component from its config with the
+        new values, without parsing the rest of the config again.
+
+        Args:
+            values: New config values, by field name (see BINDABLE_FIELDS)
+
+        Returns:
+            The updated copy (the component itself is not modified)
+        """
+        bound = copy.copy(self)
+        for field, value in values.items():
+            attribute, parser = self.BINDABLE_FIELDS[field]
+            if parser is not None:
+                value = getattr(bound, parser)(value)
+            setattr(bound, attribute, value)
+        return bound
+
+    @staticmethod
+    def _parse_config_color(color: Any) -> Any:
+        """Convert an RGB(A) list from a config, keeping other values as they are"""
+        if color and isinstance(color, (list, tuple)) and len(color) >= 3:
+            return parse_alpha_color(color)
+        return color
+
+    def render_clipped(self, image: Image.Image) -> Image.Image:
+        """
+        Render the component onto an image, copying only its bounding box.
+
+        The box is cropped into a layer, render() draws a translated copy of
+        the component onto the layer, and the layer is pasted back, so the
+        cost of render()'s copy scales with the component's area rather than
+        the canvas's. Without a bounding box this is render(image).
+        Translucent components are alpha-composited through a layer instead
+        (see core.compositing).
+
+        Args:
+            image: The image to render on, modified in place
+
+        Returns:
+            The image with the component rendered on it
+        """
+        if self.is_translucent():
+            # Imported here: core imports the components package
+            from dolze_image_templates.core.compositing import composite_layer
+
+            return composite_layer(image, [self])
+
+        box = self.get_bounding_box(image.size)
+        if box is None:
+            return self.render(image)
+        left, top, right, bottom = box
+        if right <= left or bottom <= top:
+            return image
+
+        layer = self.translated(-left, -top).render(image.crop(box))
+        image.paste(layer, (left, top))
+        return image
+
+    def get_image_urls(self) -> List[str]:
+        """
+        Get the remote image URLs this component still needs to load.
+
+        Template.render fetches these concurrently before drawing and hands
+        the results to set_fetched_images.
+
+        Returns:
+            List of URLs (empty if nothing needs fetching)
+        """
+        return []
+
+    def get_image_target_size(self) -> Optional[Tuple[int, int]]:
+        """
+        Get the size this component's images will be fitted into.
+
+        Oversized images can then be decoded at reduced resolution.
+
+        Returns:
+            Target size (width, height), or None if images are used at full size
+        """
+        return None
+
+    def set_fetched_images(self, images: Dict[str, Optional[Image.Image]]) -> None:
+        """
+        Receive images fetched ahead of rendering.
+
+        Args:
+            images: Dictionary mapping URLs to decoded images (None if the fetch failed)
+        """
+        pass
+
+    def is_cacheable(self) -> bool:
+        """
+        Check whether the component's rendered output can be reused.
+
+        Components that depend on external resources return False until those
+        resources have loaded, so a failed load is never cached.
+
+        Returns:
+            True if rendering again would produce the same pixels
+        """
+        return True
+
     @classmethod
     def from_config(cls, config: Dict[str, Any]) -> 'Component':
         """
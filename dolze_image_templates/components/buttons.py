@@ -4,13 +4,17 @@ Button components for interactive elements in templates.
 
 from typing import Tuple, Optional, Dict, Any
 from PIL import Image, ImageDraw, ImageFont
-from .base import Component
-from dolze_image_templates.core.font_manager import get_font_manager
+from .base import Box, Component, measure_text, union_box
 
 
 class CTAButtonComponent(Component):
     """Component for rendering CTA buttons"""
 
+    BINDABLE_FIELDS = {
+        "text": ("text", None),
+        "url": ("url", None),
+    }
+
     def __init__(
         self,
         text: str,
@@ -51,6 +55,9 @@ class CTAButtonComponent(Component):
     def _get_font(self) -> ImageFont.FreeTypeFont:
         """Get the font for the button text"""
         if self._font is None:
+            # Imported here: core imports the components package
+            from dolze_image_templates.core.font_manager import get_font_manager
+
             font_manager = get_font_manager()
             self._font = font_manager.get_font(self.font_path, self.font_size)
         return self._font
@@ -79,9 +86,28 @@ class CTAButtonComponent(Component):
         draw.rectangle((x1 + radius, y1, x2 - radius, y2), **kwargs)  # Horizontal
         draw.rectangle((x1, y1 + radius, x2, y2 - radius), **kwargs)  # Vertical
 
+    def get_bounding_box(self, canvas_size: Tuple[int, int]) -> Box:
+        """Get the area of the button and its text, which may overflow it"""
+        x, y = self.position
+        width, height = self.size
+        font = self._get_font()
+        text_x = x + (width - font.getlength(self.text)) // 2
+        text_y = y + (height - self.font_size) // 2 - 2
+        return union_box(
+            [
+                (x, y, x + width + 1, y + height + 1),
+                measure_text((text_x, text_y), self.text, font),
+            ],
+            canvas_size,
+        )
+
     def render(self, image: Image.Image) -> Image.Image:
-        """Render a CTA button onto an image"""
-        result = image.copy()
+        """Render a CTA button onto a copy of an image"""
+        return self.draw(image.copy())
+
+    def draw(self, image: Image.Image) -> Image.Image:
+        """Draw a CTA button directly onto an image"""
+        result = image
         draw = ImageDraw.Draw(result, "RGBA")
 
         # Calculate button position and size
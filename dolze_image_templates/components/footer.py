@@ -2,10 +2,10 @@
 Footer component for templates.
 """
 
+import copy
 from typing import Tuple, Optional, Dict, Any
 from PIL import Image, ImageDraw, ImageFont
-from .base import Component
-from dolze_image_templates.core.font_manager import get_font_manager
+from .base import Box, Component, measure_text, union_box
 
 
 class FooterComponent(Component):
@@ -47,16 +47,64 @@ class FooterComponent(Component):
     def _get_font(self) -> ImageFont.FreeTypeFont:
         """Get the font for the footer text"""
         if self._font is None:
+            # Imported here: core imports the components package
+            from dolze_image_templates.core.font_manager import get_font_manager
+
             font_manager = get_font_manager()
             self._font = font_manager.get_font(self.font_path, self.font_size)
         return self._font
 
+    def _placed(self, canvas_size: Tuple[int, int]) -> "FooterComponent":
+        """Get a copy of an auto-positioned footer at its place on a canvas"""
+        left, top, right, bottom = measure_text((0, 0), self.text, self._get_font())
+        # measure_text pads by a pixel on each side
+        text_width = right - left - 2
+        text_height = bottom - top - 2
+        placed = copy.copy(self)
+        placed.position = (
+            (canvas_size[0] - text_width) // 2,
+            canvas_size[1] - text_height - self.padding * 2,
+        )
+        placed._auto_position = False
+        return placed
+
+    def get_bounding_box(self, canvas_size: Tuple[int, int]) -> Box:
+        """Get the area of the footer text and its background"""
+        if not self.text:
+            return (0, 0, 0, 0)
+        if self._auto_position:
+            return self._placed(canvas_size).get_bounding_box(canvas_size)
+
+        font = self._get_font()
+        boxes = [measure_text(self.position, self.text, font)]
+        if self.bg_color is not None:
+            left, top, right, bottom = measure_text((0, 0), self.text, font)
+            x = self.position[0] - self.padding
+            y = self.position[1] - self.padding
+            # The padded text size also covers the rectangle's inclusive edges
+            width = right - left + self.padding * 2
+            height = bottom - top + self.padding * 2
+            boxes.append((x, y, x + width, y + height))
+        return union_box(boxes, canvas_size)
+
+    def render_clipped(self, image: Image.Image) -> Image.Image:
+        """Render the footer onto its region, placing it on the full canvas first"""
+        if self.text and self._auto_position:
+            return self._placed(image.size).render_clipped(image)
+        return super().render_clipped(image)
+
     def render(self, image: Image.Image) -> Image.Image:
-        """Render a footer onto an image"""
+        """Render a footer onto a copy of an image"""
+        if not self.text:
+            return image
+        return self.draw(image.copy())
+
+    def draw(self, image: Image.Image) -> Image.Image:
+        """Draw a footer directly onto an image"""
         if not self.text:
             return image
 
-        result = image.copy()
+        result = image
         draw = ImageDraw.Draw(result)
 
         # Get the font
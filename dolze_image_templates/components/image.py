@@ -1,9 +1,23 @@
 import os
 import requests
-from io import BytesIO
-from typing import Tuple, Optional, Dict, Any, Union
+from typing import Tuple, Optional, Dict, Any, List, Union
 from PIL import Image, ImageOps, ImageDraw
-from .base import Component
+from .base import Box, Component, union_box
+from dolze_image_templates.fetcher import get_image_fetcher, is_remote_url
+from dolze_image_templates.utils.image_utils import open_image
+from dolze_image_templates.utils.cache import (
+    LRUCache,
+    image_nbytes,
+    register_memory_cache,
+)
+
+# Maximum memory used by cached image tiles (resized, masked and bordered images)
+IMAGE_TILE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# Finished tiles ready to paste, keyed by source and appearance
+_tiles = register_memory_cache(
+    "image_tile", LRUCache(max_bytes=IMAGE_TILE_CACHE_MAX_BYTES, sizeof=image_nbytes)
+)
 
 
 class ImageComponent(Component):
@@ -13,6 +27,11 @@ class ImageComponent(Component):
     For best results, ensure the image has some padding if you want the border to be visible.
     """
 
+    BINDABLE_FIELDS = {
+        "image_url": ("image_url", None),
+        "image_path": ("image_path", None),
+    }
+
     def _parse_color(
         self, color: Union[str, Tuple[int, int, int, int]]
     ) -> Tuple[int, int, int, int]:
@@ -85,70 +104,253 @@ class ImageComponent(Component):
             0.0, min(1.0, float(tint_opacity))
         )  # Clamp between 0 and 1
         self._cached_image = None
+        self._source_image: Optional[Image.Image] = None
+        self._fetch_failed = False
+
+    def get_image_urls(self) -> List[str]:
+        """Get the image URL if it still needs to be downloaded"""
+        if self._source_image is not None or self._fetch_failed:
+            return []
+        if self.image_path and os.path.exists(self.image_path):
+            return []
+        if not is_remote_url(self.image_url) or self._tile_key() in _tiles:
+            return []
+        return [self.image_url]
+
+    def set_fetched_images(self, images: Dict[str, Optional[Image.Image]]) -> None:
+        """
+        Use an image downloaded ahead of rendering.
 
-    def _load_image(self) -> Optional[Image.Image]:
+        A failed download is only recorded on the component it is passed to;
+        Template.fetch_images passes failures to a per-render copy, so a
+        component shared between renders fetches the image again next time.
         """
-        Load the image from path or URL if not already loaded.
+        if self.image_url not in images:
+            return
+        img = images[self.image_url]
+        if img is None:
+            self._fetch_failed = True
+        else:
+            self._set_source(img)
+
+    def get_image_target_size(self) -> Optional[Tuple[int, int]]:
+        """Get the content area (inside the border) the image is fitted into"""
+        if not self.size:
+            return None
+        b = self.border_width
+        width, height = self.size[0] - 2 * b, self.size[1] - 2 * b
+        if width <= 0 or height <= 0:
+            return None
+        return (width, height)
+
+    def is_cacheable(self) -> bool:
+        """Check whether the image has loaded (or there is no image to load)"""
+        if not self.image_path and not self.image_url:
+            return True
+        return self._source_image is not None or self._tile_key() in _tiles
+
+    def _source_identity(self) -> Optional[Tuple[Any, ...]]:
+        """
+        Identify the source image without loading it.
+
+        Returns:
+            ("path", absolute path, mtime, size) for a local file, ("url", url)
+            for a URL, or None if there is no image to load
+        """
+        if self.image_path:
+            try:
+                stat = os.stat(self.image_path)
+            except OSError:
+                pass
+            else:
+                return (
+                    "path",
+                    os.path.abspath(self.image_path),
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                )
+        if self.image_url and not self._fetch_failed:
+            return ("url", self.image_url)
+        return None
+
+    def _load_source(self) -> Optional[Image.Image]:
+        """
+        Load the source image from path or URL as RGBA, without opacity or tint.
 
         Returns:
             Loaded PIL Image or None if loading fails
         """
-        if self._cached_image is not None:
-            return self._cached_image
+        if self._source_image is not None:
+            return self._source_image
 
         try:
             if self.image_path and os.path.exists(self.image_path):
-                img = Image.open(self.image_path)
+                img = open_image(self.image_path, self.get_image_target_size())
+            elif self._fetch_failed:
+                # Already failed in this render's fetch stage
+                return None
             elif self.image_url:
-                response = requests.get(self.image_url)
-                response.raise_for_status()
-                img = Image.open(BytesIO(response.content))
+                img = get_image_fetcher().fetch_image(
+                    self.image_url, self.get_image_target_size()
+                )
             else:
                 return None
-
-            # Convert to RGBA if needed
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-
-            # Apply opacity if needed
-            if self.opacity < 1.0:
-                alpha = img.split()[3]
-                alpha = Image.eval(alpha, lambda x: int(x * self.opacity))
-                img.putalpha(alpha)
-
-            # Apply tint overlay if specified
-            if self.tint_color and self.tint_opacity > 0:
-                # Create a solid color layer with the tint color
-                tint_layer = Image.new("RGBA", img.size, self.tint_color)
-                # Adjust tint layer opacity
-                if self.tint_opacity < 1.0:
-                    alpha = tint_layer.split()[3]
-                    alpha = Image.eval(alpha, lambda x: int(x * self.tint_opacity))
-                    tint_layer.putalpha(alpha)
-                # Blend the tint layer with the image
-                img = Image.alpha_composite(img, tint_layer)
-
-            self._cached_image = img
-            return img
+            return self._set_source(img)
 
         except (IOError, requests.RequestException) as e:
             print(f"Error loading image: {e}")
             return None
 
+    def _set_source(self, img: Image.Image) -> Image.Image:
+        """
+        Keep a loaded image as the component's source, converted to RGBA.
+
+        Args:
+            img: Loaded image
+
+        Returns:
+            The RGBA source image
+        """
+        # Convert to RGBA if needed
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
+
+        self._source_image = img
+        return img
+
+    def _load_image(self) -> Optional[Image.Image]:
+        """
+        Load the image with opacity and tint applied, if not already loaded.
+
+        Returns:
+            Loaded PIL Image or None if loading fails
+        """
+        if self._cached_image is not None:
+            return self._cached_image
+
+        img = self._load_source()
+        if img is None:
+            return None
+
+        # Apply opacity if needed (on a copy, the source is kept unmodified)
+        if self.opacity < 1.0:
+            img = img.copy()
+            alpha = img.split()[3]
+            alpha = Image.eval(alpha, lambda x: int(x * self.opacity))
+            img.putalpha(alpha)
+
+        # Apply tint overlay if specified
+        if self.tint_color and self.tint_opacity > 0:
+            # Create a solid color layer with the tint color
+            tint_layer = Image.new("RGBA", img.size, self.tint_color)
+            # Adjust tint layer opacity
+            if self.tint_opacity < 1.0:
+                alpha = tint_layer.split()[3]
+                alpha = Image.eval(alpha, lambda x: int(x * self.tint_opacity))
+                tint_layer.putalpha(alpha)
+            # Blend the tint layer with the image
+            img = Image.alpha_composite(img, tint_layer)
+
+        self._cached_image = img
+        return img
+
+    def get_bounding_box(self, canvas_size: Tuple[int, int]) -> Box:
+        """Get the area of the image tile"""
+        if not self.image_path and not self.image_url:
+            return (0, 0, 0, 0)
+        x, y = self.position
+        width, height = self.size if self.size else (0, 0)
+        return union_box([(x, y, x + width, y + height)], canvas_size)
+
+    def render_clipped(self, image: Image.Image) -> Image.Image:
+        """Draw the image in place (render() does not copy the canvas)"""
+        return self.draw(image)
+
     def render(self, image: Image.Image) -> Image.Image:
         """
         Render the image onto the base image with border.
-        Renders border first, then renders the image inside the border.
+
+        The base image is modified in place, as it always has been.
 
         Args:
             image: Base image to render onto
 
+        Returns:
+            Image with the rendered component
+        """
+        return self.draw(image)
+
+    def draw(self, image: Image.Image) -> Image.Image:
+        """
+        Draw the image directly onto the base image with border.
+        Renders border first, then renders the image inside the border.
+
+        Args:
+            image: Base image to draw onto
+
         Returns:
             Image with the rendered component
         """
         if not self.image_path and not self.image_url:
             return image
 
+        # Paste the finished tile onto the base image
+        tile = self._get_tile()
+        image.paste(tile, self.position, tile)
+        return image
+
+    def _get_tile(self) -> Image.Image:
+        """
+        Get the bordered, resized and masked image, ready to paste.
+
+        The cache is checked before the source is loaded, so a repeated asset
+        is only downloaded, decoded, resized and masked once.
+
+        Returns:
+            RGBA image the size of the component
+        """
+        key = self._tile_key()
+        tile = _tiles.get(key)
+        if tile is None:
+            tile = self._build_tile()
+            # A tile whose source failed to load only has the border; it is
+            # not cached under the source, so the next render tries again
+            if key[0] is None or self._source_image is not None:
+                _tiles.put(key, tile)
+        return tile
+
+    def _tile_key(self) -> Tuple[Any, ...]:
+        """
+        Get the tile cache key, without loading the source image.
+
+        Tiles are keyed by the source's identity (see _source_identity), size,
+        crop mode, radius, border, opacity and tint. The size and border fix
+        the size the source is decoded at, so the identity stands in for the
+        decoded pixels.
+
+        Returns:
+            Hashable cache key
+        """
+        b = max(0, self.border_width)
+        return (
+            self._source_identity() if self.get_image_target_size() else None,
+            self.size,
+            self.circle_crop,
+            self.border_radius,
+            b,
+            self.border_color,
+            self.opacity,
+            self.tint_color,
+            self.tint_opacity,
+        )
+
+    def _build_tile(self) -> Image.Image:
+        """
+        Render the border, then the resized and masked image inside it.
+
+        Returns:
+            RGBA image the size of the component
+        """
         # Create a new layer for the image with border
         result_img = Image.new("RGBA", self.size if self.size else (0, 0), (0, 0, 0, 0))
 
@@ -215,8 +417,8 @@ class ImageComponent(Component):
                 # Load the image
                 img = self._load_image()
                 if img:
-                    # Get original image dimensions
-                    orig_width, orig_height = img.size
+                    # Get original image dimensions (before any reduce-on-load)
+                    orig_width, orig_height = img.info.get("source_size", img.size)
                     # Calculate aspect ratio
                     aspect_ratio = orig_width / orig_height
                     target_aspect_ratio = img_width / img_height
@@ -269,9 +471,7 @@ class ImageComponent(Component):
                     # Paste the image with the mask
                     result_img.paste(img, (paste_x, paste_y), img_mask)
 
-        # Paste the result onto the base image
-        image.paste(result_img, self.position, result_img)
-        return image
+        return result_img
 
     @classmethod
     def from_config(cls, config: Dict[str, Any]) -> "ImageComponent":
@@ -2,11 +2,35 @@
 Shape components for rendering basic shapes in templates with gradient support.
 """
 
+import os
 from typing import Tuple, Optional, Dict, Any, List, Union
 from PIL import Image, ImageDraw
+import numpy as np
+import requests
 import colorsys
 import re
-from .base import Component
+from .base import (
+    Box,
+    Component,
+    fade_image,
+    is_translucent_color,
+    union_box,
+    with_opacity,
+)
+from dolze_image_templates.fetcher import get_image_fetcher, is_remote_url
+from dolze_image_templates.utils.image_utils import open_image
+from dolze_image_templates.utils.cache import (
+    LRUCache,
+    image_nbytes,
+    register_memory_cache,
+)
+
+# Maximum memory used by cached gradient images (a 2560x2560 RGBA gradient is ~26 MB)
+GRADIENT_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+_gradient_cache = register_memory_cache(
+    "gradient", LRUCache(max_bytes=GRADIENT_CACHE_MAX_BYTES, sizeof=image_nbytes)
+)
 
 
 class GradientUtils:
@@ -72,6 +96,81 @@ class GradientUtils:
 
         return (r, g, b, a)
 
+    @staticmethod
+    def _stop_arrays(
+        colors: List[Tuple[int, int, int, int]]
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Build the per-segment start colors and deltas used by the array engine.
+
+        Args:
+            colors: List of RGBA color tuples (the gradient stops)
+
+        Returns:
+            Tuple of (starts, deltas) float arrays of shape (segments, 4)
+        """
+        stops = np.asarray(colors, dtype=np.float64).reshape(-1, 4)
+        if len(stops) == 1:
+            return stops, np.zeros_like(stops)
+        return stops[:-1], stops[1:] - stops[:-1]
+
+    @staticmethod
+    def _colorize(
+        t: "np.ndarray", colors: List[Tuple[int, int, int, int]]
+    ) -> "np.ndarray":
+        """
+        Map gradient positions to RGBA colors in bulk.
+
+        This is the array equivalent of locating the color segment for each
+        position and calling interpolate_color on it, so the output matches
+        the per-pixel implementation exactly.
+
+        Args:
+            t: Array of gradient positions, already clamped to 0.0 - 1.0
+            colors: List of RGBA color tuples (the gradient stops)
+
+        Returns:
+            uint8 array of shape t.shape + (4,)
+        """
+        starts, deltas = GradientUtils._stop_arrays(colors)
+        segments = len(colors) - 1
+
+        segment = t * segments
+        idx = segment.astype(np.intp)
+        local_t = segment - idx
+
+        # Positions past the last stop take the last color as-is
+        at_end = idx >= segments
+        idx = np.minimum(idx, max(segments - 1, 0))
+
+        out = np.empty(t.shape + (4,), dtype=np.uint8)
+        for channel in range(4):
+            values = starts[idx, channel] + deltas[idx, channel] * local_t
+            out[..., channel] = np.clip(values, 0, 255).astype(np.uint8)
+        out[at_end] = np.clip(starts[-1] + deltas[-1], 0, 255).astype(np.uint8)
+        return out
+
+    @staticmethod
+    def _linear_weights(direction: float) -> Tuple[float, float]:
+        """
+        Get the x/y projection weights for a linear gradient direction.
+
+        0 and 90 degrees are exact horizontal and vertical gradients. Other
+        angles keep the diagonal approximation the templates were designed
+        against, so existing templates render unchanged.
+
+        Args:
+            direction: Gradient direction in degrees
+
+        Returns:
+            Tuple of (x_weight, y_weight)
+        """
+        if direction == 0:
+            return 1.0, 0.0
+        if direction == 90:
+            return 0.0, 1.0
+        return abs(direction / 90), abs(1 - direction / 90)
+
     @staticmethod
     def create_linear_gradient(
         size: Tuple[int, int],
@@ -90,45 +189,29 @@ class GradientUtils:
             PIL Image with linear gradient
         """
         width, height = size
-        gradient = Image.new("RGBA", size)
-
-        # Convert direction to radians
-        angle = direction * 3.14159 / 180
-
-        # Calculate gradient vector
-        cos_a = abs(cos(angle)) if "cos" in dir(__builtins__) else abs(direction / 90)
-        sin_a = (
-            abs(sin(angle)) if "sin" in dir(__builtins__) else abs(1 - direction / 90)
-        )
-
-        # Simplified gradient calculation
-        for y in range(height):
-            for x in range(width):
-                # Calculate position along gradient (0.0 to 1.0)
-                if direction == 0:  # Horizontal
-                    t = x / width
-                elif direction == 90:  # Vertical
-                    t = y / height
-                else:  # Diagonal approximation
-                    t = (x * cos_a + y * sin_a) / (width * cos_a + height * sin_a)
-
-                t = max(0, min(1, t))
-
-                # Find which color segment we're in
-                segment = t * (len(colors) - 1)
-                idx = int(segment)
-                local_t = segment - idx
-
-                if idx >= len(colors) - 1:
-                    color = colors[-1]
-                else:
-                    color = GradientUtils.interpolate_color(
-                        colors[idx], colors[idx + 1], local_t
-                    )
-
-                gradient.putpixel((x, y), color)
+        if width <= 0 or height <= 0 or not colors:
+            return Image.new("RGBA", (max(width, 0), max(height, 0)))
+
+        cos_a, sin_a = GradientUtils._linear_weights(direction)
+
+        if direction == 0:
+            # Horizontal: compute a single row and repeat it
+            t = np.arange(width, dtype=np.float64) / width
+            row = GradientUtils._colorize(np.clip(t, 0, 1), colors)
+            pixels = np.broadcast_to(row, (height, width, 4))
+        elif direction == 90:
+            # Vertical: compute a single column and repeat it
+            t = np.arange(height, dtype=np.float64) / height
+            column = GradientUtils._colorize(np.clip(t, 0, 1), colors)
+            pixels = np.broadcast_to(column[:, np.newaxis, :], (height, width, 4))
+        else:
+            xs = np.arange(width, dtype=np.float64) * cos_a
+            ys = np.arange(height, dtype=np.float64) * sin_a
+            span = width * cos_a + height * sin_a
+            t = (xs[np.newaxis, :] + ys[:, np.newaxis]) / span
+            pixels = GradientUtils._colorize(np.clip(t, 0, 1), colors)
 
-        return gradient
+        return Image.fromarray(np.ascontiguousarray(pixels), "RGBA")
 
     @staticmethod
     def create_radial_gradient(
@@ -148,7 +231,8 @@ class GradientUtils:
             PIL Image with radial gradient
         """
         width, height = size
-        gradient = Image.new("RGBA", size)
+        if width <= 0 or height <= 0 or not colors:
+            return Image.new("RGBA", (max(width, 0), max(height, 0)))
 
         if center is None:
             center = (0.5, 0.5)
@@ -164,32 +248,97 @@ class GradientUtils:
             ((width - center_x) ** 2 + (height - center_y) ** 2) ** 0.5,
         )
 
-        for y in range(height):
-            for x in range(width):
-                # Calculate distance from center
-                dist = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-                t = min(1.0, dist / max_dist)
-
-                # Find which color segment we're in
-                segment = t * (len(colors) - 1)
-                idx = int(segment)
-                local_t = segment - idx
-
-                if idx >= len(colors) - 1:
-                    color = colors[-1]
-                else:
-                    color = GradientUtils.interpolate_color(
-                        colors[idx], colors[idx + 1], local_t
-                    )
+        dx = (np.arange(width, dtype=np.float64) - center_x) ** 2
+        dy = (np.arange(height, dtype=np.float64) - center_y) ** 2
+        dist = (dx[np.newaxis, :] + dy[:, np.newaxis]) ** 0.5
+        t = np.minimum(1.0, dist / max_dist) if max_dist else np.zeros_like(dist)
+
+        return Image.fromarray(GradientUtils._colorize(t, colors), "RGBA")
+
+    @staticmethod
+    def has_alpha(gradient_config: Optional[Dict[str, Any]]) -> bool:
+        """
+        Check whether any color of a gradient configuration is translucent.
+
+        Args:
+            gradient_config: Gradient configuration, or None
+
+        Returns:
+            True if a gradient color has an alpha below 255
+        """
+        if not gradient_config:
+            return False
+        return any(
+            GradientUtils.parse_color(color)[3] < 255
+            for color in gradient_config.get("colors", [])
+        )
+
+    @staticmethod
+    def create_gradient(
+        size: Tuple[int, int], gradient_config: Optional[Dict[str, Any]]
+    ) -> Optional[Image.Image]:
+        """
+        Create a gradient image from a component's gradient configuration.
+
+        Args:
+            size: Size of the gradient image (width, height)
+            gradient_config: Gradient configuration with "type", "colors" and
+                either "direction" (linear) or "center" (radial)
+
+        Gradients are cached by (type, size, colors, direction or center), so
+        the returned image is shared and must not be modified in place.
+
+        Returns:
+            PIL Image with the gradient, or None if there is nothing to draw
+        """
+        if not gradient_config:
+            return None
+
+        colors_config = gradient_config.get("colors", [])
+        if not colors_config or size[0] <= 0 or size[1] <= 0:
+            return None
+
+        # Parse colors
+        colors = [GradientUtils.parse_color(color) for color in colors_config]
+        size = (int(size[0]), int(size[1]))
+
+        if gradient_config.get("type", "linear") == "radial":
+            center = tuple(gradient_config.get("center", (0.5, 0.5)))
+            key = ("radial", size, tuple(colors), center)
+            return _gradient_cache.get_or_create(
+                key,
+                lambda: GradientUtils.create_radial_gradient(size, colors, center),
+            )
+
+        direction = gradient_config.get("direction", 0)
+        key = ("linear", size, tuple(colors), direction)
+        return _gradient_cache.get_or_create(
+            key,
+            lambda: GradientUtils.create_linear_gradient(size, colors, direction),
+        )
 
-                gradient.putpixel((x, y), color)
 
-        return gradient
+def _is_translucent_shape(shape: Any) -> bool:
+    """Check whether a shape has an opacity or any color below full alpha."""
+    return (
+        shape.opacity < 1.0
+        or is_translucent_color(shape.fill_color)
+        or is_translucent_color(shape.outline_color)
+        or GradientUtils.has_alpha(shape.gradient_config)
+    )
 
 
 class CircleComponent(Component):
     """Component for rendering circles with optional background images and gradients"""
 
+    BINDABLE_FIELDS = {
+        "fill_color": ("fill_color", "_parse_config_color"),
+        "outline_color": ("outline_color", "_parse_config_color"),
+        "gradient": ("gradient_config", None),
+        "image_url": ("image_url", None),
+        "image_path": ("image_path", None),
+    }
+
     def __init__(
         self,
         position: Tuple[int, int] = (0, 0),
@@ -200,6 +349,7 @@ class CircleComponent(Component):
         image_url: Optional[str] = None,
         image_path: Optional[str] = None,
         gradient_config: Optional[Dict[str, Any]] = None,
+        opacity: float = 1.0,
     ):
         """
         Initialize a circle component.
@@ -213,6 +363,7 @@ class CircleComponent(Component):
             image_url: URL of an image to display inside the circle
             image_path: Path to a local image file to display inside the circle
             gradient_config: Configuration for gradient background
+            opacity: Opacity of the shape (0.0 to 1.0)
         """
         super().__init__(position)
         self.radius = radius
@@ -222,19 +373,56 @@ class CircleComponent(Component):
         self.image_url = image_url
         self.image_path = image_path
         self.gradient_config = gradient_config
+        self.opacity = max(0.0, min(1.0, opacity))  # Clamp between 0 and 1
         self._cached_image = None
+        self._fetch_failed = False
+
+    def get_image_urls(self) -> List[str]:
+        """Get the image URL if it still needs to be downloaded"""
+        if self._cached_image is not None or self._fetch_failed:
+            return []
+        return [self.image_url] if is_remote_url(self.image_url) else []
+
+    def set_fetched_images(self, images: Dict[str, Optional[Image.Image]]) -> None:
+        """
+        Use an image downloaded ahead of rendering.
+
+        A failed download is only recorded on the component it is passed to
+        (a per-render copy, see Template.fetch_images), so it is retried on
+        the next render.
+        """
+        if self.image_url not in images:
+            return
+        img = images[self.image_url]
+        if img is None:
+            self._fetch_failed = True
+        else:
+            self._cached_image = img.convert("RGBA")
+
+    def is_cacheable(self) -> bool:
+        """Check whether the circle's image has loaded (or there is none)"""
+        if not self.image_url and not self.image_path:
+            return True
+        return self._cached_image is not None
+
+    def get_image_target_size(self) -> Optional[Tuple[int, int]]:
+        """Get the size the image is resized to (the circle's bounding box)"""
+        if self.radius <= 0:
+            return None
+        return (self.radius * 2, self.radius * 2)
 
     def _load_image(self) -> Optional[Image.Image]:
         """Load image from URL or path if not already loaded"""
         if self._cached_image is not None:
             return self._cached_image
 
-        # Try to load from URL first, then from path
-        if self.image_url:
+        # Try to load from URL first (unless it already failed in this
+        # render's fetch stage), then from path
+        if self.image_url and not self._fetch_failed:
             try:
-                response = requests.get(self.image_url)
-                response.raise_for_status()
-                img = Image.open(BytesIO(response.content))
+                img = get_image_fetcher().fetch_image(
+                    self.image_url, self.get_image_target_size()
+                )
                 self._cached_image = img.convert("RGBA")
                 return self._cached_image
             except (requests.RequestException, IOError):
@@ -242,7 +430,7 @@ class CircleComponent(Component):
 
         if self.image_path and os.path.exists(self.image_path):
             try:
-                img = Image.open(self.image_path)
+                img = open_image(self.image_path, self.get_image_target_size())
                 self._cached_image = img.convert("RGBA")
                 return self._cached_image
             except IOError:
@@ -252,33 +440,31 @@ class CircleComponent(Component):
 
     def _create_gradient_fill(self) -> Optional[Image.Image]:
         """Create gradient fill image for the circle"""
-        if not self.gradient_config:
-            return None
-
-        gradient_type = self.gradient_config.get("type", "linear")
-        colors_config = self.gradient_config.get("colors", [])
-
-        if not colors_config:
-            return None
-
-        # Parse colors
-        colors = [GradientUtils.parse_color(color) for color in colors_config]
-
-        # Create gradient image
         size = (self.radius * 2, self.radius * 2)
+        return GradientUtils.create_gradient(size, self.gradient_config)
+
+    def get_bounding_box(self, canvas_size: Tuple[int, int]) -> Box:
+        """Get the circle's bounding square, which includes its edge pixels"""
+        x, y = self.position
+        r = self.radius
+        return union_box([(x - r, y - r, x + r + 1, y + r + 1)], canvas_size)
 
-        if gradient_type == "radial":
-            center = self.gradient_config.get("center", (0.5, 0.5))
-            gradient_img = GradientUtils.create_radial_gradient(size, colors, center)
-        else:  # linear
-            direction = self.gradient_config.get("direction", 0)
-            gradient_img = GradientUtils.create_linear_gradient(size, colors, direction)
+    def is_translucent(self) -> bool:
+        """Check whether the circle is drawn with any transparency"""
+        return _is_translucent_shape(self)
 
-        return gradient_img
+    def translated(self, dx: int, dy: int) -> "CircleComponent":
+        """Get a moved copy, loading the image first so it is loaded only once"""
+        self._load_image()
+        return super().translated(dx, dy)
 
     def render(self, image: Image.Image) -> Image.Image:
-        """Render the circle onto an image"""
-        result = image.copy()
+        """Render the circle onto a copy of an image"""
+        return self.draw(image.copy())
+
+    def draw(self, image: Image.Image) -> Image.Image:
+        """Draw the circle directly onto an image"""
+        result = image
         draw = ImageDraw.Draw(result)
 
         # Calculate bounding box
@@ -300,21 +486,26 @@ class CircleComponent(Component):
             mask_draw.ellipse((0, 0, self.radius * 2, self.radius * 2), fill=255)
 
             # Apply gradient with circular mask
+            gradient_img = fade_image(gradient_img, self.opacity)
             result.paste(gradient_img, (x - self.radius, y - self.radius), mask)
         elif self.fill_color is not None:
             # Draw solid color circle
-            draw.ellipse(bbox, fill=self.fill_color)
+            draw.ellipse(bbox, fill=with_opacity(self.fill_color, self.opacity))
 
         # Draw outline
         if self.outline_color is not None and self.outline_width > 0:
-            draw.ellipse(bbox, outline=self.outline_color, width=self.outline_width)
+            draw.ellipse(
+                bbox,
+                outline=with_opacity(self.outline_color, self.opacity),
+                width=self.outline_width,
+            )
 
         # If there's an image, draw it inside the circle
         img = self._load_image()
         if img is not None:
             # Resize image to fit the circle
             size = (self.radius * 2, self.radius * 2)
-            img = img.resize(size, Image.Resampling.LANCZOS)
+            img = fade_image(img.resize(size, Image.Resampling.LANCZOS), self.opacity)
 
             # Create circular mask
             mask = Image.new("L", size, 0)
@@ -334,22 +525,9 @@ class CircleComponent(Component):
             config.get("position", {}).get("y", 0),
         )
 
-        # Handle color which might be a list or tuple
-        fill_color = config.get("fill_color")
-        if (
-            fill_color
-            and isinstance(fill_color, (list, tuple))
-            and len(fill_color) >= 3
-        ):
-            fill_color = tuple(fill_color[:3])
-
-        outline_color = config.get("outline_color")
-        if (
-            outline_color
-            and isinstance(outline_color, (list, tuple))
-            and len(outline_color) >= 3
-        ):
-            outline_color = tuple(outline_color[:3])
+        # Handle colors which might be lists or tuples
+        fill_color = cls._parse_config_color(config.get("fill_color"))
+        outline_color = cls._parse_config_color(config.get("outline_color"))
 
         return cls(
             position=position,
@@ -360,12 +538,19 @@ class CircleComponent(Component):
             image_url=config.get("image_url"),
             image_path=config.get("image_path"),
             gradient_config=config.get("gradient"),
+            opacity=config.get("opacity", 1.0),
         )
 
 
 class RectangleComponent(Component):
     """Component for rendering rectangles with gradient support"""
 
+    BINDABLE_FIELDS = {
+        "fill_color": ("fill_color", "_parse_config_color"),
+        "outline_color": ("outline_color", "_parse_config_color"),
+        "gradient": ("gradient_config", None),
+    }
+
     def __init__(
         self,
         position: Tuple[int, int] = (0, 0),
@@ -375,6 +560,7 @@ class RectangleComponent(Component):
         outline_width: int = 1,
         border_radius: int = 0,
         gradient_config: Optional[Dict[str, Any]] = None,
+        opacity: float = 1.0,
     ):
         """
         Initialize a rectangle component.
@@ -387,6 +573,7 @@ class RectangleComponent(Component):
             outline_width: Width of the outline in pixels
             border_radius: Radius of the corners in pixels (0 for square corners)
             gradient_config: Configuration for gradient background
+            opacity: Opacity of the shape (0.0 to 1.0)
         """
         super().__init__(position)
         self.size = size
@@ -395,46 +582,45 @@ class RectangleComponent(Component):
         self.outline_width = outline_width
         self.border_radius = border_radius
         self.gradient_config = gradient_config
+        self.opacity = max(0.0, min(1.0, opacity))  # Clamp between 0 and 1
 
     def _create_gradient_fill(self) -> Optional[Image.Image]:
         """Create gradient fill image for the rectangle"""
-        if not self.gradient_config:
-            return None
+        return GradientUtils.create_gradient(self.size, self.gradient_config)
 
-        gradient_type = self.gradient_config.get("type", "linear")
-        colors_config = self.gradient_config.get("colors", [])
+    def get_bounding_box(self, canvas_size: Tuple[int, int]) -> Box:
+        """Get the rectangle's area, which includes its right and bottom edges"""
+        x, y = self.position
+        width, height = self.size
+        return union_box([(x, y, x + width + 1, y + height + 1)], canvas_size)
 
-        if not colors_config:
-            return None
+    def is_translucent(self) -> bool:
+        """Check whether the rectangle is drawn with any transparency"""
+        return _is_translucent_shape(self)
 
-        # Parse colors
-        colors = [GradientUtils.parse_color(color) for color in colors_config]
+    def render(self, image: Image.Image) -> Image.Image:
+        """
+        Render a rectangle onto a copy of an image.
 
-        # Create gradient image
-        if gradient_type == "radial":
-            center = self.gradient_config.get("center", (0.5, 0.5))
-            gradient_img = GradientUtils.create_radial_gradient(
-                self.size, colors, center
-            )
-        else:  # linear
-            direction = self.gradient_config.get("direction", 0)
-            gradient_img = GradientUtils.create_linear_gradient(
-                self.size, colors, direction
-            )
+        Args:
+            image: The image to render the rectangle on
 
-        return gradient_img
+        Returns:
+            A new image with the rectangle rendered on it
+        """
+        return self.draw(image.copy())
 
-    def render(self, image: Image.Image) -> Image.Image:
+    def draw(self, image: Image.Image) -> Image.Image:
         """
-        Render a rectangle onto an image.
+        Draw a rectangle directly onto an image.
 
         Args:
-            image: The image to render the rectangle on
+            image: The image to draw the rectangle on
 
         Returns:
-            The image with the rectangle rendered on it
+            The same image with the rectangle drawn on it
         """
-        result = image.copy()
+        result = image
         draw = ImageDraw.Draw(result)
 
         # Calculate bounding box
@@ -453,10 +639,11 @@ class RectangleComponent(Component):
                 mask_draw.rounded_rectangle(
                     (0, 0, width, height), radius=self.border_radius, fill=255
                 )
+                gradient_img = fade_image(gradient_img, self.opacity)
                 result.paste(gradient_img, self.position, mask)
             else:
                 # Simple rectangular paste
-                result.paste(gradient_img, self.position)
+                result.paste(fade_image(gradient_img, self.opacity), self.position)
         else:
             # Draw with solid color or transparent
             if self.border_radius > 0:
@@ -465,13 +652,15 @@ class RectangleComponent(Component):
                     draw.rounded_rectangle(
                         bbox,
                         radius=self.border_radius,
-                        fill=self.fill_color,
+                        fill=with_opacity(self.fill_color, self.opacity),
                         outline=None,
                     )
             else:
                 # Original rectangle drawing for backward compatibility
                 if self.fill_color is not None:
-                    draw.rectangle(bbox, fill=self.fill_color)
+                    draw.rectangle(
+                        bbox, fill=with_opacity(self.fill_color, self.opacity)
+                    )
 
         # Draw outline
         if self.outline_color is not None and self.outline_width > 0:
@@ -487,12 +676,14 @@ class RectangleComponent(Component):
                 draw.rounded_rectangle(
                     outline_bbox,
                     radius=max(0, self.border_radius - self.outline_width // 2),
-                    outline=self.outline_color,
+                    outline=with_opacity(self.outline_color, self.opacity),
                     width=self.outline_width,
                 )
             else:
                 draw.rectangle(
-                    bbox, outline=self.outline_color, width=self.outline_width
+                    bbox,
+                    outline=with_opacity(self.outline_color, self.opacity),
+                    width=self.outline_width,
                 )
 
         return result
@@ -518,22 +709,9 @@ class RectangleComponent(Component):
             config.get("size", {}).get("height", 50),
         )
 
-        # Handle color which might be a list or tuple
-        fill_color = config.get("fill_color")
-        if (
-            fill_color
-            and isinstance(fill_color, (list, tuple))
-            and len(fill_color) >= 3
-        ):
-            fill_color = tuple(fill_color[:3])
-
-        outline_color = config.get("outline_color")
-        if (
-            outline_color
-            and isinstance(outline_color, (list, tuple))
-            and len(outline_color) >= 3
-        ):
-            outline_color = tuple(outline_color[:3])
+        # Handle colors which might be lists or tuples
+        fill_color = cls._parse_config_color(config.get("fill_color"))
+        outline_color = cls._parse_config_color(config.get("outline_color"))
 
         return cls(
             position=position,
@@ -543,12 +721,19 @@ class RectangleComponent(Component):
             outline_width=config.get("outline_width", 1),
             border_radius=config.get("border_radius", 0),
             gradient_config=config.get("gradient"),
+            opacity=config.get("opacity", 1.0),
         )
 
 
 class PolygonComponent(Component):
     """Component for rendering polygons (triangles, etc.) with gradient support"""
 
+    BINDABLE_FIELDS = {
+        "fill_color": ("fill_color", "_parse_config_color"),
+        "outline_color": ("outline_color", "_parse_config_color"),
+        "gradient": ("gradient_config", None),
+    }
+
     def __init__(
         self,
         position: Tuple[int, int] = (0, 0),
@@ -557,6 +742,7 @@ class PolygonComponent(Component):
         outline_color: Optional[Tuple[int, int, int]] = None,
         outline_width: int = 1,
         gradient_config: Optional[Dict[str, Any]] = None,
+        opacity: float = 1.0,
     ):
         """
         Initialize a polygon component.
@@ -568,6 +754,7 @@ class PolygonComponent(Component):
             outline_color: RGB color tuple for the outline (None for no outline)
             outline_width: Width of the outline in pixels
             gradient_config: Configuration for gradient background
+            opacity: Opacity of the shape (0.0 to 1.0)
         """
         super().__init__(position)
         self.points = points or []
@@ -575,6 +762,7 @@ class PolygonComponent(Component):
         self.outline_color = outline_color
         self.outline_width = outline_width
         self.gradient_config = gradient_config
+        self.opacity = max(0.0, min(1.0, opacity))  # Clamp between 0 and 1
 
     def _get_polygon_bounds(self) -> Tuple[int, int, int, int]:
         """Get bounding box of the polygon"""
@@ -596,46 +784,59 @@ class PolygonComponent(Component):
         if not self.gradient_config or not self.points:
             return None
 
-        gradient_type = self.gradient_config.get("type", "linear")
-        colors_config = self.gradient_config.get("colors", [])
-
-        if not colors_config:
-            return None
-
-        # Parse colors
-        colors = [GradientUtils.parse_color(color) for color in colors_config]
-
         # Get polygon bounds
         min_x, min_y, max_x, max_y = self._get_polygon_bounds()
         size = (max_x - min_x, max_y - min_y)
 
-        if size[0] <= 0 or size[1] <= 0:
+        gradient_img = GradientUtils.create_gradient(size, self.gradient_config)
+        if gradient_img is None:
             return None
 
-        # Create gradient image
-        if gradient_type == "radial":
-            center = self.gradient_config.get("center", (0.5, 0.5))
-            gradient_img = GradientUtils.create_radial_gradient(size, colors, center)
-        else:  # linear
-            direction = self.gradient_config.get("direction", 0)
-            gradient_img = GradientUtils.create_linear_gradient(size, colors, direction)
-
         return gradient_img, (min_x, min_y)
 
+    def get_bounding_box(self, canvas_size: Tuple[int, int]) -> Box:
+        """Get the polygon's bounds, widened by the outline"""
+        if not self.points:
+            return (0, 0, 0, 0)
+        min_x, min_y, max_x, max_y = self._get_polygon_bounds()
+        pad = self.outline_width if self.outline_color is not None else 0
+        return union_box(
+            [(min_x - pad, min_y - pad, max_x + pad + 1, max_y + pad + 1)],
+            canvas_size,
+        )
+
+    def is_translucent(self) -> bool:
+        """Check whether the polygon is drawn with any transparency"""
+        return _is_translucent_shape(self)
+
     def render(self, image: Image.Image) -> Image.Image:
         """
-        Render a polygon onto an image.
+        Render a polygon onto a copy of an image.
 
         Args:
             image: The image to render the polygon on
 
         Returns:
-            The image with the polygon rendered on it
+            A new image with the polygon rendered on it
+        """
+        if not self.points:
+            return image
+        return self.draw(image.copy())
+
+    def draw(self, image: Image.Image) -> Image.Image:
+        """
+        Draw a polygon directly onto an image.
+
+        Args:
+            image: The image to draw the polygon on
+
+        Returns:
+            The same image with the polygon drawn on it
         """
         if not self.points:
             return image
 
-        result = image.copy()
+        result = image
         draw = ImageDraw.Draw(result)
 
         # Convert points to absolute coordinates
@@ -658,16 +859,20 @@ class PolygonComponent(Component):
             mask_draw.polygon(mask_points, fill=255)
 
             # Apply gradient with polygon mask
-            result.paste(gradient_img, (min_x, min_y), mask)
+            result.paste(fade_image(gradient_img, self.opacity), (min_x, min_y), mask)
         else:
             # Draw solid color polygon
             if self.fill_color is not None:
-                draw.polygon(absolute_points, fill=self.fill_color)
+                draw.polygon(
+                    absolute_points, fill=with_opacity(self.fill_color, self.opacity)
+                )
 
         # Draw outline
         if self.outline_color is not None and self.outline_width > 0:
             draw.polygon(
-                absolute_points, outline=self.outline_color, width=self.outline_width
+                absolute_points,
+                outline=with_opacity(self.outline_color, self.opacity),
+                width=self.outline_width,
             )
 
         return result
@@ -693,22 +898,9 @@ class PolygonComponent(Component):
         if not isinstance(points, list):
             points = []
 
-        # Handle color which might be a list or tuple
-        fill_color = config.get("fill_color")
-        if (
-            fill_color
-            and isinstance(fill_color, (list, tuple))
-            and len(fill_color) >= 3
-        ):
-            fill_color = tuple(fill_color[:3])
-
-        outline_color = config.get("outline_color")
-        if (
-            outline_color
-            and isinstance(outline_color, (list, tuple))
-            and len(outline_color) >= 3
-        ):
-            outline_color = tuple(outline_color[:3])
+        # Handle colors which might be lists or tuples
+        fill_color = cls._parse_config_color(config.get("fill_color"))
+        outline_color = cls._parse_config_color(config.get("outline_color"))
 
         return cls(
             position=position,
@@ -717,4 +909,5 @@ class PolygonComponent(Component):
             outline_color=outline_color,
             outline_width=config.get("outline_width", 1),
             gradient_config=config.get("gradient"),
+            opacity=config.get("opacity", 1.0),
         )
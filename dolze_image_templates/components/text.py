@@ -6,13 +6,25 @@ import os
 import re
 from typing import Tuple, Optional, Dict, Any, Union
 from PIL import Image, ImageDraw, ImageFont
-from .base import Component
-from dolze_image_templates.core.font_manager import get_font_manager
+from .base import (
+    Box,
+    Component,
+    is_translucent_color,
+    measure_text,
+    parse_alpha_color,
+    union_box,
+)
+from .text_layout import layout_text
 
 
 class TextComponent(Component):
     """Component for rendering text"""
 
+    BINDABLE_FIELDS = {
+        "text": ("text", None),
+        "color": ("color", "_parse_color"),
+    }
+
     def __init__(
         self,
         text: str,
@@ -31,7 +43,8 @@ class TextComponent(Component):
             text: Text to render
             position: Position (x, y) to place the text
             font_size: Font size in points
-            color: RGB color tuple (0-255, 0-255, 0-255)
+            color: RGB color tuple (0-255, 0-255, 0-255), or RGBA with an alpha
+                from 0 to 255 for translucent text
             max_width: Maximum width for text wrapping in pixels
             font_path: Path to a TTF/OTF font file or font name
             alignment: Text alignment ('left', 'center', 'right')
@@ -56,58 +69,78 @@ class TextComponent(Component):
             print(f"Warning: Invalid line height {self.line_height}. Must be > 0. Defaulting to 1.2.")
             self.line_height = 1.2
 
+    def get_bounding_box(self, canvas_size: Tuple[int, int]) -> Box:
+        """Get the area covered by the text's lines"""
+        if not self.text:
+            return (0, 0, 0, 0)
+
+        # Imported here: core imports the components package
+        from dolze_image_templates.core.font_manager import get_font_manager
+
+        font = get_font_manager().get_font(self.font_path, self.font_size)
+        if not self.max_width:
+            return union_box([measure_text(self.position, self.text, font)], canvas_size)
+
+        # An RGBA draw shares word measurements with draws on the canvas
+        draw = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        lines = layout_text(
+            draw,
+            font,
+            self.text,
+            self.font_size,
+            self.max_width,
+            self.line_height,
+            self.alignment,
+        )
+        x, y = self.position
+        return union_box(
+            [measure_text((x + line.x, y + line.y), line.text, font) for line in lines],
+            canvas_size,
+        )
+
+    def is_translucent(self) -> bool:
+        """Check whether the text color has transparency"""
+        return bool(self.text) and is_translucent_color(self.color)
+
     def render(self, image: Image.Image) -> Image.Image:
-        """Render text onto an image"""
+        """Render text onto a copy of an image"""
+        if not self.text:  # Skip rendering if text is None or empty
+            return image
+        return self.draw(image.copy())
+
+    def draw(self, image: Image.Image) -> Image.Image:
+        """Draw text directly onto an image"""
         if not self.text:  # Skip rendering if text is None or empty
             return image
 
-        result = image.copy()
+        result = image
         draw = ImageDraw.Draw(result)
 
         # Use font manager to get the font
+        # Imported here: core imports the components package
+        from dolze_image_templates.core.font_manager import get_font_manager
+
         font_manager = get_font_manager()
         font = font_manager.get_font(self.font_path, self.font_size)
 
         # Handle text wrapping if max_width is specified
         if self.max_width:
-            lines = []
-            words = self.text.split()
-
-            if not words:
-                return result
-
-            current_line = words[0]
-
-            for word in words[1:]:
-                # Check if adding this word exceeds max_width
-                test_line = current_line + " " + word
-                text_width = draw.textlength(test_line, font=font)
-
-                if text_width <= self.max_width:
-                    current_line = test_line
-                else:
-                    lines.append(current_line)
-                    current_line = word
-
-            lines.append(current_line)
-
-            # Draw each line with proper alignment
-            y_offset = self.position[1]
+            lines = layout_text(
+                draw,
+                font,
+                self.text,
+                self.font_size,
+                self.max_width,
+                self.line_height,
+                self.alignment,
+            )
+
+            # Draw each line at its laid out offset
+            x, y = self.position
             for line in lines:
-                line_width = draw.textlength(line, font=font)
-
-                # Calculate x position based on alignment
-                if self.alignment == "center":
-                    x = self.position[0] + (self.max_width - line_width) // 2
-                elif self.alignment == "right":
-                    x = self.position[0] + (self.max_width - line_width)
-                else:  # left alignment (default)
-                    x = self.position[0]
-
-                draw.text((x, y_offset), line, font=font, fill=self.color)
-                # Calculate line spacing based on line height
-                line_spacing = int(self.font_size * (self.line_height - 1) + 0.5)  # rounded to nearest int
-                y_offset += self.font_size + line_spacing
+                draw.text(
+                    (x + line.x, y + line.y), line.text, font=font, fill=self.color
+                )
         else:
             # For single line without max_width, just draw the text at the given position
             # (alignment doesn't apply as there's no width constraint)
@@ -116,17 +149,20 @@ class TextComponent(Component):
         return result
 
     @staticmethod
-    def _parse_color(color: Union[str, list, tuple, None]) -> Tuple[int, int, int]:
-        """Parse a color value from various formats to an RGB tuple.
+    def _parse_color(color: Union[str, list, tuple, None]) -> Tuple[int, ...]:
+        """Parse a color value from various formats to an RGB or RGBA tuple.
 
         Args:
             color: Color value in one of these formats:
                 - Hex string (e.g., "#FF0000" or "#F00")
                 - List/tuple of RGB values (e.g., [255, 0, 0] or (255, 0, 0))
+                - List/tuple of RGBA values with an alpha from 0.0 to 1.0
+                  (e.g., [255, 0, 0, 0.5])
                 - None (returns black)
 
         Returns:
-            Tuple of (R, G, B) values in range 0-255
+            Tuple of (R, G, B) values in range 0-255, with a fourth alpha
+            value (0-255) if the color is translucent
         """
         if color is None:
             return (0, 0, 0)
@@ -148,7 +184,8 @@ class TextComponent(Component):
 
         # Handle RGB lists/tuples
         if isinstance(color, (list, tuple)) and len(color) >= 3:
-            return tuple(int(c) for c in color[:3])
+            rgb = tuple(int(c) for c in color[:3])
+            return parse_alpha_color(rgb + tuple(color[3:4]))
 
         return (0, 0, 0)  # Default to black if invalid
 
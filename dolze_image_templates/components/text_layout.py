@@ -0,0 +1,156 @@
+"""
+Text layout engine with cached word measurements and line layouts.
+"""
+
+from typing import Any, NamedTuple, Optional, Tuple
+from PIL import ImageDraw, ImageFont
+
+from dolze_image_templates.utils.cache import LRUCache, register_memory_cache
+
+# Maximum number of cached word widths
+WORD_WIDTH_CACHE_MAX_ENTRIES = 20000
+
+# Maximum number of cached text layouts
+LAYOUT_CACHE_MAX_ENTRIES = 2000
+
+# Lines whose estimated width is this close to max_width (in pixels) are
+# measured exactly, so kerning across word boundaries cannot change wrapping
+MEASURE_TOLERANCE = 2.0
+
+_word_widths = register_memory_cache(
+    "text_word_width", LRUCache(max_entries=WORD_WIDTH_CACHE_MAX_ENTRIES)
+)
+_layouts = register_memory_cache(
+    "text_layout", LRUCache(max_entries=LAYOUT_CACHE_MAX_ENTRIES)
+)
+
+
+class LaidOutLine(NamedTuple):
+    """A single line of wrapped text and its offset from the text position."""
+
+    text: str
+    x: float
+    y: int
+
+
+def _font_key(font: ImageFont.FreeTypeFont) -> Tuple[Any, ...]:
+    """Get a hashable key identifying a loaded font."""
+    path = getattr(font, "path", None)
+    if not isinstance(path, str):
+        return (id(font),)
+    return (path, getattr(font, "size", None), getattr(font, "layout_engine", None))
+
+
+def _word_width(
+    draw: ImageDraw.ImageDraw, font: ImageFont.FreeTypeFont, word: str
+) -> float:
+    """Measure a word, reusing earlier measurements of the same word and font."""
+    key = (_font_key(font), draw.mode, word)
+    width = _word_widths.get(key)
+    if width is None:
+        width = draw.textlength(word, font=font)
+        _word_widths.put(key, width)
+    return width
+
+
+def _wrap_words(
+    draw: ImageDraw.ImageDraw,
+    font: ImageFont.FreeTypeFont,
+    text: str,
+    max_width: int,
+) -> Tuple[str, ...]:
+    """
+    Greedily wrap text into lines no wider than max_width.
+
+    Line widths are estimated by summing cached word and space widths, so
+    wrapping takes linear time in the length of the text.
+    """
+    words = text.split()
+    if not words:
+        return ()
+
+    space_width = _word_width(draw, font, " ")
+    lines = []
+    current = [words[0]]
+    current_width = _word_width(draw, font, words[0])
+
+    for word in words[1:]:
+        word_width = _word_width(draw, font, word)
+        width = current_width + space_width + word_width
+        if abs(width - max_width) <= MEASURE_TOLERANCE:
+            width = draw.textlength(" ".join(current + [word]), font=font)
+
+        if width <= max_width:
+            current.append(word)
+            current_width = width
+        else:
+            lines.append(" ".join(current))
+            current = [word]
+            current_width = word_width
+
+    lines.append(" ".join(current))
+    return tuple(lines)
+
+
+def layout_text(
+    draw: ImageDraw.ImageDraw,
+    font: ImageFont.FreeTypeFont,
+    text: str,
+    font_size: int,
+    max_width: int,
+    line_height: float,
+    alignment: str = "left",
+) -> Tuple[LaidOutLine, ...]:
+    """
+    Wrap text to a maximum width and position each line.
+
+    Layouts are cached by (text, font, size, max_width, line_height,
+    alignment), so rendering the same text again skips layout entirely.
+
+    Args:
+        draw: Draw context used to measure text
+        font: Font to lay the text out with
+        text: Text to lay out
+        font_size: Font size in points, used for line spacing
+        max_width: Maximum line width in pixels
+        line_height: Line height as a multiplier of font size
+        alignment: Text alignment ('left', 'center', 'right')
+
+    Returns:
+        Tuple of lines with x/y offsets relative to the text position
+    """
+    key = (
+        text,
+        _font_key(font),
+        draw.mode,
+        font_size,
+        max_width,
+        line_height,
+        alignment,
+    )
+    layout: Optional[Tuple[LaidOutLine, ...]] = _layouts.get(key)
+    if layout is not None:
+        return layout
+
+    # Calculate line spacing based on line height, rounded to nearest int
+    line_spacing = int(font_size * (line_height - 1) + 0.5)
+
+    lines = []
+    y_offset = 0
+    for line in _wrap_words(draw, font, text, max_width):
+        line_width = draw.textlength(line, font=font)
+
+        # Calculate x offset based on alignment
+        if alignment == "center":
+            x_offset = (max_width - line_width) // 2
+        elif alignment == "right":
+            x_offset = max_width - line_width
+        else:  # left alignment (default)
+            x_offset = 0
+
+        lines.append(LaidOutLine(line, x_offset, y_offset))
+        y_offset += font_size + line_spacing
+
+    layout = tuple(lines)
+    _layouts.put(key, layout)
+    return layout
@@ -13,6 +13,9 @@ DEFAULT_TEMPLATES_DIR = str(BASE_DIR / "templates")
 DEFAULT_FONTS_DIR = str(BASE_DIR / "fonts")
 DEFAULT_OUTPUT_DIR = str(BASE_DIR.parent / "output")
 
+# Default memory budget for decoded images kept in the resource cache
+DEFAULT_MEMORY_CACHE_MAX_MB = 256
+
 # Default template configuration
 DEFAULT_TEMPLATE_CONFIG: Dict[str, Any] = {
     "size": {"width": 1080, "height": 1080},
@@ -66,6 +69,11 @@ class Settings:
         self.templates_dir = overrides.get("templates_dir", DEFAULT_TEMPLATES_DIR)
         self.fonts_dir = overrides.get("fonts_dir", DEFAULT_FONTS_DIR)
         self.output_dir = overrides.get("output_dir", DEFAULT_OUTPUT_DIR)
+
+        # Cache settings
+        self.memory_cache_max_mb = overrides.get(
+            "memory_cache_max_mb", DEFAULT_MEMORY_CACHE_MAX_MB
+        )
         
         # Ensure directories exist
         os.makedirs(self.templates_dir, exist_ok=True)
@@ -112,18 +120,28 @@ class Settings:
                     self.component_styles[key] = value
 
 
-# Default settings instance
-default_settings = Settings()
+# Default settings instance, created on first use since it creates directories
+_default_settings: Optional[Settings] = None
 
 
 def get_settings() -> Settings:
     """
-    Get the default settings instance.
+    Get the default settings instance, creating it on first use.
     
     Returns:
         Settings: The default settings instance
     """
-    return default_settings
+    global _default_settings
+    if _default_settings is None:
+        _default_settings = Settings()
+    return _default_settings
+
+
+def __getattr__(name: str) -> Any:
+    # Keep the former module attribute available
+    if name == "default_settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def configure(**overrides) -> None:
@@ -133,5 +151,10 @@ def configure(**overrides) -> None:
     Args:
         **overrides: Key-value pairs to override default settings
     """
-    global default_settings
-    default_settings = Settings(**overrides)
+    global _default_settings
+    _default_settings = Settings(**overrides)
+
+    # Apply cache budgets to the caches that already exist
+    from dolze_image_templates.utils.cache import apply_settings
+
+    apply_settings(_default_settings)
@@ -3,13 +3,41 @@ Core functionality for the Dolze Templates library.
 
 This module provides the main classes and functions for working with templates.
 """
+from .encoding import (
+    EncodingProfile,
+    ENCODING_PROFILES,
+    get_encoding_profile,
+    register_encoding_profile,
+)
+from .tracing import (
+    ComponentTrace,
+    RenderTrace,
+    RenderTracer,
+    TraceRecorder,
+    get_render_tracer,
+    set_render_tracer,
+    trace_renders,
+)
 from .template_engine import Template, TemplateEngine
+from .template_plan import TemplatePlan
 from .template_registry import TemplateRegistry, get_template_registry
 from .font_manager import FontManager, get_font_manager
 
 __all__ = [
+    'EncodingProfile',
+    'ENCODING_PROFILES',
+    'get_encoding_profile',
+    'register_encoding_profile',
+    'ComponentTrace',
+    'RenderTrace',
+    'RenderTracer',
+    'TraceRecorder',
+    'get_render_tracer',
+    'set_render_tracer',
+    'trace_renders',
     'Template',
     'TemplateEngine',
+    'TemplatePlan',
     'TemplateRegistry',
     'get_template_registry',
     'FontManager',
@@ -0,0 +1,134 @@
+"""
+Layer compositing - draws translucent components through shared RGBA layers.
+
+ImageDraw replaces the pixels it draws on an RGBA image instead of blending
+with them, so a translucent fill drawn straight onto the canvas would punch
+a hole in it. Runs of consecutive translucent components are instead drawn
+into one transparent layer covering their combined bounding box, and the
+layer is merged onto the canvas with a single alpha_composite.
+"""
+
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from dolze_image_templates.components.base import Box, Component, union_box
+
+# Draws a component onto an image: (index, component, image) -> image
+DrawFunction = Callable[[int, Component, Image.Image], Image.Image]
+
+
+def _draw(index: int, component: Component, image: Image.Image) -> Image.Image:
+    """Draw a component with its draw() method."""
+    return component.draw(image)
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    """Check whether two boxes overlap."""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def group_components(
+    components: Sequence[Component],
+) -> Iterator[Tuple[int, List[Component], bool]]:
+    """
+    Split components into runs of consecutive translucent or opaque components.
+
+    Args:
+        components: Components in drawing order
+
+    Yields:
+        (start index, components, translucent) tuples, in drawing order
+    """
+    run: List[Component] = []
+    start = 0
+    translucent = False
+    for index, component in enumerate(components):
+        component_translucent = component.is_translucent()
+        if run and component_translucent != translucent:
+            yield start, run, translucent
+            run = []
+        if not run:
+            start = index
+            translucent = component_translucent
+        run.append(component)
+    if run:
+        yield start, run, translucent
+
+
+def layer_box(
+    components: Sequence[Component], canvas_size: Tuple[int, int]
+) -> Tuple[Box, List[Box]]:
+    """
+    Get the region of a layer holding the given components.
+
+    Args:
+        components: Components drawn into the layer
+        canvas_size: Size (width, height) of the canvas
+
+    Returns:
+        (layer box, component boxes) tuple. Components that do not know
+        their extent get the whole canvas, and so does the layer.
+    """
+    canvas_box = (0, 0, canvas_size[0], canvas_size[1])
+    boxes = []
+    for component in components:
+        box = component.get_bounding_box(canvas_size)
+        boxes.append(canvas_box if box is None else box)
+    drawn = [box for box in boxes if box[2] > box[0] and box[3] > box[1]]
+    return union_box(drawn, canvas_size), boxes
+
+
+def composite_layer(
+    image: Image.Image,
+    components: Sequence[Component],
+    start: int = 0,
+    draw: Optional[DrawFunction] = None,
+) -> Image.Image:
+    """
+    Draw components into one transparent layer and composite it onto an image.
+
+    Each component is moved so the layer's corner is the origin and drawn
+    straight into the layer. A component overlapping an earlier one is drawn
+    into a scratch layer of its own and alpha-composited into the shared
+    layer, so it blends with what is below it rather than replacing it.
+
+    Args:
+        image: Image to composite onto, modified in place
+        components: Components in drawing order
+        start: Index of the first component, passed on to draw
+        draw: Function drawing a (moved) component onto a layer; defaults
+            to the component's draw() method
+
+    Returns:
+        The image with the components composited onto it
+    """
+    draw = draw or _draw
+    box, boxes = layer_box(components, image.size)
+    left, top, right, bottom = box
+    if right <= left or bottom <= top:
+        return image
+
+    layer = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    covered: List[Box] = []
+    for offset, (component, component_box) in enumerate(zip(components, boxes)):
+        c_left, c_top, c_right, c_bottom = component_box
+        if c_right <= c_left or c_bottom <= c_top:
+            continue
+        if any(_intersects(component_box, other) for other in covered):
+            scratch = Image.new(
+                "RGBA", (c_right - c_left, c_bottom - c_top), (0, 0, 0, 0)
+            )
+            scratch = draw(
+                start + offset, component.translated(-c_left, -c_top), scratch
+            )
+            layer.alpha_composite(scratch, (c_left - left, c_top - top))
+        else:
+            layer = draw(start + offset, component.translated(-left, -top), layer)
+        covered.append(component_box)
+
+    if image.mode == "RGBA":
+        image.alpha_composite(layer, (left, top))
+    else:
+        image.paste(layer, (left, top), layer)
+    return image
@@ -0,0 +1,246 @@
+"""
+Encoding profiles - how rendered images are written to bytes or files.
+"""
+
+import os
+import socket
+import time
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+from PIL import Image
+
+from dolze_image_templates.utils.metrics import get_metrics
+
+# Output formats that cannot store an alpha channel
+OPAQUE_FORMATS = ("JPEG",)
+
+# Format aliases accepted in output_format arguments
+FORMAT_ALIASES = {"JPG": "JPEG"}
+
+# File extensions used for generated output paths
+FORMAT_EXTENSIONS = {"PNG": "png", "JPEG": "jpg", "WEBP": "webp", "AVIF": "avif"}
+
+# Encode latency and output size per format
+_encode_seconds = get_metrics().histogram(
+    "dolze_encode_seconds", "Time spent encoding rendered images.", ("format",)
+)
+_encode_bytes = get_metrics().counter(
+    "dolze_encode_bytes_total", "Bytes of encoded output written.", ("format",)
+)
+
+
+class EncodingProfile:
+    """
+    Encoder settings for one output format.
+
+    A profile holds the format and its encoder options, and converts the
+    image first where the format requires it: images with transparency are
+    flattened onto a background colour for JPEG, and PNG images can be
+    quantized to a palette. Options a format does not use are ignored.
+    """
+
+    def __init__(
+        self,
+        format: str = "PNG",
+        compress_level: Optional[int] = None,
+        optimize: bool = False,
+        quality: Optional[int] = None,
+        subsampling: Optional[Union[int, str]] = None,
+        progressive: bool = False,
+        method: Optional[int] = None,
+        lossless: bool = False,
+        palette_colors: Optional[int] = None,
+        background: Tuple[int, int, int] = (255, 255, 255),
+    ):
+        """
+        Initialize an encoding profile.
+
+        Args:
+            format: Output format ('PNG', 'JPEG', 'WEBP', 'AVIF'; 'JPG' is accepted)
+            compress_level: PNG zlib level, 0 (fastest) to 9 (smallest)
+            optimize: Let the PNG/JPEG encoder spend extra time on smaller output
+            quality: JPEG/WebP/AVIF quality, 0 to 100
+            subsampling: JPEG chroma subsampling (e.g. '4:2:0', '4:4:4' or 0-2)
+            progressive: Write a progressive JPEG
+            method: WebP effort, 0 (fastest) to 6 (smallest)
+            lossless: Write lossless WebP
+            palette_colors: Quantize PNG output to a palette of this many colors
+            background: RGB color transparent areas are flattened onto for
+                formats without alpha
+        """
+        format = format.upper()
+        self.format = FORMAT_ALIASES.get(format, format)
+        self.compress_level = compress_level
+        self.optimize = optimize
+        self.quality = quality
+        self.subsampling = subsampling
+        self.progressive = progressive
+        self.method = method
+        self.lossless = lossless
+        self.palette_colors = palette_colors
+        self.background = tuple(background)
+
+    @property
+    def extension(self) -> str:
+        """File extension for images written with this profile."""
+        return FORMAT_EXTENSIONS.get(self.format, self.format.lower())
+
+    def save_options(self) -> Dict[str, Any]:
+        """
+        Get the keyword arguments passed to Image.save for this profile.
+
+        Returns:
+            Dictionary of encoder options
+        """
+        options: Dict[str, Any] = {}
+        if self.format == "PNG":
+            if self.compress_level is not None:
+                options["compress_level"] = self.compress_level
+            if self.optimize:
+                options["optimize"] = True
+        elif self.format == "JPEG":
+            if self.quality is not None:
+                options["quality"] = self.quality
+            if self.subsampling is not None:
+                options["subsampling"] = self.subsampling
+            if self.optimize:
+                options["optimize"] = True
+            if self.progressive:
+                options["progressive"] = True
+        elif self.format in ("WEBP", "AVIF"):
+            if self.quality is not None:
+                options["quality"] = self.quality
+            if self.format == "WEBP" and self.method is not None:
+                options["method"] = self.method
+            if self.format == "WEBP" and self.lossless:
+                options["lossless"] = True
+        return options
+
+    def prepare(self, image: Image.Image) -> Image.Image:
+        """
+        Convert an image to what the format can store.
+
+        Args:
+            image: Rendered image
+
+        Returns:
+            The image itself, or a converted copy
+        """
+        if self.format in OPAQUE_FORMATS:
+            return self._flatten(image)
+        if self.format == "PNG" and self.palette_colors:
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            return image.quantize(
+                colors=self.palette_colors, method=Image.Quantize.FASTOCTREE
+            )
+        return image
+
+    def _flatten(self, image: Image.Image) -> Image.Image:
+        """Composite an image onto the background color, dropping its alpha."""
+        if image.mode in ("RGB", "L", "CMYK"):
+            return image
+        if image.mode not in ("RGBA", "LA"):
+            image = image.convert("RGBA")
+        flattened = Image.new("RGB", image.size, self.background)
+        flattened.paste(image, mask=image.getchannel("A"))
+        return flattened
+
+    def save(
+        self, image: Image.Image, fp: Union[str, BinaryIO, socket.socket]
+    ) -> None:
+        """
+        Encode an image to a file path, binary file object or socket.
+
+        File objects and sockets receive the encoded data as the encoder
+        produces it, without the whole file being buffered first. They are
+        flushed but left open.
+
+        Args:
+            image: Image to encode
+            fp: File path, writable binary file object or connected socket
+        """
+        if isinstance(fp, socket.socket):
+            with fp.makefile("wb") as stream:
+                self.save(image, stream)
+            return
+        start_offset = _tell(fp)
+        start = time.perf_counter()
+        self.prepare(image).save(fp, format=self.format, **self.save_options())
+        if hasattr(fp, "flush"):
+            fp.flush()
+        _encode_seconds.observe(time.perf_counter() - start, format=self.format)
+
+        if isinstance(fp, (str, os.PathLike)):
+            _encode_bytes.inc(os.path.getsize(fp), format=self.format)
+        elif start_offset is not None:
+            end_offset = _tell(fp)
+            if end_offset is not None:
+                _encode_bytes.inc(end_offset - start_offset, format=self.format)
+
+
+def _tell(fp: Any) -> Optional[int]:
+    """Get the position of a file object, or None if it has none."""
+    if isinstance(fp, (str, os.PathLike)):
+        return None
+    try:
+        return fp.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+# Named profiles, selectable by name in the render APIs
+ENCODING_PROFILES: Dict[str, EncodingProfile] = {
+    "png": EncodingProfile("PNG"),
+    "png-fast": EncodingProfile("PNG", compress_level=1),
+    "png-small": EncodingProfile("PNG", compress_level=9, optimize=True),
+    "png-palette": EncodingProfile("PNG", palette_colors=256, compress_level=9),
+    "jpeg": EncodingProfile("JPEG", quality=90, subsampling="4:2:0"),
+    "jpeg-fast": EncodingProfile("JPEG", quality=80, subsampling="4:2:0"),
+    "jpeg-high": EncodingProfile(
+        "JPEG", quality=95, subsampling="4:4:4", optimize=True
+    ),
+    "webp": EncodingProfile("WEBP", quality=85, method=4),
+    "webp-fast": EncodingProfile("WEBP", quality=80, method=0),
+    "webp-small": EncodingProfile("WEBP", quality=80, method=6),
+    "webp-lossless": EncodingProfile("WEBP", lossless=True, method=4),
+    "avif": EncodingProfile("AVIF", quality=70),
+}
+
+
+def register_encoding_profile(name: str, profile: EncodingProfile) -> None:
+    """
+    Register a named encoding profile (replacing any with the same name).
+
+    Args:
+        name: Profile name
+        profile: The profile
+    """
+    ENCODING_PROFILES[name.lower()] = profile
+
+
+def get_encoding_profile(
+    output_format: str = "png",
+    encoding: Optional[Union[str, EncodingProfile]] = None,
+) -> EncodingProfile:
+    """
+    Resolve the encoding profile for a render call.
+
+    Args:
+        output_format: Output image format, used when no encoding is given
+        encoding: Profile name or EncodingProfile, overriding output_format
+
+    Returns:
+        The encoding profile
+
+    Raises:
+        ValueError: If encoding names an unknown profile
+    """
+    if isinstance(encoding, EncodingProfile):
+        return encoding
+    if encoding is not None:
+        profile = ENCODING_PROFILES.get(encoding.lower())
+        if profile is None:
+            raise ValueError(f"Unknown encoding profile: {encoding}")
+        return profile
+    return EncodingProfile(output_format)
@@ -6,11 +6,20 @@ import os
 from typing import Dict, Optional, List, Union
 from PIL import ImageFont, Image
 
+from dolze_image_templates.utils.cache import LRUCache, register_memory_cache
 from dolze_image_templates.utils.logging_config import get_logger
+from dolze_image_templates.utils.metrics import get_metrics
 
 # Set up logging
 logger = get_logger(__name__)
 
+# Fonts loaded from disk, by loader and outcome
+_font_loads = get_metrics().counter(
+    "dolze_font_loads_total",
+    "Fonts loaded from disk (cache misses).",
+    ("source", "result"),
+)
+
 # Common system fonts to try as fallbacks
 SYSTEM_FONT_FALLBACKS = [
     "Arial",
@@ -23,6 +32,12 @@ SYSTEM_FONT_FALLBACKS = [
     "OpenSans",
 ]
 
+# Maximum number of loaded (font file, size, layout engine) combinations kept in memory
+FONT_CACHE_MAX_ENTRIES = 256
+
+# Maximum number of font names remembered as not loadable
+FAILED_FONT_CACHE_MAX_ENTRIES = 1024
+
 
 class FontManager:
     """
@@ -38,6 +53,13 @@ class FontManager:
         """
         self.font_dir = font_dir
         self.fonts: Dict[str, str] = {}
+        self._font_cache = register_memory_cache(
+            "font", LRUCache(max_entries=FONT_CACHE_MAX_ENTRIES)
+        )
+        self._failed_fonts = register_memory_cache(
+            "font_failures", LRUCache(max_entries=FAILED_FONT_CACHE_MAX_ENTRIES)
+        )
+        self._default_font: Optional[ImageFont.ImageFont] = None
         self._scan_fonts()
 
     def _scan_fonts(self) -> None:
@@ -133,11 +155,51 @@ class FontManager:
         else:
             logger.warning(f"No fonts found in {self.font_dir}")
 
+    def _load_truetype(
+        self, path: str, size: int, layout_engine: Optional[int] = None
+    ) -> ImageFont.FreeTypeFont:
+        """
+        Load a TrueType/OpenType font, reusing a cached instance when possible.
+
+        Paths that fail to load are remembered, so later calls fail fast
+        instead of hitting the filesystem and FreeType again.
+
+        Args:
+            path: Font file path or system font name
+            size: Font size in points
+            layout_engine: PIL layout engine (None for Pillow's default)
+
+        Returns:
+            PIL FreeTypeFont object
+
+        Raises:
+            OSError: If the font cannot be loaded
+        """
+        key = (path, size, layout_engine)
+        font = self._font_cache.get(key)
+        if font is not None:
+            return font
+
+        if self._failed_fonts.get(path):
+            raise OSError(f"Font '{path}' previously failed to load")
+
+        try:
+            font = ImageFont.truetype(path, size, layout_engine=layout_engine)
+        except OSError:
+            self._failed_fonts.put(path, True)
+            _font_loads.inc(source="font_manager", result="error")
+            raise
+        _font_loads.inc(source="font_manager", result="ok")
+
+        self._font_cache.put(key, font)
+        return font
+
     def get_font(
         self,
         font_name: Optional[str] = None,
         size: int = 24,
         fallback_to_default: bool = True,
+        layout_engine: Optional[int] = None,
     ) -> ImageFont.FreeTypeFont:
         """
         Get a font by name and size with graceful fallback to system fonts.
@@ -148,10 +210,14 @@ class FontManager:
         3. Try common system fonts
         4. Fall back to PIL's default font
 
+        Loaded fonts are cached by (font file, size, layout engine) and names
+        that cannot be loaded are remembered, so repeated calls are cheap.
+
         Args:
             font_name: Name of the font (without extension) or path to a font file
             size: Font size in points
             fallback_to_default: Whether to fall back to default font if all else fails
+            layout_engine: PIL layout engine (e.g. ImageFont.Layout.BASIC), None for default
 
         Returns:
             PIL ImageFont object
@@ -160,7 +226,7 @@ class FontManager:
         if font_name and font_name in self.fonts:
             try:
                 font_path = self.fonts[font_name]
-                return ImageFont.truetype(font_path, size)
+                return self._load_truetype(font_path, size, layout_engine)
             except Exception as e:
                 logger.warning(f"Failed to load registered font '{font_name}': {e}")
                 # Continue to next fallback
@@ -168,26 +234,31 @@ class FontManager:
         # 2. Try to load as system font if font_name is provided
         if font_name:
             try:
-                return ImageFont.truetype(font_name, size)
+                return self._load_truetype(font_name, size, layout_engine)
             except Exception as e:
                 logger.debug(f"Font '{font_name}' not found in system: {e}")
                 # Continue to next fallback
 
         # 3. Try system fallback fonts
-        system_font = self._get_system_font(size, font_name)
+        system_font = self._get_system_font(size, font_name, layout_engine)
         if system_font:
             return system_font
 
         # 4. Fall back to default font if enabled
         if fallback_to_default:
             logger.warning(f"Using default font as fallback")
-            return ImageFont.load_default()
+            if self._default_font is None:
+                self._default_font = ImageFont.load_default()
+            return self._default_font
 
         # If we get here and fallback_to_default is False, raise an error
         raise ValueError(f"Could not load font: {font_name}")
 
     def _get_system_font(
-        self, size: int, attempted_font: Optional[str] = None
+        self,
+        size: int,
+        attempted_font: Optional[str] = None,
+        layout_engine: Optional[int] = None,
     ) -> Optional[ImageFont.FreeTypeFont]:
         """
         Try to load a system font from common font families.
@@ -195,6 +266,7 @@ class FontManager:
         Args:
             size: Font size in points
             attempted_font: The font name that was originally attempted (for logging)
+            layout_engine: PIL layout engine (None for Pillow's default)
 
         Returns:
             PIL ImageFont if successful, None if no system font could be loaded
@@ -205,7 +277,7 @@ class FontManager:
                 if attempted_font and font_name.lower() == attempted_font.lower():
                     continue  # Skip if this is the font we already tried
 
-                font = ImageFont.truetype(font_name, size)
+                font = self._load_truetype(font_name, size, layout_engine)
                 logger.debug(f"Using system font: {font_name}")
                 return font
             except Exception as e:
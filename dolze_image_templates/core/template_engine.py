@@ -2,18 +2,42 @@
 Template engine for rendering templates with components.
 """
 
+import copy
 import os
 import json
 import logging
+import socket
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from io import BytesIO
-from typing import Dict, Any, List, Optional, Tuple, Union
+from itertools import islice
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from pathlib import Path
 from PIL import Image
 
 from dolze_image_templates.components import create_component_from_config, Component
+from dolze_image_templates.core.compositing import composite_layer, group_components
+from dolze_image_templates.core.encoding import EncodingProfile, get_encoding_profile
+from dolze_image_templates.core.tracing import (
+    RenderTrace,
+    RenderTracer,
+    get_render_tracer,
+    traced_draw,
+)
 from dolze_image_templates.resources import load_image, load_font
 from dolze_image_templates.exceptions import ResourceError
+from dolze_image_templates.fetcher import get_image_fetcher
 from dolze_image_templates.utils.logging_config import get_logger
 
 # Set up logging
@@ -43,6 +67,9 @@ class Template:
         self.size = size
         self.background_color = background_color
         self.components: List[Component] = []
+        # Index of the first component in the template configuration, for
+        # templates that render only part of it (reported by tracers)
+        self.component_offset = 0
 
     def add_component(self, component: Component) -> None:
         """
@@ -53,34 +80,151 @@ class Template:
         """
         self.components.append(component)
 
-    def render(self, base_image: Optional[Image.Image] = None) -> Image.Image:
+    def fetch_images(self) -> List[Component]:
+        """
+        Download every remote image the components need, concurrently.
+
+        Components receive the decoded images before drawing, so a template
+        with several remote images waits for the slowest download rather
+        than for all of them in turn.
+
+        Components may be shared with other renders (see TemplatePlan), so a
+        component whose download failed is replaced by a copy for this render
+        only; the shared component stays unloaded and is retried next time.
+
+        Returns:
+            The components to draw in this render
+        """
+        target_sizes: Dict[str, Optional[Tuple[int, int]]] = {}
+        component_urls: List[List[str]] = []
+        for component in self.components:
+            size = component.get_image_target_size()
+            urls = component.get_image_urls()
+            component_urls.append(urls)
+            for url in urls:
+                # An image used at several sizes is decoded for the largest
+                if url not in target_sizes:
+                    target_sizes[url] = size
+                elif size is None or target_sizes[url] is None:
+                    target_sizes[url] = None
+                else:
+                    target_sizes[url] = (
+                        max(size[0], target_sizes[url][0]),
+                        max(size[1], target_sizes[url][1]),
+                    )
+        if not target_sizes:
+            return list(self.components)
+
+        images = get_image_fetcher().fetch_all(target_sizes, target_sizes)
+        components = []
+        for component, urls in zip(self.components, component_urls):
+            if any(images.get(url) is None for url in urls):
+                component = copy.copy(component)
+            if urls:
+                component.set_fetched_images(images)
+            components.append(component)
+        return components
+
+    def render(
+        self,
+        base_image: Optional[Image.Image] = None,
+        copy_per_component: bool = False,
+        tracer: Optional[RenderTracer] = None,
+    ) -> Image.Image:
         """
         Render the template with all its components.
 
+        Remote images are fetched concurrently first (see fetch_images). By
+        default every component then draws directly onto a single canvas, so
+        no full-canvas copies are made while compositing. Runs of consecutive
+        translucent components are drawn into one shared transparent layer,
+        which is alpha-composited onto the canvas once per run.
+
         Args:
             base_image: Optional base image to use instead of creating a new one
+            copy_per_component: If True, use each component's render() method,
+                which returns a new image per component instead of drawing in
+                place. Components with a bounding box render onto a copy of
+                just that region, which is pasted back (see
+                Component.render_clipped). Translucent components always
+                draw onto their layer.
+            tracer: Tracer to report per-component timings to. Defaults to the
+                tracer installed with set_render_tracer, if any.
 
         Returns:
             Rendered image
         """
+        if tracer is None:
+            tracer = get_render_tracer()
+        if tracer is not None:
+            return self._render_traced(base_image, copy_per_component, tracer)
+
+        result = self._create_canvas(base_image)
+        components = self.fetch_images()
+
+        # Render each component
+        for _, group, translucent in group_components(components):
+            if translucent:
+                result = composite_layer(result, group)
+                continue
+            for component in group:
+                if copy_per_component:
+                    result = component.render_clipped(result)
+                else:
+                    result = component.draw(result)
+
+        return result
+
+    def _create_canvas(self, base_image: Optional[Image.Image]) -> Image.Image:
+        """Create the canvas to render on, from a base image if one is given."""
         # Create a new image if no base image is provided
         if base_image is None:
-            result = Image.new("RGBA", self.size, self.background_color)
-        else:
-            # Resize the base image if needed
-            if base_image.size != self.size:
-                base_image = base_image.resize(self.size, Image.Resampling.LANCZOS)
-
-            # Convert to RGBA if needed
-            if base_image.mode != "RGBA":
-                result = base_image.convert("RGBA")
-            else:
-                result = base_image.copy()
+            return Image.new("RGBA", self.size, self.background_color)
 
-        # Render each component
-        for component in self.components:
-            result = component.render(result)
+        # Resize the base image if needed
+        if base_image.size != self.size:
+            base_image = base_image.resize(self.size, Image.Resampling.LANCZOS)
+
+        # Convert to RGBA if needed
+        if base_image.mode != "RGBA":
+            return base_image.convert("RGBA")
+        return base_image.copy()
+
+    def _render_traced(
+        self,
+        base_image: Optional[Image.Image],
+        copy_per_component: bool,
+        tracer: RenderTracer,
+    ) -> Image.Image:
+        """Render like render(), reporting every step to a tracer."""
+        trace = RenderTrace(self.name, self.size)
+        tracer.start_render(self)
+        start = time.perf_counter()
+
+        result = self._create_canvas(base_image)
+
+        fetch_start = time.perf_counter()
+        components = self.fetch_images()
+        trace.fetch_ms = (time.perf_counter() - fetch_start) * 1000
+
+        def draw_layer(
+            index: int, component: Component, layer: Image.Image
+        ) -> Image.Image:
+            return traced_draw(tracer, self, trace, index, component, layer, False)
+
+        groups = group_components(components)
+        for group_start, group, translucent in groups:
+            group_start += self.component_offset
+            if translucent:
+                result = composite_layer(result, group, group_start, draw_layer)
+                continue
+            for index, component in enumerate(group, group_start):
+                result = traced_draw(
+                    tracer, self, trace, index, component, result, copy_per_component
+                )
 
+        trace.total_ms = (time.perf_counter() - start) * 1000
+        tracer.end_render(trace)
         return result
 
     @classmethod
@@ -119,16 +263,61 @@ class TemplateEngine:
     Engine for processing templates and generating images.
     """
 
-    def __init__(self, output_dir: str = "output"):
+    def __init__(
+        self, output_dir: str = "output", max_workers: int = 1, chunk_size: int = 1
+    ):
         """
         Initialize the template engine.
 
         Args:
             output_dir: Directory to store generated images
+            max_workers: Number of worker processes used by render_batch and
+                process_json. 1 renders in the calling process; use
+                os.cpu_count() to use every core.
+            chunk_size: Number of renders sent to a worker process at a time
         """
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         self.templates: Dict[str, Template] = {}
+        self.max_workers = max(1, int(max_workers))
+        self.chunk_size = max(1, int(chunk_size))
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "TemplateEngine":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any were started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Get the worker pool, starting it on first use.
+
+        Workers are kept alive between calls so their template registry,
+        fonts and caches stay warm.
+
+        Returns:
+            The process pool, or None when rendering in-process
+        """
+        if self.max_workers <= 1:
+            return None
+        if self._executor is None:
+            from dolze_image_templates.core.template_registry import (
+                get_template_registry,
+            )
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(get_template_registry().templates_dir,),
+            )
+        return self._executor
 
     def add_template(self, template: Template) -> None:
         """
@@ -160,6 +349,9 @@ class TemplateEngine:
         """
         Process JSON input to generate images.
 
+        When the engine has more than one worker, templates are rendered in
+        parallel worker processes.
+
         Args:
             json_data: JSON data containing template configurations
 
@@ -171,65 +363,98 @@ class TemplateEngine:
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
 
+        executor = self._get_executor()
+        if executor is not None:
+            futures = {
+                template_name: executor.submit(
+                    _process_template_in_worker,
+                    self.output_dir,
+                    template_name,
+                    template_data,
+                )
+                for template_name, template_data in json_data.items()
+            }
+            for template_name, future in futures.items():
+                try:
+                    results[template_name] = future.result()
+                except Exception as e:
+                    error_msg = f"Error processing template {template_name}: {e}"
+                    logger.error(error_msg)
+                    results[template_name] = f"Error: {error_msg}"
+            return results
+
         # Process each template in the JSON
         for template_name, template_data in json_data.items():
-            try:
-                logger.info(f"Processing template: {template_name}")
-
-                # Create a new template
-                template = Template(
-                    name=template_name,
-                    size=template_data.get("size", (800, 600)),
-                    background_color=template_data.get(
-                        "background_color", (255, 255, 255)
-                    ),
-                )
+            results[template_name] = self._process_template(
+                template_name, template_data
+            )
 
-                # Add components
-                for component_data in template_data.get("components", []):
-                    try:
-                        component = create_component_from_config(component_data)
-                        if component:
-                            template.add_component(component)
-                    except Exception as e:
-                        logger.error(
-                            f"Error creating component in {template_name}: {e}"
-                        )
-                        continue
+        return results
 
-                # Render the template
-                output_path = os.path.join(self.output_dir, f"{template_name}.png")
+    def _process_template(
+        self, template_name: str, template_data: Dict[str, Any]
+    ) -> str:
+        """
+        Render a single template configuration from process_json input.
 
-                try:
-                    # Handle base image if specified
-                    base_image = None
-                    if template_data.get("use_base_image"):
-                        base_image_path = template_data.get("base_image_path")
-                        if base_image_path:
-                            if base_image_path.startswith(("http://", "https://")):
-                                base_image = self.download_image(base_image_path)
-                            else:
-                                base_image = load_image(base_image_path)
-
-                    # Render with or without base image
-                    rendered_image = template.render(base_image=base_image)
-
-                    # Save the result
-                    rendered_image.save(output_path)
-                    results[template_name] = output_path
-                    logger.info(f"Successfully generated: {output_path}")
+        Args:
+            template_name: Name of the template
+            template_data: Template configuration
+
+        Returns:
+            Path to the generated image, or an error message starting with "Error:"
+        """
+        try:
+            logger.info(f"Processing template: {template_name}")
 
+            # Create a new template
+            template = Template(
+                name=template_name,
+                size=template_data.get("size", (800, 600)),
+                background_color=template_data.get("background_color", (255, 255, 255)),
+            )
+
+            # Add components
+            for component_data in template_data.get("components", []):
+                try:
+                    component = create_component_from_config(component_data)
+                    if component:
+                        template.add_component(component)
                 except Exception as e:
-                    error_msg = f"Error rendering template {template_name}: {e}"
-                    logger.error(error_msg)
-                    results[template_name] = f"Error: {error_msg}"
+                    logger.error(f"Error creating component in {template_name}: {e}")
+                    continue
+
+            # Render the template
+            output_path = os.path.join(self.output_dir, f"{template_name}.png")
+
+            try:
+                # Handle base image if specified
+                base_image = None
+                if template_data.get("use_base_image"):
+                    base_image_path = template_data.get("base_image_path")
+                    if base_image_path:
+                        if base_image_path.startswith(("http://", "https://")):
+                            base_image = self.download_image(base_image_path)
+                        else:
+                            base_image = load_image(base_image_path)
+
+                # Render with or without base image
+                rendered_image = template.render(base_image=base_image)
+
+                # Save the result
+                rendered_image.save(output_path)
+                logger.info(f"Successfully generated: {output_path}")
+                return output_path
 
             except Exception as e:
-                error_msg = f"Error processing template {template_name}: {e}"
+                error_msg = f"Error rendering template {template_name}: {e}"
                 logger.error(error_msg)
-                results[template_name] = f"Error: {error_msg}"
+                return f"Error: {error_msg}"
 
-        return results
+        except Exception as e:
+            error_msg = f"Error processing template {template_name}: {e}"
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
 
     def process_from_file(self, json_file: str) -> Dict[str, str]:
         """
@@ -281,6 +506,190 @@ class TemplateEngine:
         """Clear all registered templates."""
         self.templates.clear()
 
+    @staticmethod
+    def _encode_image(image: Image.Image, profile: EncodingProfile) -> bytes:
+        """
+        Encode an image to bytes.
+
+        Args:
+            image: Image to encode
+            profile: Encoding profile to use
+
+        Returns:
+            Encoded image bytes
+        """
+        img_byte_arr = BytesIO()
+        profile.save(image, img_byte_arr)
+        return img_byte_arr.getvalue()
+
+    @staticmethod
+    def _encode_to_memoryview(image: Image.Image, profile: EncodingProfile) -> memoryview:
+        """
+        Encode an image into a buffer and return a view of it, without copying.
+
+        Args:
+            image: Image to encode
+            profile: Encoding profile to use
+
+        Returns:
+            Read-only view of the encoded image
+        """
+        img_byte_arr = BytesIO()
+        profile.save(image, img_byte_arr)
+        return img_byte_arr.getbuffer().toreadonly()
+
+    @staticmethod
+    def _save_image(image: Image.Image, output_path: str, profile: EncodingProfile) -> None:
+        """
+        Save an image to a file.
+
+        Args:
+            image: Image to save
+            output_path: Path to save the image to
+            profile: Encoding profile to use
+        """
+        profile.save(image, output_path)
+
+    def render_batch(
+        self,
+        template_name: str,
+        variables_list: Iterable[Dict[str, Any]],
+        output_format: str = "png",
+        return_bytes: bool = True,
+        output_dir: Optional[str] = None,
+        ordered: bool = True,
+        encoding: Optional[Union[str, EncodingProfile]] = None,
+    ) -> Iterator[Any]:
+        """
+        Render a template once for each set of variables.
+
+        The template is resolved once and fonts, gradients and static
+        components are shared across the batch. Results are yielded one at a
+        time, so large batches can be streamed. When the engine has more than
+        one worker, renders are spread over worker processes in chunks of
+        chunk_size.
+
+        Args:
+            template_name: Name of the template to render (must be in the templates directory)
+            variables_list: Iterable of variable dictionaries, one per image
+            output_format: Output image format (e.g., 'png', 'jpg', 'jpeg')
+            return_bytes: If True, yields image bytes instead of saving to disk
+            output_dir: Directory to save images to when return_bytes is False
+                (defaults to the engine's output directory)
+            ordered: If True, results are yielded in input order. If False,
+                (index, result) pairs are yielded as soon as they are ready.
+            encoding: Encoding profile name (e.g. 'png-fast', 'webp') or
+                EncodingProfile, overriding output_format
+
+        Returns:
+            Iterator yielding image bytes or paths to the saved images
+
+        Raises:
+            ValueError: If the template or encoding profile is not found
+        """
+        from dolze_image_templates.core.template_registry import get_template_registry
+
+        registry = get_template_registry()
+        if registry.get_plan(template_name) is None:
+            raise ValueError(f"Template '{template_name}' not found")
+        profile = get_encoding_profile(output_format, encoding)
+
+        if not return_bytes:
+            output_dir = output_dir or self.output_dir
+            os.makedirs(output_dir, exist_ok=True)
+        batch_id = int(time.time())
+
+        def output_paths(start: int, count: int) -> Optional[List[str]]:
+            if return_bytes:
+                return None
+            return [
+                os.path.join(
+                    output_dir,
+                    f"{template_name}_{batch_id}_{index}.{profile.extension}",
+                )
+                for index in range(start, start + count)
+            ]
+
+        executor = self._get_executor()
+        if executor is None:
+            results = (
+                _render_chunk(
+                    template_name, [variables], profile, output_paths(index, 1)
+                )[0]
+                for index, variables in enumerate(variables_list)
+            )
+            return results if ordered else enumerate(results)
+
+        return self._render_batch_parallel(
+            executor,
+            template_name,
+            variables_list,
+            profile,
+            output_paths,
+            ordered,
+        )
+
+    def _render_batch_parallel(
+        self,
+        executor: ProcessPoolExecutor,
+        template_name: str,
+        variables_list: Iterable[Dict[str, Any]],
+        profile: EncodingProfile,
+        output_paths: Any,
+        ordered: bool,
+    ) -> Iterator[Any]:
+        """
+        Render a batch in worker processes, keeping a bounded number of chunks in flight.
+
+        Args:
+            executor: Worker pool to submit chunks to
+            template_name: Name of the template to render
+            variables_list: Iterable of variable dictionaries, one per image
+            profile: Encoding profile to use
+            output_paths: Function mapping (start index, count) to output paths or None
+            ordered: Whether to yield results in input order
+
+        Returns:
+            Iterator yielding results, or (index, result) pairs if not ordered
+        """
+        variables_iter = iter(variables_list)
+        max_pending = self.max_workers * 2
+        pending: "deque" = deque()
+        start = 0
+
+        while True:
+            # Keep workers busy without materializing the whole input
+            while len(pending) < max_pending:
+                chunk = list(islice(variables_iter, self.chunk_size))
+                if not chunk:
+                    break
+                future = executor.submit(
+                    _render_chunk,
+                    template_name,
+                    chunk,
+                    profile,
+                    output_paths(start, len(chunk)),
+                )
+                pending.append((start, future))
+                start += len(chunk)
+
+            if not pending:
+                return
+
+            if ordered:
+                _, future = pending.popleft()
+                yield from future.result()
+                continue
+
+            done, _ = wait(
+                [future for _, future in pending], return_when=FIRST_COMPLETED
+            )
+            for item in [item for item in pending if item[1] in done]:
+                pending.remove(item)
+                chunk_start, future = item
+                for offset, result in enumerate(future.result()):
+                    yield chunk_start + offset, result
+
     def render_template(
         self,
         template_name: str,
@@ -288,7 +697,10 @@ class TemplateEngine:
         output_path: Optional[str] = None,
         output_format: str = "png",
         return_bytes: bool = False,
-    ) -> Union[str, bytes]:
+        encoding: Optional[Union[str, EncodingProfile]] = None,
+        output_stream: Optional[Union[BinaryIO, socket.socket]] = None,
+        return_memoryview: bool = False,
+    ) -> Union[str, bytes, memoryview, BinaryIO, socket.socket]:
         """
         Render a template with the given variables.
 
@@ -298,13 +710,21 @@ class TemplateEngine:
             output_path: Path to save the rendered image. If None and return_bytes is False, a path will be generated.
             output_format: Output image format (e.g., 'png', 'jpg', 'jpeg')
             return_bytes: If True, returns the image as bytes instead of saving to disk
+            encoding: Encoding profile name (e.g. 'png-fast', 'jpeg', 'webp') or
+                EncodingProfile, overriding output_format
+            output_stream: Writable binary file object or connected socket to
+                encode the image into as it is produced (e.g. an HTTP response
+                body). Takes precedence over return_bytes and output_path.
+            return_memoryview: With return_bytes, return a read-only memoryview
+                of the encoded buffer instead of a copy of it as bytes
 
         Returns:
-            If return_bytes is True: Image bytes
+            If output_stream is given: output_stream, flushed and left open
+            If return_bytes is True: Image bytes (or a memoryview of them)
             If return_bytes is False: Path to the rendered image
 
         Raises:
-            ValueError: If the template is not found or configuration is invalid
+            ValueError: If the template or encoding profile is not found, or configuration is invalid
             IOError: If there's an error saving the image
             RuntimeError: If there's an error during rendering
         """
@@ -313,6 +733,7 @@ class TemplateEngine:
             
             registry = get_template_registry()
             variables = variables or {}
+            profile = get_encoding_profile(output_format, encoding)
             
             # Log start of rendering
             logger.info(f"Rendering template: {template_name}")
@@ -325,26 +746,31 @@ class TemplateEngine:
                 logger.error(error_msg)
                 raise ValueError(error_msg)
             
-            # Handle output based on return_bytes flag
+            # Handle output based on output_stream and return_bytes
+            if output_stream is not None:
+                profile.save(image, output_stream)
+                logger.debug(f"Rendered template to stream: {template_name}")
+                return output_stream
+
             if return_bytes:
-                img_byte_arr = BytesIO()
-                image.save(img_byte_arr, format=output_format.upper())
                 logger.debug(f"Rendered template to bytes: {template_name}")
-                return img_byte_arr.getvalue()
+                if return_memoryview:
+                    return self._encode_to_memoryview(image, profile)
+                return self._encode_image(image, profile)
             
             # Generate output path if not provided
             if output_path is None:
                 os.makedirs(self.output_dir, exist_ok=True)
                 output_path = os.path.join(
                     self.output_dir,
-                    f"{template_name}_{int(time.time())}.{output_format.lower()}",
+                    f"{template_name}_{int(time.time())}.{profile.extension}",
                 )
             
             # Ensure output directory exists
             os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
             
             # Save the image
-            image.save(output_path, format=output_format.upper())
+            self._save_image(image, output_path, profile)
             logger.info(f"Saved rendered template to: {output_path} (took {time.time() - start_time:.2f}s)")
             
             return output_path
@@ -355,3 +781,61 @@ class TemplateEngine:
             if not isinstance(e, (ValueError, IOError, RuntimeError)):
                 raise RuntimeError(error_msg) from e
             raise
+
+
+def _init_worker(templates_dir: Optional[str]) -> None:
+    """
+    Warm up a worker process by loading its template registry.
+
+    Args:
+        templates_dir: Templates directory used by the parent process
+    """
+    from dolze_image_templates.core.template_registry import get_template_registry
+
+    get_template_registry(templates_dir)
+
+
+def _render_chunk(
+    template_name: str,
+    variables_chunk: List[Dict[str, Any]],
+    profile: EncodingProfile,
+    output_paths: Optional[List[str]] = None,
+) -> List[Union[bytes, str]]:
+    """
+    Render a chunk of a batch, in the calling process or a worker process.
+
+    Args:
+        template_name: Name of the template to render
+        variables_chunk: Variable dictionaries, one per image
+        profile: Encoding profile to use
+        output_paths: Paths to save the images to, or None to return bytes
+
+    Returns:
+        Encoded image bytes, or the paths the images were saved to
+    """
+    from dolze_image_templates.core.template_registry import get_template_registry
+
+    images = get_template_registry().render_batch(template_name, variables_chunk)
+    if output_paths is None:
+        return [TemplateEngine._encode_image(image, profile) for image in images]
+
+    for image, output_path in zip(images, output_paths):
+        TemplateEngine._save_image(image, output_path, profile)
+    return list(output_paths)
+
+
+def _process_template_in_worker(
+    output_dir: str, template_name: str, template_data: Dict[str, Any]
+) -> str:
+    """
+    Render a process_json template configuration in a worker process.
+
+    Args:
+        output_dir: Directory to store the generated image
+        template_name: Name of the template
+        template_data: Template configuration
+
+    Returns:
+        Path to the generated image, or an error message starting with "Error:"
+    """
+    return TemplateEngine(output_dir)._process_template(template_name, template_data)
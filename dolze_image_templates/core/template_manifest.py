@@ -0,0 +1,387 @@
+"""
+Template manifest - an index of the template files in a templates directory.
+
+The manifest records, for each template file, the template name, the
+variables it references, whether it takes an uploaded image, and a digest of
+the file. The registry lists templates from the manifest and parses a
+template body only when the template is first used.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from dolze_image_templates.core.template_plan import PLACEHOLDER_PATTERN
+from dolze_image_templates.utils.cache import atomic_path, get_resource_cache
+from dolze_image_templates.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# File name of the manifest inside the templates directory (never loaded as a template)
+MANIFEST_FILENAME = "manifest.json"
+
+# Format version; manifests written with another version are rebuilt
+MANIFEST_VERSION = 2
+
+# Directory (inside the resource cache directory) holding the size and
+# modification time last seen for each file of a templates directory
+STATE_DIRNAME = "template_manifests"
+
+# Placeholder marking a field filled with an uploaded image
+IMAGE_UPLOAD_PLACEHOLDER = "${image_url}"
+
+
+def has_image_upload(config: Any) -> bool:
+    """
+    Check if a template configuration contains any image upload fields.
+
+    Args:
+        config: Template configuration or part of it
+
+    Returns:
+        True if any field value is "${image_url}", False otherwise
+    """
+    if isinstance(config, str):
+        return config == IMAGE_UPLOAD_PLACEHOLDER
+    if isinstance(config, dict):
+        return any(has_image_upload(value) for value in config.values())
+    if isinstance(config, list):
+        return any(has_image_upload(item) for item in config)
+    return False
+
+
+def find_variables(config: Any) -> List[str]:
+    """
+    Get the names of the variables a template configuration references.
+
+    Args:
+        config: Template configuration
+
+    Returns:
+        Variable names in order of first appearance
+    """
+    names: Dict[str, None] = {}
+
+    def visit(value: Any) -> None:
+        if isinstance(value, str):
+            for match in PLACEHOLDER_PATTERN.finditer(value):
+                names.setdefault(match.group(1))
+        elif isinstance(value, dict):
+            for item in value.values():
+                visit(item)
+        elif isinstance(value, list):
+            for item in value:
+                visit(item)
+
+    visit(config)
+    return list(names)
+
+
+def describe_template(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the manifest entry for a template configuration.
+
+    Args:
+        config: Template configuration
+
+    Returns:
+        Dictionary with the template's name, variables and image upload flag
+    """
+    return {
+        "name": config["name"],
+        "variables": find_variables(config),
+        "image_upload": has_image_upload(config),
+    }
+
+
+class TemplateManifest:
+    """
+    Manifest of the template files in one directory.
+
+    The manifest is stored as MANIFEST_FILENAME in the templates directory.
+    It only holds what depends on file content, so it can be kept under
+    version control. When the package is built, a frozen copy is generated
+    (see build_manifest); a frozen manifest is trusted as is, so an installed
+    package lists its templates by reading that one file.
+
+    Other manifests are checked on refresh: files whose size and
+    modification time match the state saved in the resource cache directory
+    are trusted without being read, others are checked against their digest
+    and parsed only if their content changed. A manifest that cannot be
+    written (e.g. in a read-only install) is kept in memory.
+    """
+
+    def __init__(self, templates_dir: Union[str, Path]):
+        """
+        Initialize the manifest of a templates directory.
+
+        Args:
+            templates_dir: Directory containing template definition files
+        """
+        self.templates_dir = Path(templates_dir)
+        self.path = self.templates_dir / MANIFEST_FILENAME
+        self.frozen = False
+        # Entries by file name; files that are not templates have no "name"
+        self._files: Dict[str, Dict[str, Any]] = {}
+
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the manifest up to date with the templates directory.
+
+        A frozen manifest is loaded without looking at the template files.
+
+        Returns:
+            Configurations parsed while refreshing, by template name, so the
+            caller does not need to parse them again
+        """
+        previous, self.frozen = self._read()
+        if self.frozen:
+            self._files = previous
+            return {}
+
+        state_path = self._state_path()
+        seen = self._read_state(state_path)
+        parsed, stats = self._scan(previous, seen)
+        if self._files != previous:
+            self._write()
+        if stats != seen:
+            self._write_state(state_path, stats)
+        return parsed
+
+    def rebuild(self, frozen: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Check every template file and store the manifest.
+
+        Args:
+            frozen: Whether to mark the manifest as final, so it is trusted
+                without checking the template files
+
+        Returns:
+            Configurations parsed while rebuilding, by template name
+        """
+        previous, _ = self._read()
+        parsed, _ = self._scan(previous, {})
+        self.frozen = frozen
+        self._write()
+        return parsed
+
+    def _scan(
+        self, previous: Dict[str, Dict[str, Any]], seen: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Check the template files against the stored entries.
+
+        Args:
+            previous: Stored manifest entries, by file name
+            seen: Size, modification time and digest last seen, by file name
+
+        Returns:
+            (parsed configurations by template name, file state by file name)
+        """
+        parsed: Dict[str, Dict[str, Any]] = {}
+        files: Dict[str, Dict[str, Any]] = {}
+        stats: Dict[str, Dict[str, Any]] = {}
+
+        with os.scandir(self.templates_dir) as it:
+            for dir_entry in it:
+                if (
+                    not dir_entry.name.endswith(".json")
+                    or dir_entry.name == MANIFEST_FILENAME
+                    or not dir_entry.is_file()
+                ):
+                    continue
+                entry, stat, config = self._check_file(
+                    Path(dir_entry.path),
+                    previous.get(dir_entry.name),
+                    seen.get(dir_entry.name),
+                )
+                if entry is not None:
+                    files[dir_entry.name] = entry
+                    stats[dir_entry.name] = stat
+                if config is not None:
+                    parsed[config["name"]] = config
+
+        self._files = files
+        return parsed, stats
+
+    def _read(self) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        """Read the stored manifest as (entries, frozen), or ({}, False) if missing."""
+        data = _read_json(self.path)
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return {}, False
+        return data.get("files", {}), bool(data.get("frozen"))
+
+    def _write(self) -> None:
+        """Store the manifest, if the templates directory is writable."""
+        data: Dict[str, Any] = {"version": MANIFEST_VERSION, "files": self._files}
+        if self.frozen:
+            data["frozen"] = True
+        _write_json(self.path, data)
+
+    def _state_path(self) -> Path:
+        """Get the path of the file state saved for this templates directory."""
+        key = hashlib.md5(str(self.templates_dir.resolve()).encode("utf-8"))
+        state_dir = get_resource_cache().cache_dir / STATE_DIRNAME
+        return state_dir / f"{key.hexdigest()}.json"
+
+    def _read_state(self, path: Path) -> Dict[str, Dict[str, Any]]:
+        """Read the saved file state, or return no entries if there is none."""
+        data = _read_json(path)
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _write_state(self, path: Path, stats: Dict[str, Dict[str, Any]]) -> None:
+        """Save the file state, so unchanged files are not read next time."""
+        try:
+            path.parent.mkdir(exist_ok=True)
+        except OSError:
+            pass
+        _write_json(path, {"version": MANIFEST_VERSION, "files": stats})
+
+    def _check_file(
+        self,
+        path: Path,
+        old: Optional[Dict[str, Any]],
+        seen: Optional[Dict[str, Any]],
+    ) -> Tuple[
+        Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]]
+    ]:
+        """
+        Get the up-to-date entry for a template file.
+
+        Args:
+            path: Path of the template file
+            old: The file's entry in the stored manifest, if any
+            seen: The file's size, modification time and digest when it was
+                last checked, if known
+
+        Returns:
+            (entry, state, config) tuple. entry is old itself if it is still
+            valid, or None if the file cannot be read. state is the file's
+            size, modification time and digest. config is the parsed template
+            if the file had to be parsed, else None.
+        """
+        try:
+            stat = path.stat()
+            state = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            if (
+                old is not None
+                and seen is not None
+                and seen.get("digest") == old.get("digest")
+                and all(seen.get(field) == value for field, value in state.items())
+            ):
+                return old, seen, None
+
+            data = path.read_bytes()
+            digest = hashlib.md5(data).hexdigest()
+            state["digest"] = digest
+            if old is not None and old.get("digest") == digest:
+                # Same content with a new timestamp, e.g. after a checkout
+                return old, state, None
+
+            config = json.loads(data)
+        except (IOError, ValueError) as e:
+            logger.error(f"Error loading template from {path}: {e}")
+            return None, None, None
+
+        entry: Dict[str, Any] = {"digest": digest}
+        if isinstance(config, dict) and "name" in config:
+            entry.update(describe_template(config))
+            return entry, state, config
+        return entry, state, None
+
+    def record(self, file_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record a template that was just written to the templates directory.
+
+        Args:
+            file_name: Name of the template file
+            config: Template configuration
+
+        Returns:
+            The template's manifest entry
+        """
+        entry = describe_template(config)
+        try:
+            data = (self.templates_dir / file_name).read_bytes()
+        except OSError:
+            # Not saved to disk, so there is nothing to index
+            return entry
+        entry["digest"] = hashlib.md5(data).hexdigest()
+        self._files[file_name] = entry
+        self._write()
+        return entry
+
+    def templates(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the entries of all templates, by template name.
+
+        Each entry has the template's name, file, variables, image_upload
+        flag and digest. Where several files define the same template name,
+        the last one wins.
+
+        Returns:
+            Dictionary mapping template names to manifest entries
+        """
+        return {
+            entry["name"]: dict(entry, file=file_name)
+            for file_name, entry in sorted(self._files.items())
+            if entry.get("name")
+        }
+
+
+def _read_json(path: Path) -> Any:
+    """Read a JSON file, or return None if it is missing or invalid."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return None
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write a JSON file atomically, logging (not raising) failures."""
+    try:
+        with atomic_path(path) as tmp:
+            with open(tmp, "w") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+                f.write("\n")
+    except OSError as e:
+        logger.debug(f"Template manifest not saved to {path}: {e}")
+
+
+def build_manifest(
+    templates_dir: Union[str, Path], frozen: bool = False
+) -> TemplateManifest:
+    """
+    Build the manifest of a templates directory.
+
+    setup.py runs this on the built package with frozen=True, so installed
+    packages ship a manifest that is trusted without reading the templates.
+    After adding or editing templates by hand, update the manifest kept in
+    the source tree with:
+
+        python -m dolze_image_templates.core.template_manifest [templates_dir]
+
+    Args:
+        templates_dir: Directory containing template definition files
+        frozen: Whether to mark the manifest as final
+
+    Returns:
+        The rebuilt manifest
+    """
+    manifest = TemplateManifest(templates_dir)
+    manifest.rebuild(frozen)
+    return manifest
+
+
+if __name__ == "__main__":
+    import sys
+
+    default_dir = Path(__file__).resolve().parent.parent / "templates"
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else default_dir
+    manifest = build_manifest(target_dir)
+    print(f"Indexed {len(manifest.templates())} templates in {manifest.path}")
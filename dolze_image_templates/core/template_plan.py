@@ -0,0 +1,432 @@
+"""
+Compiled template plans - parse a template config once, bind variables per render.
+"""
+
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from dolze_image_templates.components import (
+    COMPONENT_CLASSES,
+    Component,
+    create_component_from_config,
+)
+from dolze_image_templates.core.template_engine import Template
+from dolze_image_templates.utils.cache import (
+    LRUCache,
+    image_nbytes,
+    register_memory_cache,
+)
+from dolze_image_templates.utils.metrics import get_metrics
+
+# Matches ${variable} placeholders in template strings
+PLACEHOLDER_PATTERN = re.compile(r"\${([^}]+)}")
+
+# A path from a config root to a value, e.g. ("gradient", "colors", 0)
+SlotPath = Tuple[Union[str, int], ...]
+
+# A compiled string: literal text and (variable name, original placeholder) parts
+StringParts = Tuple[Union[str, Tuple[str, str]], ...]
+
+# Maximum memory used by prerendered static layers (a 2560x2560 canvas is ~26 MB)
+STATIC_LAYER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Prerendered variable-independent base canvases, keyed by plan
+_static_layers = register_memory_cache(
+    "static_layer",
+    LRUCache(max_bytes=STATIC_LAYER_CACHE_MAX_BYTES, sizeof=image_nbytes),
+)
+
+# Render latency and failures per template
+_render_seconds = get_metrics().histogram(
+    "dolze_render_seconds", "Time spent rendering templates.", ("template",)
+)
+_render_errors = get_metrics().counter(
+    "dolze_render_errors_total", "Template renders that raised.", ("template",)
+)
+
+
+def _compile_string(value: str) -> Optional[StringParts]:
+    """
+    Split a string into literal and placeholder parts.
+
+    Args:
+        value: String that may contain ${variable} placeholders
+
+    Returns:
+        Tuple of parts, or None if the string has no placeholders
+    """
+    parts: List[Union[str, Tuple[str, str]]] = []
+    last = 0
+    for match in PLACEHOLDER_PATTERN.finditer(value):
+        if match.start() > last:
+            parts.append(value[last : match.start()])
+        parts.append((match.group(1), match.group(0)))
+        last = match.end()
+
+    if last == 0:
+        return None
+    if last < len(value):
+        parts.append(value[last:])
+    return tuple(parts)
+
+
+def _find_slots(config: Any, path: SlotPath = ()) -> List[Tuple[SlotPath, StringParts]]:
+    """
+    Find every value in a config tree that contains placeholders.
+
+    Args:
+        config: Configuration or part of it
+        path: Path of config from the root
+
+    Returns:
+        List of (path, compiled string) pairs
+    """
+    if isinstance(config, dict):
+        items = config.items()
+    elif isinstance(config, list):
+        items = enumerate(config)
+    elif isinstance(config, str):
+        parts = _compile_string(config)
+        return [(path, parts)] if parts else []
+    else:
+        return []
+
+    slots = []
+    for key, value in items:
+        slots.extend(_find_slots(value, path + (key,)))
+    return slots
+
+
+def _bind_string(parts: StringParts, variables: Dict[str, Any]) -> str:
+    """Substitute variables into a compiled string, keeping unknown placeholders."""
+    return "".join(
+        part if isinstance(part, str) else str(variables.get(part[0], part[1]))
+        for part in parts
+    )
+
+
+def _bind_slots(
+    config: Any,
+    slots: Tuple[Tuple[SlotPath, StringParts], ...],
+    variables: Dict[str, Any],
+) -> Any:
+    """
+    Return a copy of config with variables bound into the given slots.
+
+    Only the containers on the way to a slot are copied; everything else is
+    shared with the compiled config.
+
+    Args:
+        config: Configuration the slots were found in
+        slots: Slots found by _find_slots
+        variables: Dictionary of variables to substitute
+
+    Returns:
+        Configuration with variables substituted
+    """
+    if not slots:
+        return config
+    if slots[0][0] == ():
+        return _bind_string(slots[0][1], variables)
+
+    root = _copy_container(config)
+    copied = {id(root)}
+    for path, parts in slots:
+        container = root
+        for key in path[:-1]:
+            child = container[key]
+            if id(child) not in copied:
+                child = _copy_container(child)
+                copied.add(id(child))
+                container[key] = child
+            container = child
+        container[path[-1]] = _bind_string(parts, variables)
+    return root
+
+
+def _copy_container(value: Any) -> Any:
+    """Shallow-copy a dict or list."""
+    return dict(value) if isinstance(value, dict) else list(value)
+
+
+class ComponentBinding:
+    """
+    A component built once from a config with placeholders.
+
+    Every placeholder is in a field the component can bind (see
+    Component.BINDABLE_FIELDS), so binding only substitutes those fields and
+    sets them on a copy of the prebuilt component.
+    """
+
+    def __init__(
+        self,
+        component: Component,
+        config: Dict[str, Any],
+        slots: Tuple[Tuple[SlotPath, StringParts], ...],
+    ):
+        """
+        Initialize a component binding. Use ComponentBinding.compile to create one.
+
+        Args:
+            component: Component built from config, placeholders and all
+            config: Component configuration
+            slots: Placeholder slots in config
+        """
+        self.component = component
+        # Value and slots (relative to the value) of each field to bind
+        self._fields: Dict[
+            str, Tuple[Any, Tuple[Tuple[SlotPath, StringParts], ...]]
+        ] = {}
+        for path, parts in slots:
+            value, field_slots = self._fields.get(path[0], (config[path[0]], ()))
+            self._fields[path[0]] = (value, field_slots + ((path[1:], parts),))
+
+    def bind(self, variables: Dict[str, Any]) -> Component:
+        """
+        Get a copy of the component with variables bound into its fields.
+
+        Args:
+            variables: Dictionary of variables to substitute
+
+        Returns:
+            The bound copy
+        """
+        return self.component.bind_fields(
+            {
+                field: _bind_slots(value, field_slots, variables)
+                for field, (value, field_slots) in self._fields.items()
+            }
+        )
+
+    @classmethod
+    def compile(
+        cls, config: Dict[str, Any], slots: Tuple[Tuple[SlotPath, StringParts], ...]
+    ) -> Optional["ComponentBinding"]:
+        """
+        Build a component binding, if every slot is in a bindable field.
+
+        Args:
+            config: Component configuration
+            slots: Placeholder slots in config
+
+        Returns:
+            A ComponentBinding, or None if the component must be rebuilt from
+            its bound config on every render
+        """
+        if not isinstance(config, dict):
+            return None
+        component_class = COMPONENT_CLASSES.get(config.get("type"))
+        if component_class is None or any(
+            not path or path[0] not in component_class.BINDABLE_FIELDS
+            for path, _ in slots
+        ):
+            return None
+        component = create_component_from_config(config)
+        if component is None:
+            return None
+        return cls(component, config, slots)
+
+
+class TemplatePlan:
+    """
+    An immutable, pre-parsed render plan for a template configuration.
+
+    Components without placeholders are created once when the plan is
+    compiled and shared by every render. Components whose placeholders are
+    all in bindable fields (e.g. text or image_url) are also created once,
+    with parsed colors, positions and fonts; binding sets only those fields
+    on a shallow copy (see ComponentBinding). Other components keep the
+    exact slots where variables appear and are rebuilt from their bound
+    configuration on every render.
+
+    The leading run of components without placeholders (the static prefix)
+    is rendered once into a cached base canvas, and render() only draws the
+    remaining components on top of a copy of it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        template_config: Dict[str, Any],
+        template_slots: Tuple[Tuple[SlotPath, StringParts], ...],
+        components: Tuple[Tuple[Any, Tuple[Tuple[SlotPath, StringParts], ...]], ...],
+    ):
+        """
+        Initialize a template plan. Use TemplatePlan.from_config to compile one.
+
+        Args:
+            name: Template name
+            template_config: Template-level settings (without components)
+            template_slots: Placeholder slots in the template-level settings
+            components: For each component, with its placeholder slots, either
+                a prebuilt Component (no slots), a ComponentBinding, or its
+                configuration
+        """
+        self.name = name
+        self._template_config = template_config
+        self._template_slots = template_slots
+        self._components = components
+
+        # Template-level placeholders (e.g. a variable background) make every
+        # layer variable-dependent
+        self.static_prefix = 0
+        if not template_slots:
+            for _, slots in components:
+                if slots:
+                    break
+                self.static_prefix += 1
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """Names of all variables referenced by the template, in order of appearance."""
+        names: Dict[str, None] = {}
+        all_slots = list(self._template_slots)
+        for _, slots in self._components:
+            all_slots.extend(slots)
+        for _, parts in all_slots:
+            for part in parts:
+                if not isinstance(part, str):
+                    names.setdefault(part[0])
+        return tuple(names)
+
+    def bind(self, variables: Optional[Dict[str, Any]] = None) -> Template:
+        """
+        Create a template instance with the given variables.
+
+        Args:
+            variables: Dictionary of variables to substitute in the template
+
+        Returns:
+            A Template instance ready to render
+        """
+        return self._bind(variables or {})
+
+    def render(self, variables: Optional[Dict[str, Any]] = None) -> Image.Image:
+        """
+        Render the template with the given variables.
+
+        Args:
+            variables: Dictionary of variables to substitute in the template
+
+        Returns:
+            Rendered image
+        """
+        variables = variables or {}
+        name = self._template_config.get("name", "")
+        start = time.perf_counter()
+        try:
+            static_layer = self._get_static_layer()
+            if static_layer is None:
+                image = self._bind(variables).render()
+            else:
+                template = self._bind(variables, start=self.static_prefix)
+                image = template.render(base_image=static_layer)
+        except Exception:
+            _render_errors.inc(template=name)
+            raise
+        _render_seconds.observe(time.perf_counter() - start, template=name)
+        return image
+
+    def _get_static_layer(self) -> Optional[Image.Image]:
+        """
+        Get the prerendered static prefix, rendering it on first use.
+
+        The layer is only cached once every component in it reports that it
+        rendered completely (e.g. remote images have loaded), so a failed
+        download is retried on the next render rather than cached.
+
+        Returns:
+            The shared base canvas, or None if the template has no static prefix
+        """
+        if not self.static_prefix:
+            return None
+
+        layer = _static_layers.get(self)
+        if layer is None:
+            template = self._new_template(self._template_config)
+            prefix = [
+                component for component, _ in self._components[: self.static_prefix]
+            ]
+            for component in prefix:
+                template.add_component(component)
+            layer = template.render()
+            if all(component.is_cacheable() for component in prefix):
+                _static_layers.put(self, layer)
+        return layer
+
+    def _bind(self, variables: Dict[str, Any], start: int = 0) -> Template:
+        """
+        Create a template instance from the components starting at index start.
+
+        Args:
+            variables: Dictionary of variables to substitute in the template
+            start: Index of the first component to include
+
+        Returns:
+            A Template instance
+        """
+        config = _bind_slots(self._template_config, self._template_slots, variables)
+        template = self._new_template(config)
+        template.component_offset = start
+
+        for component, slots in self._components[start:]:
+            if isinstance(component, ComponentBinding):
+                component = component.bind(variables)
+            elif slots:
+                component = create_component_from_config(
+                    _bind_slots(component, slots, variables)
+                )
+            if component:
+                template.add_component(component)
+
+        return template
+
+    @staticmethod
+    def _new_template(config: Dict[str, Any]) -> Template:
+        """Create an empty template from template-level settings."""
+        return Template(
+            name=config.get("name", "unnamed"),
+            size=(
+                config.get("size", {}).get("width", 800),
+                config.get("size", {}).get("height", 600),
+            ),
+            background_color=tuple(config.get("background_color", (255, 255, 255))),
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "TemplatePlan":
+        """
+        Compile a template configuration into a render plan.
+
+        The configuration must not be modified while the plan is in use.
+
+        Args:
+            config: Template configuration dictionary
+
+        Returns:
+            A new TemplatePlan instance
+        """
+        template_config = {k: v for k, v in config.items() if k != "components"}
+
+        components = []
+        for component_config in config.get("components", []):
+            slots = tuple(_find_slots(component_config))
+            if slots:
+                binding = ComponentBinding.compile(component_config, slots)
+                components.append((binding or component_config, slots))
+                continue
+            component: Optional[Component] = create_component_from_config(
+                component_config
+            )
+            if component:
+                components.append((component, ()))
+
+        return cls(
+            name=config.get("name", "unnamed"),
+            template_config=template_config,
+            template_slots=tuple(_find_slots(template_config)),
+            components=tuple(components),
+        )
@@ -2,14 +2,18 @@
 Template Registry - Single source of truth for all template definitions and logic
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Iterator, Optional, List
 import os
 import json
-import re
 from pathlib import Path
 from PIL import Image
 
 from dolze_image_templates.core.template_engine import Template
+from dolze_image_templates.core.template_manifest import (
+    TemplateManifest,
+    has_image_upload,
+)
+from dolze_image_templates.core.template_plan import TemplatePlan
 from dolze_image_templates.core.font_manager import get_font_manager
 
 
@@ -26,27 +30,54 @@ class TemplateRegistry:
         Args:
             templates_dir: Directory containing template definition files
         """
+        # Parsed configurations, filled as templates are first used
         self.templates: Dict[str, Dict[str, Any]] = {}
+        # Manifest entries of all available templates
+        self._template_info: Dict[str, Dict[str, Any]] = {}
+        self._plans: Dict[str, TemplatePlan] = {}
         self.templates_dir = templates_dir or os.path.join(
             os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates"
         )
+        self._manifest = TemplateManifest(self.templates_dir)
         self._load_templates()
 
     def _load_templates(self) -> None:
-        """Load all templates from the templates directory."""
+        """
+        Index the templates in the templates directory.
+
+        Templates are listed from the directory's manifest; a template's
+        configuration is parsed when it is first used, unless it had to be
+        parsed to bring the manifest up to date.
+        """
         if not os.path.exists(self.templates_dir):
             os.makedirs(self.templates_dir, exist_ok=True)
             return
 
-        # Load all JSON files in the templates directory
-        for file_path in Path(self.templates_dir).glob("*.json"):
-            try:
-                with open(file_path, "r") as f:
-                    template_data = json.load(f)
-                    if isinstance(template_data, dict) and "name" in template_data:
-                        self.templates[template_data["name"]] = template_data
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading template from {file_path}: {e}")
+        self.templates.update(self._manifest.refresh())
+        self._template_info.update(self._manifest.templates())
+
+    def _load_template_file(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse the configuration of an indexed template.
+
+        Args:
+            name: Name of the template
+
+        Returns:
+            Template configuration dictionary or None if it cannot be loaded
+        """
+        file_path = Path(self.templates_dir) / self._template_info[name]["file"]
+        try:
+            with open(file_path, "r") as f:
+                template_data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading template from {file_path}: {e}")
+            return None
+        if not isinstance(template_data, dict) or template_data.get("name") != name:
+            print(f"Template file {file_path} no longer defines template '{name}'")
+            return None
+        self.templates[name] = template_data
+        return template_data
 
     def _has_image_upload(self, config: Any) -> bool:
         """Check if the template configuration contains any image upload fields.
@@ -57,26 +88,7 @@ class TemplateRegistry:
         Returns:
             bool: True if any field value is "${image_url}", False otherwise
         """
-        if isinstance(config, str):
-            return config == "${image_url}"
-
-        if not isinstance(config, (dict, list)):
-            return False
-
-        if isinstance(config, dict):
-            for value in config.values():
-                if value == "${image_url}":
-                    return True
-                if isinstance(value, (dict, list)) and self._has_image_upload(value):
-                    return True
-        elif isinstance(config, list):
-            for item in config:
-                if item == "${image_url}":
-                    return True
-                if isinstance(item, (dict, list)) and self._has_image_upload(item):
-                    return True
-
-        return False
+        return has_image_upload(config)
 
     def get_all_templates(self) -> List[Dict[str, Any]]:
         """
@@ -89,11 +101,11 @@ class TemplateRegistry:
                 - sample_url: str - Placeholder for future sample URL (currently empty string)
         """
         result = []
-        for name, config in self.templates.items():
+        for name, info in self._template_info.items():
             result.append(
                 {
                     "template_name": name,
-                    "isImageUploadPresent": self._has_image_upload(config),
+                    "isImageUploadPresent": info["image_upload"],
                     "sample_url": "",  # Empty for now as per requirements
                 }
             )
@@ -123,9 +135,11 @@ class TemplateRegistry:
         config.setdefault("use_base_image", False)
 
         self.templates[name] = config
+        self._plans.pop(name, None)
 
-        # Save to file
+        # Save to file and index it
         self._save_template(name, config)
+        self._template_info[name] = self._manifest.record(f"{name}.json", config)
 
     def _save_template(self, name: str, config: Dict[str, Any]) -> None:
         """
@@ -153,7 +167,10 @@ class TemplateRegistry:
         Returns:
             Template configuration dictionary or None if not found
         """
-        return self.templates.get(name)
+        config = self.templates.get(name)
+        if config is None and name in self._template_info:
+            config = self._load_template_file(name)
+        return config
 
     def get_template_names(self) -> List[str]:
         """
@@ -162,61 +179,73 @@ class TemplateRegistry:
         Returns:
             List of template names
         """
-        return list(self.templates.keys())
+        return list(self._template_info.keys())
 
-    def create_template_instance(
-        self, name: str, variables: Optional[Dict[str, Any]] = None
-    ) -> Optional[Template]:
+    def get_template_variables(self, name: str) -> Optional[List[str]]:
         """
-        Create a template instance with the given variables.
+        Get the names of the variables a template references, without parsing it.
 
         Args:
             name: Name of the template
-            variables: Dictionary of variables to substitute in the template
 
         Returns:
-            A Template instance or None if the template is not found
+            Variable names in order of first appearance, or None if the
+            template is not found
         """
-        template_config = self.get_template(name)
-        if not template_config:
-            return None
+        info = self._template_info.get(name)
+        return list(info["variables"]) if info else None
 
-        # Create a deep copy of the config to avoid modifying the original
-        config = json.loads(json.dumps(template_config))
+    def get_template_digest(self, name: str) -> Optional[str]:
+        """
+        Get the digest of a template's definition file.
 
-        # Apply variable substitution if variables are provided
-        if variables:
-            config = self._substitute_variables(config, variables)
+        Args:
+            name: Name of the template
 
-        return Template.from_config(config)
+        Returns:
+            MD5 hex digest of the template file, or None if the template is
+            not found or not saved to disk
+        """
+        info = self._template_info.get(name)
+        return info.get("digest") if info else None
 
-    def _substitute_variables(self, config: Any, variables: Dict[str, Any]) -> Any:
+    def get_plan(self, name: str) -> Optional[TemplatePlan]:
         """
-        Recursively substitute variables in the template configuration.
+        Get the compiled render plan for a template, compiling it on first use.
 
         Args:
-            config: Template configuration or part of it
-            variables: Dictionary of variables to substitute
+            name: Name of the template
 
         Returns:
-            Configuration with variables substituted
+            TemplatePlan instance or None if the template is not found
         """
-        if isinstance(config, dict):
-            result = {}
-            for key, value in config.items():
-                result[key] = self._substitute_variables(value, variables)
-            return result
-        elif isinstance(config, list):
-            return [self._substitute_variables(item, variables) for item in config]
-        elif isinstance(config, str):
-            # Replace ${variable} with the corresponding value
-            def replace_match(match):
-                var_name = match.group(1)
-                return str(variables.get(var_name, match.group(0)))
-
-            return re.sub(r"\${([^}]+)}", replace_match, config)
-        else:
-            return config
+        plan = self._plans.get(name)
+        if plan is None:
+            template_config = self.get_template(name)
+            if not template_config:
+                return None
+            plan = TemplatePlan.from_config(template_config)
+            self._plans[name] = plan
+        return plan
+
+    def create_template_instance(
+        self, name: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Optional[Template]:
+        """
+        Create a template instance with the given variables.
+
+        Args:
+            name: Name of the template
+            variables: Dictionary of variables to substitute in the template
+
+        Returns:
+            A Template instance or None if the template is not found
+        """
+        plan = self.get_plan(name)
+        if plan is None:
+            return None
+
+        return plan.bind(variables)
 
     def render_template(
         self,
@@ -235,12 +264,12 @@ class TemplateRegistry:
         Returns:
             Rendered PIL Image or None if rendering fails
         """
-        template = self.create_template_instance(template_name, variables)
-        if not template:
+        plan = self.get_plan(template_name)
+        if plan is None:
             return None
 
         # Render the template
-        rendered_image = template.render()
+        rendered_image = plan.render(variables)
 
         # Save to file if output path is provided
         if output_path:
@@ -249,6 +278,31 @@ class TemplateRegistry:
 
         return rendered_image
 
+    def render_batch(
+        self, template_name: str, variables_list: Iterable[Dict[str, Any]]
+    ) -> Iterator[Image.Image]:
+        """
+        Render a template once for each set of variables.
+
+        The template is resolved and compiled once for the whole batch, and
+        fonts, gradients and static components are shared between renders.
+
+        Args:
+            template_name: Name of the template to render
+            variables_list: Iterable of variable dictionaries, one per image
+
+        Returns:
+            Iterator yielding rendered PIL Images in input order
+
+        Raises:
+            ValueError: If the template is not found
+        """
+        plan = self.get_plan(template_name)
+        if plan is None:
+            raise ValueError(f"Template '{template_name}' not found")
+
+        return (plan.render(variables) for variables in variables_list)
+
 
 # Singleton instance for easy access
 _instance = None
@@ -0,0 +1,360 @@
+"""
+Render tracing - per-component timing hooks for Template.render.
+
+Install a tracer with set_render_tracer (or the trace_renders context
+manager) and every Template.render reports each component's type, index,
+wall time, cache hits and misses and, optionally, Python allocations. With
+no tracer installed, rendering only pays for one global lookup per template.
+"""
+
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Number of renders a TraceRecorder keeps by default
+DEFAULT_TRACE_HISTORY = 1000
+
+
+class ComponentTrace:
+    """Measurements of one component drawn during a traced render."""
+
+    __slots__ = (
+        "index",
+        "component_type",
+        "wall_ms",
+        "alloc_bytes",
+        "cache_hits",
+        "cache_misses",
+    )
+
+    def __init__(
+        self,
+        index: int,
+        component_type: str,
+        wall_ms: float,
+        alloc_bytes: Optional[int],
+        cache_hits: int,
+        cache_misses: int,
+    ):
+        """
+        Initialize a component trace.
+
+        Args:
+            index: Index of the component in the template configuration
+            component_type: Component type (e.g. 'text', 'image')
+            wall_ms: Wall time spent drawing the component, in milliseconds
+            alloc_bytes: Peak Python heap growth while drawing, or None if
+                allocations were not measured
+            cache_hits: In-memory cache hits while drawing
+            cache_misses: In-memory cache misses while drawing
+        """
+        self.index = index
+        self.component_type = component_type
+        self.wall_ms = wall_ms
+        self.alloc_bytes = alloc_bytes
+        self.cache_hits = cache_hits
+        self.cache_misses = cache_misses
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the trace as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (
+            f"ComponentTrace(index={self.index}, type={self.component_type!r}, "
+            f"wall_ms={self.wall_ms:.2f})"
+        )
+
+
+class RenderTrace:
+    """Measurements of one traced Template.render call."""
+
+    def __init__(self, template: str, size: Tuple[int, int]):
+        """
+        Initialize a render trace.
+
+        Args:
+            template: Template name
+            size: Canvas size (width, height)
+        """
+        self.template = template
+        self.size = size
+        self.fetch_ms = 0.0
+        self.total_ms = 0.0
+        self.components: List[ComponentTrace] = []
+
+    def slowest(self, count: int = 3) -> List[ComponentTrace]:
+        """
+        Get the components that took longest to draw.
+
+        Args:
+            count: Number of components to return
+
+        Returns:
+            Component traces, slowest first
+        """
+        return sorted(self.components, key=lambda c: c.wall_ms, reverse=True)[:count]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the trace as a dictionary."""
+        return {
+            "template": self.template,
+            "size": list(self.size),
+            "fetch_ms": self.fetch_ms,
+            "total_ms": self.total_ms,
+            "components": [c.to_dict() for c in self.components],
+        }
+
+
+class RenderTracer:
+    """
+    Base class for render tracers.
+
+    Override the callbacks of interest. start_component and end_component
+    are called around each component's draw; end_render is called with the
+    complete trace once the template is rendered. Callbacks run on the
+    rendering thread, so they should be quick.
+    """
+
+    # Measure Python heap growth per component with tracemalloc (slow)
+    measure_allocations = False
+
+    def start_render(self, template: Any) -> None:
+        """
+        Called before a template starts rendering.
+
+        Args:
+            template: The Template being rendered
+        """
+
+    def start_component(self, template: Any, index: int, component: Any) -> None:
+        """
+        Called before a component is drawn.
+
+        Args:
+            template: The Template being rendered
+            index: Index of the component in the template configuration
+            component: The component about to be drawn
+        """
+
+    def end_component(self, template: Any, trace: ComponentTrace) -> None:
+        """
+        Called after a component is drawn.
+
+        Args:
+            template: The Template being rendered
+            trace: Measurements of the component
+        """
+
+    def end_render(self, trace: RenderTrace) -> None:
+        """
+        Called after a template is rendered.
+
+        Args:
+            trace: Measurements of the render
+        """
+
+
+class TraceRecorder(RenderTracer):
+    """
+    Tracer that keeps the traces of recent renders and summarizes them.
+
+    Example:
+        ```python
+        with trace_renders(TraceRecorder()) as recorder:
+            render_template("product_showcase", variables)
+        print(recorder.summary())
+        ```
+    """
+
+    def __init__(
+        self,
+        max_renders: int = DEFAULT_TRACE_HISTORY,
+        measure_allocations: bool = False,
+    ):
+        """
+        Initialize the recorder.
+
+        Args:
+            max_renders: Number of most recent renders to keep
+            measure_allocations: Measure Python heap growth per component.
+                This starts tracemalloc, which slows rendering down noticeably.
+        """
+        self.measure_allocations = measure_allocations
+        self._traces: Deque[RenderTrace] = deque(maxlen=max_renders)
+        self._lock = threading.Lock()
+
+    def end_render(self, trace: RenderTrace) -> None:
+        with self._lock:
+            self._traces.append(trace)
+
+    @property
+    def traces(self) -> List[RenderTrace]:
+        """Traces of the recorded renders, oldest first."""
+        with self._lock:
+            return list(self._traces)
+
+    def clear(self) -> None:
+        """Forget all recorded renders."""
+        with self._lock:
+            self._traces.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Summarize the recorded renders per template and component.
+
+        Returns:
+            Dictionary mapping template names to dictionaries mapping
+            "<index>:<type>" component labels to their render count and
+            total, mean and maximum wall time in milliseconds
+        """
+        summary: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for trace in self.traces:
+            components = summary.setdefault(trace.template, {})
+            for component in trace.components:
+                label = f"{component.index}:{component.component_type}"
+                stats = components.setdefault(
+                    label, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+                )
+                stats["count"] += 1
+                stats["total_ms"] += component.wall_ms
+                stats["max_ms"] = max(stats["max_ms"], component.wall_ms)
+        for components in summary.values():
+            for stats in components.values():
+                stats["mean_ms"] = stats["total_ms"] / stats["count"]
+        return summary
+
+
+# Tracer used by Template.render when none is passed explicitly
+_render_tracer: Optional[RenderTracer] = None
+
+# Whether set_render_tracer started tracemalloc (and so should stop it)
+_started_tracemalloc = False
+
+
+def get_render_tracer() -> Optional[RenderTracer]:
+    """
+    Get the installed render tracer.
+
+    Returns:
+        The tracer, or None if tracing is disabled
+    """
+    return _render_tracer
+
+
+def set_render_tracer(tracer: Optional[RenderTracer]) -> Optional[RenderTracer]:
+    """
+    Install a tracer for all template renders.
+
+    Args:
+        tracer: Tracer to install, or None to disable tracing
+
+    Returns:
+        The previously installed tracer
+    """
+    global _render_tracer, _started_tracemalloc
+    previous = _render_tracer
+    measure_allocations = tracer is not None and tracer.measure_allocations
+    if measure_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    elif not measure_allocations and _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+    _render_tracer = tracer
+    return previous
+
+
+@contextmanager
+def trace_renders(tracer: Optional[RenderTracer] = None) -> Iterator[RenderTracer]:
+    """
+    Trace the renders made inside a with block.
+
+    Args:
+        tracer: Tracer to install (defaults to a new TraceRecorder)
+
+    Yields:
+        The installed tracer
+    """
+    tracer = tracer if tracer is not None else TraceRecorder()
+    previous = set_render_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_render_tracer(previous)
+
+
+def _cache_counters() -> Tuple[int, int]:
+    """Get the total hits and misses of all in-memory caches."""
+    from dolze_image_templates.utils.cache import memory_cache_counters
+
+    return memory_cache_counters()
+
+
+def _component_type(component: Any) -> str:
+    """Get the configuration type name of a component."""
+    from dolze_image_templates.components import COMPONENT_CLASSES
+
+    for name, cls in COMPONENT_CLASSES.items():
+        if type(component) is cls:
+            return name
+    return type(component).__name__
+
+
+def traced_draw(
+    tracer: RenderTracer,
+    template: Any,
+    trace: RenderTrace,
+    index: int,
+    component: Any,
+    image: Any,
+    copy_per_component: bool,
+) -> Any:
+    """
+    Draw one component, measuring it and reporting it to a tracer.
+
+    Args:
+        tracer: Tracer to report to
+        template: The Template being rendered
+        trace: Trace of the render, which the component trace is added to
+        index: Index of the component in the template configuration
+        component: Component to draw
+        image: Canvas to draw on
+        copy_per_component: Use the component's render_clipped() instead of draw()
+
+    Returns:
+        The canvas with the component drawn on it
+    """
+    tracer.start_component(template, index, component)
+    measure_allocations = tracer.measure_allocations and tracemalloc.is_tracing()
+    if measure_allocations:
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+    hits_before, misses_before = _cache_counters()
+    start = time.perf_counter()
+
+    if copy_per_component:
+        image = component.render_clipped(image)
+    else:
+        image = component.draw(image)
+
+    wall_ms = (time.perf_counter() - start) * 1000
+    hits_after, misses_after = _cache_counters()
+    alloc_bytes = None
+    if measure_allocations:
+        alloc_bytes = max(0, tracemalloc.get_traced_memory()[1] - traced_before)
+
+    component_trace = ComponentTrace(
+        index=index,
+        component_type=_component_type(component),
+        wall_ms=wall_ms,
+        alloc_bytes=alloc_bytes,
+        cache_hits=hits_after - hits_before,
+        cache_misses=misses_after - misses_before,
+    )
+    trace.components.append(component_trace)
+    tracer.end_component(template, component_trace)
+    return image
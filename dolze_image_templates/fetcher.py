@@ -0,0 +1,252 @@
+"""
+Concurrent fetching of remote images over a pooled HTTP session.
+"""
+
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+
+from dolze_image_templates.utils.image_utils import open_image
+from dolze_image_templates.utils.logging_config import get_logger
+from dolze_image_templates.utils.metrics import get_metrics
+
+# Set up logging
+logger = get_logger(__name__)
+
+# Download latency, volume and failures
+_fetch_seconds = get_metrics().histogram(
+    "dolze_fetch_seconds", "Time spent downloading remote images."
+)
+_fetch_bytes = get_metrics().counter(
+    "dolze_fetch_bytes_total", "Bytes of remote images downloaded."
+)
+_fetch_errors = get_metrics().counter(
+    "dolze_fetch_errors_total", "Remote image downloads that failed."
+)
+
+# Default (connect, read) timeout in seconds for image downloads
+DEFAULT_TIMEOUT = (5.0, 15.0)
+
+# Default number of images downloaded at the same time
+DEFAULT_MAX_WORKERS = 8
+
+# Default maximum number of open connections per host
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+
+
+def is_remote_url(source: Optional[str]) -> bool:
+    """Check whether a source string is an http(s) URL."""
+    return isinstance(source, str) and source.startswith(("http://", "https://"))
+
+
+class ImageFetcher:
+    """
+    Downloads and decodes remote images, reusing pooled HTTP connections.
+
+    Downloads are stored in the shared disk cache, so processes sharing the
+    cache directory download each URL once.
+
+    Subclass and override fetch_bytes, or pass a custom session, to serve
+    images from somewhere else (e.g. a local stub in tests, usually with
+    use_disk_cache=False).
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        use_disk_cache: bool = True,
+    ):
+        """
+        Initialize the image fetcher.
+
+        Args:
+            session: HTTP session to use. If None, a pooled session is created.
+            max_workers: Maximum number of images downloaded concurrently
+            max_connections_per_host: Maximum open connections to a single host
+            timeout: Request timeout in seconds, or a (connect, read) tuple
+            use_disk_cache: Whether to keep downloads in the shared disk cache
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.use_disk_cache = use_disk_cache
+        self._owns_session = session is None
+        self.session = session if session is not None else self._create_session()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _create_session(self) -> requests.Session:
+        """Create a pooled HTTP session."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_connections_per_host,
+            pool_block=True,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _check_fork(self) -> None:
+        """
+        Drop state inherited from a parent process after a fork.
+
+        A forked worker inherits the parent's executor without its threads,
+        so work submitted to it would never run, and pooled connections
+        would share sockets with the parent.
+        """
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._executor = None
+        if self._owns_session:
+            self.session = self._create_session()
+
+    def fetch_bytes(self, url: str) -> bytes:
+        """
+        Download the raw bytes of a URL.
+
+        Args:
+            url: URL to download
+
+        Returns:
+            Response body
+
+        Raises:
+            requests.RequestException: If the download fails
+        """
+        self._check_fork()
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            content = response.content
+        except requests.RequestException:
+            _fetch_errors.inc()
+            raise
+        finally:
+            _fetch_seconds.observe(time.perf_counter() - start)
+        _fetch_bytes.inc(len(content))
+        return content
+
+    def fetch_image(
+        self, url: str, target_size: Optional[Tuple[int, int]] = None
+    ) -> Image.Image:
+        """
+        Download and decode an image.
+
+        Args:
+            url: URL of the image
+            target_size: Size the image will be fitted into, if known. Oversized
+                JPEG and WebP images are then decoded at reduced resolution.
+
+        Returns:
+            Decoded PIL Image
+
+        Raises:
+            requests.RequestException: If the download fails
+            IOError: If the data is not a valid image
+        """
+        return open_image(io.BytesIO(self._get_bytes(url)), target_size)
+
+    def _get_bytes(self, url: str) -> bytes:
+        """Get the bytes of a URL from the disk cache, downloading them on a miss."""
+        if not self.use_disk_cache:
+            return self.fetch_bytes(url)
+
+        from dolze_image_templates.utils.cache import get_resource_cache
+
+        return get_resource_cache().get_bytes(
+            "download", url, lambda: self.fetch_bytes(url)
+        )
+
+    def _fetch_or_none(
+        self, url: str, target_size: Optional[Tuple[int, int]] = None
+    ) -> Optional[Image.Image]:
+        try:
+            return self.fetch_image(url, target_size)
+        except (IOError, requests.RequestException) as e:
+            logger.error(f"Error fetching image from {url}: {e}")
+            return None
+
+    def fetch_all(
+        self,
+        urls: Iterable[str],
+        target_sizes: Optional[Mapping[str, Optional[Tuple[int, int]]]] = None,
+    ) -> Dict[str, Optional[Image.Image]]:
+        """
+        Download and decode several images concurrently.
+
+        Args:
+            urls: URLs to fetch (duplicates are fetched once)
+            target_sizes: Optional mapping of URLs to the size each image will
+                be fitted into, passed on to fetch_image
+
+        Returns:
+            Dictionary mapping each URL to its image, or None if it failed
+        """
+        self._check_fork()
+        unique_urls = list(dict.fromkeys(urls))
+        sizes = [(target_sizes or {}).get(url) for url in unique_urls]
+        if len(unique_urls) <= 1:
+            return {
+                url: self._fetch_or_none(url, size)
+                for url, size in zip(unique_urls, sizes)
+            }
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="dolze-fetch"
+                )
+        images = self._executor.map(self._fetch_or_none, unique_urls, sizes)
+        return dict(zip(unique_urls, images))
+
+    def close(self) -> None:
+        """Close pooled connections and stop the download threads."""
+        self._check_fork()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        self.session.close()
+
+
+# Shared fetcher instance
+_fetcher: Optional[ImageFetcher] = None
+
+
+def get_image_fetcher() -> ImageFetcher:
+    """
+    Get the shared image fetcher, creating it on first use.
+
+    Returns:
+        ImageFetcher instance
+    """
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = ImageFetcher()
+    return _fetcher
+
+
+def set_image_fetcher(fetcher: Optional[ImageFetcher]) -> None:
+    """
+    Replace the shared image fetcher (e.g. with a stub in tests).
+
+    Args:
+        fetcher: Fetcher to use, or None to go back to the default
+    """
+    global _fetcher
+    _fetcher = fetcher
@@ -4,14 +4,28 @@ Resource loading and caching for templates.
 
 import os
 import io
-import requests
 from typing import Optional, Union, Tuple, Dict, Any
 from pathlib import Path
 
 from PIL import Image, ImageFont
 
 from dolze_image_templates.exceptions import ResourceError
+from dolze_image_templates.fetcher import get_image_fetcher
 from dolze_image_templates.utils.cache import cached_resource
+from dolze_image_templates.utils.image_utils import (
+    RAW_IMAGE_EXTENSION,
+    load_raw_image,
+    open_image,
+    save_raw_image,
+)
+from dolze_image_templates.utils.metrics import get_metrics
+
+# Fonts loaded from disk, by loader and outcome
+_font_loads = get_metrics().counter(
+    "dolze_font_loads_total",
+    "Fonts loaded from disk (cache misses).",
+    ("source", "result"),
+)
 
 
 def load_font(
@@ -50,8 +64,11 @@ def _load_font_cached(path: str, size: int) -> ImageFont.FreeTypeFont:
     """
     # Check if it's a system font
     try:
-        return ImageFont.truetype(path, size=size)
+        font = ImageFont.truetype(path, size=size)
+        _font_loads.inc(source="resources", result="ok")
+        return font
     except (IOError, OSError):
+        _font_loads.inc(source="resources", result="error")
         # If not a file path, try to load as a system font
         try:
             return ImageFont.load_default()
@@ -69,7 +86,8 @@ def load_image(
 
     Args:
         source: Image source (file path, URL, or binary data).
-        size: Optional target size as (width, height). If provided, the image will be resized.
+        size: Optional target size as (width, height). If provided, the image will be resized,
+            and oversized JPEG and WebP sources are decoded at reduced resolution.
         **kwargs: Additional arguments for image processing.
 
     Returns:
@@ -103,11 +121,7 @@ def _load_remote_image(
         return _load_cached_image(cache_key, size, **kwargs)
     except ResourceError:
         # If not in cache, download and cache it
-        response = requests.get(url, stream=True, timeout=10)
-        response.raise_for_status()
-
-        # Load the image
-        img = Image.open(io.BytesIO(response.content))
+        img = get_image_fetcher().fetch_image(url, size)
 
         # Convert to RGB if necessary
         if img.mode != "RGBA" and img.mode != "RGB":
@@ -136,7 +150,7 @@ def _load_local_image(
         return _load_cached_image(cache_key, size, **kwargs)
     except ResourceError:
         # If not in cache, load from disk
-        img = Image.open(file_path)
+        img = open_image(file_path, size)
 
         # Convert to RGB if necessary
         if img.mode != "RGBA" and img.mode != "RGB":
@@ -162,7 +176,7 @@ def _load_binary_image(
         data = io.BytesIO(data)
 
     # For binary data, we don't cache by default as there's no good cache key
-    img = Image.open(data)
+    img = open_image(data, size)
 
     # Convert to RGB if necessary
     if img.mode != "RGBA" and img.mode != "RGB":
@@ -179,35 +193,48 @@ def _load_cached_image(
     cache_key: str, size: Optional[Tuple[int, int]] = None, **kwargs: Any
 ) -> Image.Image:
     """Load an image from the cache."""
-    from dolze_image_templates.utils.cache import _resource_cache
+    from dolze_image_templates.utils.cache import get_resource_cache
+
+    resource_cache = get_resource_cache()
 
     # Try to load from memory cache first
-    if cache_key in _resource_cache._in_memory_cache:
-        img = _resource_cache._in_memory_cache[cache_key]
-        if size and img.size != size:
-            return img.resize(size, Image.Resampling.LANCZOS)
-        return img
+    img = resource_cache._in_memory_cache.get(cache_key)
 
     # Not in memory cache, try disk cache
-    raise ResourceError("Image not found in cache")
+    if img is None:
+        disk_key = resource_cache._get_cache_key("image", cache_key)
+        cache_path = resource_cache._get_cache_path(disk_key, RAW_IMAGE_EXTENSION)
+        try:
+            img = load_raw_image(cache_path)
+        except IOError:
+            resource_cache.disk_misses += 1
+            raise ResourceError("image", cache_key, "not found in cache")
+        resource_cache._in_memory_cache.put(cache_key, img)
+        resource_cache._mark_accessed(
+            disk_key, cache_path, RAW_IMAGE_EXTENSION, "image"
+        )
+        resource_cache.disk_hits += 1
+
+    if size and img.size != size:
+        return img.resize(size, Image.Resampling.LANCZOS)
+    return img
 
 
 def _save_to_cache(key: str, resource: Any, resource_type: str, **kwargs: Any) -> None:
     """Save a resource to the cache."""
-    from dolze_image_templates.utils.cache import _resource_cache
+    from dolze_image_templates.utils.cache import atomic_path, get_resource_cache
+
+    resource_cache = get_resource_cache()
 
     # Save to memory cache
-    _resource_cache._in_memory_cache[key] = resource
+    resource_cache._in_memory_cache.put(key, resource)
 
-    # Save to disk cache if it's an image
+    # Save to disk cache if it's an image, as raw pixels that load without decoding
     if resource_type == "image" and isinstance(resource, Image.Image):
-        cache_path = _resource_cache._get_cache_path(key, ".png")
-        resource.save(cache_path, "PNG")
-
-        # Update metadata
-        _resource_cache._metadata[key] = {
-            "last_access": 0,  # Will be updated on access
-            "extension": ".png",
-            "resource_type": "image",
-        }
-        _resource_cache._save_metadata()
+        disk_key = resource_cache._get_cache_key(resource_type, key)
+        cache_path = resource_cache._get_cache_path(disk_key, RAW_IMAGE_EXTENSION)
+        with atomic_path(cache_path) as tmp:
+            save_raw_image(resource, tmp)
+
+        # Add the file to the disk cache index
+        resource_cache._record(disk_key, cache_path, RAW_IMAGE_EXTENSION, "image")
@@ -5,7 +5,8 @@ from .image_utils import (
     resize_image,
     apply_rounded_corners,
     add_drop_shadow,
-    create_gradient
+    create_gradient,
+    open_image
 )
 from .validation import (
     validate_color,
@@ -14,15 +15,24 @@ from .validation import (
     validate_font_path,
     validate_template_config
 )
+from .metrics import (
+    get_metrics,
+    get_metrics_snapshot,
+    get_prometheus_metrics
+)
 
 __all__ = [
     'resize_image',
     'apply_rounded_corners',
     'add_drop_shadow',
     'create_gradient',
+    'open_image',
     'validate_color',
     'validate_position',
     'validate_size',
     'validate_font_path',
     'validate_template_config',
+    'get_metrics',
+    'get_metrics_snapshot',
+    'get_prometheus_metrics',
 ]
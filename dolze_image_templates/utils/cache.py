@@ -5,28 +5,85 @@ Caching utilities for frequently used resources like fonts and images.
 import os
 import hashlib
 import json
-from typing import Dict, Any, Optional, Tuple, Union, TypeVar, Callable, Type
+import uuid
+from typing import BinaryIO, Dict, Any, Iterator, List, Optional, Tuple, Union, TypeVar, Callable, Type
 from pathlib import Path
 import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from functools import wraps
-import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
 
 from PIL import Image, ImageFont
 
 from dolze_image_templates.exceptions import ResourceError
+from dolze_image_templates.utils.disk_index import (
+    DiskCacheIndex,
+    INDEX_FILENAME,
+    TEMP_PREFIX,
+)
+from dolze_image_templates.utils.image_utils import (
+    RAW_IMAGE_EXTENSION,
+    load_raw_image,
+    save_raw_image,
+)
+from dolze_image_templates.utils.metrics import MetricFamily, get_metrics
 
 T = TypeVar("T")
 
+# Number of least recently used disk entries removed per cleanup step
+CLEANUP_BATCH_SIZE = 64
+
+# Directory (inside the cache directory) holding per-key lock files
+LOCK_DIRNAME = ".locks"
+
+
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    """
+    Yield a temporary path next to path, renamed over it once written.
+
+    Readers in other processes see either the old file or the complete new
+    one, never a partially written file. The temporary name keeps the
+    extension, so PIL can still infer the image format from it.
+
+    Args:
+        path: Final path of the file
+
+    Yields:
+        Temporary path to write the file to
+    """
+    tmp = path.with_name(f"{TEMP_PREFIX}{uuid.uuid4().hex}-{path.name}")
+    try:
+        yield tmp
+        if tmp.exists():
+            os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
 
 class ResourceCache:
     """
     A simple cache for resources like fonts and images.
 
-    This cache stores resources in memory and optionally persists them to disk.
+    This cache stores resources in a memory-bounded LRU and optionally
+    persists them to disk, tracking the cached files in a DiskCacheIndex.
+    Several processes can share one cache directory: files are written
+    atomically, and a resource missing from the cache is loaded by only one
+    thread or process at a time while the others wait for its result.
     """
 
     def __init__(
-        self, cache_dir: Optional[Union[str, Path]] = None, max_size_mb: int = 100
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_size_mb: int = 100,
+        max_memory_mb: Optional[float] = None,
     ):
         """
         Initialize the resource cache.
@@ -34,8 +91,16 @@ class ResourceCache:
         Args:
             cache_dir: Directory to store cached files. If None, uses system temp dir.
             max_size_mb: Maximum cache size in megabytes.
+            max_memory_mb: Maximum memory used by in-memory entries in megabytes.
+                If None, uses the memory_cache_max_mb setting.
         """
-        self._in_memory_cache: Dict[str, Any] = {}
+        if max_memory_mb is None:
+            from dolze_image_templates.config.settings import get_settings
+
+            max_memory_mb = get_settings().memory_cache_max_mb
+        self._in_memory_cache = LRUCache(
+            max_bytes=int(max_memory_mb * 1024 * 1024), sizeof=resource_nbytes
+        )
         self._cache_dir = (
             Path(cache_dir)
             if cache_dir
@@ -43,29 +108,26 @@ class ResourceCache:
         )
         self._cache_dir.mkdir(parents=True, exist_ok=True)
         self.max_size_bytes = max_size_mb * 1024 * 1024
-        self._metadata_file = self._cache_dir / ".cache_metadata.json"
-        self._metadata: Dict[str, Dict[str, Any]] = self._load_metadata()
+        self._index = DiskCacheIndex(self._cache_dir)
+        self._lock_dir = self._cache_dir / LOCK_DIRNAME
+        self._lock_dir.mkdir(exist_ok=True)
+        # In-process key locks and the number of threads using each, dropped
+        # once no thread is waiting on or holding the lock
+        self._key_locks: Dict[str, Tuple[threading.Lock, int]] = {}
+        self._key_locks_guard = threading.Lock()
+
+        # Disk tier counters, reported by the cache metrics collector
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_evictions = 0
 
         # Clean up old cache entries if needed
         self._cleanup()
 
-    def _load_metadata(self) -> Dict[str, Dict[str, Any]]:
-        """Load cache metadata from disk."""
-        if self._metadata_file.exists():
-            try:
-                with open(self._metadata_file, "r") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
-        return {}
-
-    def _save_metadata(self) -> None:
-        """Save cache metadata to disk."""
-        try:
-            with open(self._metadata_file, "w") as f:
-                json.dump(self._metadata, f, indent=2)
-        except IOError as e:
-            raise ResourceError(f"Failed to save cache metadata: {e}")
+    @property
+    def cache_dir(self) -> Path:
+        """Directory holding the cached files."""
+        return self._cache_dir
 
     def _get_cache_key(self, resource_type: str, *args: Any) -> str:
         """Generate a cache key for the given resource type and arguments."""
@@ -78,48 +140,158 @@ class ResourceCache:
         return self._cache_dir / f"{key}{extension}"
 
     def _get_cache_size(self) -> int:
-        """Calculate the total size of the cache in bytes."""
-        total_size = 0
-        for entry in self._cache_dir.glob("*"):
-            if entry.is_file() and entry.name != ".cache_metadata.json":
-                total_size += entry.stat().st_size
-        return total_size
+        """Get the total size of the cache in bytes."""
+        return self._index.total_size()
 
     def _cleanup(self) -> None:
         """Clean up old cache entries if the cache is too large."""
+        if self._get_cache_size() <= self.max_size_bytes:
+            return
+
+        # Remove the least recently used entries until we're at 90% of max size
         current_size = self._get_cache_size()
+        while current_size > self.max_size_bytes * 0.9:
+            entries = self._index.oldest(CLEANUP_BATCH_SIZE)
+            if not entries:
+                break
+            for key, extension, size in entries:
+                if current_size <= self.max_size_bytes * 0.9:
+                    break
+                self._remove_files(key, extension)
+                self._index.remove(key)
+                self.disk_evictions += 1
+                current_size -= size
 
-        if current_size <= self.max_size_bytes:
-            return
+    def _remove_files(self, key: str, extension: str) -> None:
+        """Delete a cache entry's file and, if it is unused, its lock file."""
+        try:
+            self._get_cache_path(key, extension).unlink()
+        except OSError:
+            pass
+        self._remove_lock_file(key)
 
-        # Sort entries by last access time (oldest first)
-        entries = []
-        for key, meta in self._metadata.items():
-            cache_path = self._get_cache_path(key, meta.get("extension", ""))
-            if cache_path.exists():
-                entries.append(
-                    (key, meta.get("last_access", 0), cache_path.stat().st_size)
-                )
+    def _remove_lock_file(self, key: str) -> None:
+        """
+        Delete a key's lock file unless a thread or process is using it.
 
-        entries.sort(key=lambda x: x[1])
+        The file is only unlinked while locked, and _open_lock_file checks
+        that the file it locked is still in place, so a worker that was
+        waiting on the removed file retries with a new one.
 
-        # Remove oldest entries until we're under the limit
-        for key, _, size in entries:
-            if current_size <= self.max_size_bytes * 0.9:  # Stop at 90% of max size
-                break
+        Args:
+            key: Cache key
+        """
+        if fcntl is None:
+            return
+        path = self._lock_dir / f"{key}.lock"
+        lock = self._use_key_lock(key)
+        try:
+            # Never wait here: eviction can run while another key is locked
+            if not lock.acquire(blocking=False):
+                return
+            try:
+                with open(path, "rb") as lock_file:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(path)):
+                        path.unlink()
+            except OSError:
+                pass
+            finally:
+                lock.release()
+        finally:
+            self._release_key_lock(key)
+
+    def _use_key_lock(self, key: str) -> threading.Lock:
+        """Get a key's in-process lock, registering this thread as a user."""
+        with self._key_locks_guard:
+            lock, users = self._key_locks.get(key, (None, 0))
+            if lock is None:
+                lock = threading.Lock()
+            self._key_locks[key] = (lock, users + 1)
+            return lock
+
+    def _release_key_lock(self, key: str) -> None:
+        """Unregister a user of a key's in-process lock, dropping it if unused."""
+        with self._key_locks_guard:
+            lock, users = self._key_locks[key]
+            if users > 1:
+                self._key_locks[key] = (lock, users - 1)
+            else:
+                del self._key_locks[key]
+
+    def _open_lock_file(self, key: str) -> BinaryIO:
+        """
+        Open a key's lock file and wait for an exclusive advisory lock on it.
 
+        Args:
+            key: Cache key
+
+        Returns:
+            The locked file; closing it releases the lock
+        """
+        path = self._lock_dir / f"{key}.lock"
+        while True:
+            lock_file = open(path, "ab")
             try:
-                cache_path = self._get_cache_path(
-                    key, self._metadata[key].get("extension", "")
-                )
-                if cache_path.exists():
-                    cache_path.unlink()
-                del self._metadata[key]
-                current_size -= size
-            except (KeyError, OSError):
-                continue
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                # Eviction may have removed the file while we were waiting
+                if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(path)):
+                    return lock_file
+            except FileNotFoundError:
+                pass
+            except BaseException:
+                lock_file.close()
+                raise
+            lock_file.close()
+
+    @contextmanager
+    def _key_lock(self, key: str) -> Iterator[None]:
+        """
+        Hold a lock on a cache key, shared by all threads and processes.
+
+        Threads in this process wait on an in-process lock; processes wait on
+        an advisory lock on the key's lock file (where fcntl is available).
+
+        Args:
+            key: Cache key
+        """
+        lock = self._use_key_lock(key)
+        try:
+            with lock:
+                if fcntl is None:
+                    yield
+                    return
+                with self._open_lock_file(key):
+                    yield
+        finally:
+            self._release_key_lock(key)
+
+    def _mark_accessed(
+        self, key: str, path: Path, extension: str, resource_type: str
+    ) -> None:
+        """Record a disk cache hit in the index."""
+        if key in self._index:
+            self._index.touch(key)
+        else:
+            self._record(key, path, extension, resource_type)
 
-        self._save_metadata()
+    def _record(self, key: str, path: Path, extension: str, resource_type: str) -> None:
+        """
+        Add a file written to the cache directory to the index.
+
+        Args:
+            key: Cache key
+            path: Path of the cached file
+            extension: File extension of the cached file
+            resource_type: Type of the cached resource
+        """
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        self._index.put(key, size, extension, resource_type)
+        if self._get_cache_size() > self.max_size_bytes:
+            self._cleanup()
 
     def get(
         self, resource_type: str, loader: Callable[..., T], *args: Any, **kwargs: Any
@@ -143,49 +315,117 @@ class ResourceCache:
         extension = kwargs.pop("extension", "")
 
         # Check in-memory cache first
-        if key in self._in_memory_cache:
-            return self._in_memory_cache[key]
+        resource = self._in_memory_cache.get(key)
+        if resource is not None:
+            return resource
 
         cache_path = self._get_cache_path(key, extension)
 
         # Try to load from disk cache
-        if cache_path.exists():
+        resource = self._load_cached_file(
+            key, cache_path, extension, resource_type, **kwargs
+        )
+        if resource is not None:
+            return resource
+
+        # Load the resource, once across all threads and processes
+        with self._key_lock(key):
+            # Another worker may have stored it while we were waiting
+            resource = self._load_cached_file(
+                key, cache_path, extension, resource_type, **kwargs
+            )
+            if resource is not None:
+                return resource
+
+            self.disk_misses += 1
             try:
-                resource = self._load_from_disk(cache_path, resource_type, **kwargs)
-                self._in_memory_cache[key] = resource
-                self._metadata[key] = {
-                    "last_access": time.time(),
-                    "extension": extension,
-                    "resource_type": resource_type,
-                }
-                self._save_metadata()
+                resource = loader(*args, **kwargs)
+                self._in_memory_cache.put(key, resource)
+
+                # Save to disk if it's a supported type
+                if resource is not None:
+                    self._save_to_disk(resource, cache_path, resource_type)
+                    self._record(key, cache_path, extension, resource_type)
+
                 return resource
             except Exception as e:
-                # If loading from disk fails, try to load fresh
-                pass
+                raise ResourceError(f"Failed to load resource: {e}")
 
-        # Load the resource
-        try:
-            resource = loader(*args, **kwargs)
-            self._in_memory_cache[key] = resource
+    def get_bytes(
+        self, resource_type: str, source: str, loader: Callable[[], bytes]
+    ) -> bytes:
+        """
+        Get raw bytes (e.g. a download) from the disk cache, loading them if necessary.
 
-            # Save to disk if it's a supported type
-            if resource is not None:
-                self._save_to_disk(resource, cache_path, resource_type)
-                self._metadata[key] = {
-                    "last_access": time.time(),
-                    "extension": extension,
-                    "resource_type": resource_type,
-                }
-                self._save_metadata()
+        On a miss, only one thread or process calls loader; the others wait
+        and read its result from disk. The bytes are not kept in memory.
 
-            return resource
-        except Exception as e:
-            raise ResourceError(f"Failed to load resource: {e}")
+        Args:
+            resource_type: Type of resource (e.g., 'download').
+            source: Identifier of the bytes, such as a URL.
+            loader: Function returning the bytes if they are not cached.
+
+        Returns:
+            The cached or loaded bytes. Errors raised by loader propagate.
+        """
+        key = self._get_cache_key(resource_type, source)
+        cache_path = self._get_cache_path(key)
+
+        data = self._read_cached_bytes(key, cache_path, resource_type)
+        if data is not None:
+            return data
+
+        with self._key_lock(key):
+            # Another worker may have stored it while we were waiting
+            data = self._read_cached_bytes(key, cache_path, resource_type)
+            if data is not None:
+                return data
+
+            self.disk_misses += 1
+            data = loader()
+            with atomic_path(cache_path) as tmp:
+                tmp.write_bytes(data)
+            self._record(key, cache_path, "", resource_type)
+            return data
+
+    def _load_cached_file(
+        self,
+        key: str,
+        path: Path,
+        extension: str,
+        resource_type: str,
+        **kwargs: Any,
+    ) -> Any:
+        """Load a resource from the disk cache, or return None on a miss."""
+        if not path.exists():
+            return None
+        try:
+            resource = self._load_from_disk(path, resource_type, **kwargs)
+        except Exception:
+            # If loading from disk fails, try to load fresh
+            return None
+        self._in_memory_cache.put(key, resource)
+        self._mark_accessed(key, path, extension, resource_type)
+        self.disk_hits += 1
+        return resource
+
+    def _read_cached_bytes(
+        self, key: str, path: Path, resource_type: str
+    ) -> Optional[bytes]:
+        """Read bytes from the disk cache, or return None on a miss."""
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        self._mark_accessed(key, path, "", resource_type)
+        self.disk_hits += 1
+        return data
 
     def _load_from_disk(self, path: Path, resource_type: str, **kwargs: Any) -> Any:
         """Load a resource from disk."""
         if resource_type == "image":
+            if path.suffix == RAW_IMAGE_EXTENSION:
+                return load_raw_image(path)
             return Image.open(path)
         elif resource_type == "font":
             size = kwargs.get("size", 12)
@@ -198,9 +438,17 @@ class ResourceCache:
                 return f.read()
 
     def _save_to_disk(self, resource: Any, path: Path, resource_type: str) -> None:
-        """Save a resource to disk."""
+        """Save a resource to disk atomically."""
+        with atomic_path(path) as tmp:
+            self._write_to_disk(resource, tmp, resource_type)
+
+    def _write_to_disk(self, resource: Any, path: Path, resource_type: str) -> None:
+        """Write a resource to a file."""
         if resource_type == "image":
-            resource.save(path)
+            if path.suffix == RAW_IMAGE_EXTENSION:
+                save_raw_image(resource, path)
+            else:
+                resource.save(path)
         elif resource_type == "font":
             # Fonts are already files, just copy them
             if hasattr(resource, "path"):
@@ -221,17 +469,224 @@ class ResourceCache:
         """Clear the cache."""
         self._in_memory_cache.clear()
         for path in self._cache_dir.glob("*"):
-            if path.is_file() and path.name != ".cache_metadata.json":
+            if path.is_file() and not path.name.startswith(
+                (INDEX_FILENAME, TEMP_PREFIX)
+            ):
                 try:
                     path.unlink()
                 except OSError:
                     continue
-        self._metadata = {}
-        self._save_metadata()
+        self._index.clear()
 
 
-# Global cache instance
-_resource_cache = ResourceCache()
+class LRUCache:
+    """
+    A thread-safe in-memory LRU cache bounded by entry count and/or bytes.
+
+    Values are returned as stored, so callers must treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        """
+        Initialize the LRU cache.
+
+        Args:
+            max_entries: Maximum number of entries (None for unbounded).
+            max_bytes: Maximum total cost of all entries (None for unbounded).
+            sizeof: Function returning the cost of a value in bytes. Defaults
+                to a cost of 1 per entry.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 1)
+        self._entries: "OrderedDict[Any, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Get a value and mark it as most recently used.
+
+        Args:
+            key: Cache key.
+            default: Value returned when the key is missing.
+
+        Returns:
+            The cached value or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Any, value: Any) -> None:
+        """
+        Store a value, evicting least recently used entries to fit the budget.
+
+        Values larger than the whole byte budget are not cached.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+        """
+        size = self._sizeof(value)
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self._over_budget():
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get_or_create(self, key: Any, factory: Callable[[], T]) -> T:
+        """
+        Get a value, creating and storing it with factory on a miss.
+
+        Args:
+            key: Cache key.
+            factory: Zero-argument function producing the value.
+
+        Returns:
+            The cached or newly created value.
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            return True
+        if self.max_bytes is not None and self.current_bytes > self.max_bytes:
+            return True
+        return False
+
+    def _remove(self, key: Any) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def set_max_bytes(self, max_bytes: Optional[int]) -> None:
+        """
+        Change the byte budget, evicting entries if the cache is now over it.
+
+        Args:
+            max_bytes: New maximum total cost (None for unbounded).
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._entries and self._over_budget():
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get entry count, size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def image_nbytes(image: Image.Image) -> int:
+    """Get the in-memory pixel cost of an image (width * height * bands)."""
+    return image.width * image.height * len(image.getbands())
+
+
+# Nominal cost charged for cached resources that are not images or bytes
+DEFAULT_RESOURCE_NBYTES = 1024
+
+
+def resource_nbytes(resource: Any) -> int:
+    """Get the approximate in-memory cost of a cached resource."""
+    if isinstance(resource, Image.Image):
+        return image_nbytes(resource)
+    if isinstance(resource, (bytes, bytearray)):
+        return len(resource)
+    return DEFAULT_RESOURCE_NBYTES
+
+
+# Named in-memory caches, reported by get_cache_info() and cleared by clear_cache()
+_memory_caches: Dict[str, LRUCache] = {}
+
+
+def register_memory_cache(name: str, cache: LRUCache) -> LRUCache:
+    """
+    Register an in-memory cache so it is included in cache info and clearing.
+
+    Args:
+        name: Name the cache is reported under.
+        cache: The cache instance.
+
+    Returns:
+        The registered cache, for convenient module-level assignment.
+    """
+    _memory_caches[name] = cache
+    return cache
+
+
+# Shared cache instance, created on first use so importing the package does
+# not touch the cache directory
+_shared_cache: Optional[ResourceCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_resource_cache() -> ResourceCache:
+    """
+    Get the shared resource cache, creating it on first use.
+
+    Returns:
+        ResourceCache instance
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = ResourceCache()
+    return _shared_cache
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `from dolze_image_templates.utils.cache import _resource_cache` working
+    if name == "_resource_cache":
+        return get_resource_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def cached_resource(
@@ -251,23 +706,105 @@ def cached_resource(
         @wraps(loader)
         def wrapper(*args: Any, **kwargs: Any) -> T:
             cache_key = (resource_type,) + args + tuple(sorted(kwargs.items()))
-            return _resource_cache.get(resource_type, loader, *args, **kwargs)
+            return get_resource_cache().get(resource_type, loader, *args, **kwargs)
 
         return wrapper
 
     return decorator
 
 
+def apply_settings(settings: Any) -> None:
+    """
+    Apply cache-related settings to the live caches.
+
+    Args:
+        settings: Settings instance
+    """
+    # A cache created later reads the settings itself
+    if _shared_cache is not None:
+        _shared_cache._in_memory_cache.set_max_bytes(
+            int(settings.memory_cache_max_mb * 1024 * 1024)
+        )
+
+
+def _collect_cache_metrics() -> List[MetricFamily]:
+    """Report hit, miss and eviction counts and sizes of every cache tier."""
+    hits, misses, evictions, entries, size = [], [], [], [], []
+    caches = list(_memory_caches.items())
+    if _shared_cache is not None:
+        caches.append(("resource", _shared_cache._in_memory_cache))
+    for name, cache in caches:
+        labels = {"cache": name, "tier": "memory"}
+        hits.append((labels, cache.hits))
+        misses.append((labels, cache.misses))
+        evictions.append((labels, cache.evictions))
+        entries.append((labels, len(cache)))
+        size.append((labels, cache.current_bytes))
+    if _shared_cache is not None:
+        labels = {"cache": "resource", "tier": "disk"}
+        hits.append((labels, _shared_cache.disk_hits))
+        misses.append((labels, _shared_cache.disk_misses))
+        evictions.append((labels, _shared_cache.disk_evictions))
+        entries.append((labels, len(_shared_cache._index)))
+        size.append((labels, _shared_cache._get_cache_size()))
+    return [
+        ("dolze_cache_hits_total", "counter", "Cache lookups that found an entry.", hits),
+        (
+            "dolze_cache_misses_total",
+            "counter",
+            "Cache lookups that found no entry.",
+            misses,
+        ),
+        (
+            "dolze_cache_evictions_total",
+            "counter",
+            "Entries evicted to stay within the cache budget.",
+            evictions,
+        ),
+        ("dolze_cache_entries", "gauge", "Entries currently in the cache.", entries),
+        ("dolze_cache_bytes", "gauge", "Bytes currently used by the cache.", size),
+    ]
+
+
+get_metrics().register_collector(_collect_cache_metrics)
+
+
+def memory_cache_counters() -> Tuple[int, int]:
+    """
+    Get the total hits and misses of all in-memory caches.
+
+    Returns:
+        (hits, misses) tuple, summed over the named caches and the resource cache
+    """
+    caches = list(_memory_caches.values())
+    if _shared_cache is not None:
+        caches.append(_shared_cache._in_memory_cache)
+    return sum(c.hits for c in caches), sum(c.misses for c in caches)
+
+
 def clear_cache() -> None:
     """Clear all cached resources."""
-    _resource_cache.clear()
+    get_resource_cache().clear()
+    for cache in _memory_caches.values():
+        cache.clear()
 
 
 def get_cache_info() -> Dict[str, Any]:
     """Get information about the cache."""
+    _resource_cache = get_resource_cache()
     return {
         "in_memory_entries": len(_resource_cache._in_memory_cache),
-        "disk_entries": len(_resource_cache._metadata),
+        "in_memory": _resource_cache._in_memory_cache.stats(),
+        "disk_entries": len(_resource_cache._index),
+        "disk_size_mb": _resource_cache._get_cache_size() / (1024 * 1024),
+        "disk": {
+            "hits": _resource_cache.disk_hits,
+            "misses": _resource_cache.disk_misses,
+            "evictions": _resource_cache.disk_evictions,
+        },
         "cache_dir": str(_resource_cache._cache_dir),
         "max_size_mb": _resource_cache.max_size_bytes / (1024 * 1024),
+        "memory_caches": {
+            name: cache.stats() for name, cache in _memory_caches.items()
+        },
     }
@@ -0,0 +1,337 @@
+"""
+SQLite index for the on-disk resource cache.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from dolze_image_templates.exceptions import ResourceError
+from dolze_image_templates.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# File name of the index database inside the cache directory
+INDEX_FILENAME = ".cache_index.sqlite3"
+
+# File name of the JSON metadata written by earlier versions
+LEGACY_METADATA_FILENAME = ".cache_metadata.json"
+
+# Prefix of files still being written, which are not cache entries yet
+TEMP_PREFIX = ".tmp-"
+
+# Pending last-access updates are written once this many have accumulated...
+TOUCH_BATCH_SIZE = 256
+
+# ...or once the oldest pending update is this many seconds old
+TOUCH_FLUSH_INTERVAL = 5.0
+
+# Seconds to wait for another process holding the database lock
+BUSY_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    extension TEXT NOT NULL DEFAULT '',
+    resource_type TEXT NOT NULL DEFAULT '',
+    size INTEGER NOT NULL DEFAULT 0,
+    last_access REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS totals (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES ('entries', 0), ('size', 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET value = value + 1 WHERE name = 'entries';
+    UPDATE totals SET value = value + new.size WHERE name = 'size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET value = value - 1 WHERE name = 'entries';
+    UPDATE totals SET value = value - old.size WHERE name = 'size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET value = value + new.size - old.size WHERE name = 'size';
+END;
+"""
+
+
+class DiskCacheIndex:
+    """
+    An index of cached files, stored in a SQLite database next to them.
+
+    Lookups and updates touch a single row, and the total entry count and
+    size are kept up to date by triggers, so no operation scans the cache
+    directory. Last-access times are buffered and written in batches. The
+    database runs in WAL mode, so several worker processes can share one
+    cache directory.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize the index, creating it on first use.
+
+        An index created for a directory that already holds cached files
+        (e.g. from the JSON metadata of earlier versions) is filled from the
+        existing files.
+
+        Args:
+            cache_dir: Cache directory the index belongs to
+        """
+        self._cache_dir = Path(cache_dir)
+        self._path = self._cache_dir / INDEX_FILENAME
+        self._lock = threading.RLock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._pending: Dict[str, float] = {}
+        self._pending_since = 0.0
+        # Earliest time touch() tries again after a batch failed to write
+        self._retry_at = 0.0
+
+        is_new = not self._path.exists()
+        self._connect()
+        if is_new:
+            self._import_existing_files()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this process's connection, reopening it after a fork."""
+        # A connection inherited from the parent process must not be used
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        try:
+            connection = sqlite3.connect(
+                str(self._path),
+                timeout=BUSY_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+        except sqlite3.Error as e:
+            raise ResourceError("cache index", str(self._path), str(e))
+
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def _execute(self, sql: str, params: Iterable[Any] = ()) -> List[Tuple[Any, ...]]:
+        """Run a statement and return its rows."""
+        with self._lock:
+            try:
+                return self._connect().execute(sql, tuple(params)).fetchall()
+            except sqlite3.Error as e:
+                raise ResourceError("cache index", str(self._path), str(e))
+
+    def _execute_many(self, sql: str, rows: List[Tuple[Any, ...]]) -> None:
+        """Run a statement for each row, in one transaction."""
+        with self._lock:
+            connection = self._connect()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany(sql, rows)
+                connection.execute("COMMIT")
+            except sqlite3.Error as e:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise ResourceError("cache index", str(self._path), str(e))
+
+    def _import_existing_files(self) -> None:
+        """Index files already in the cache directory."""
+        legacy: Dict[str, Dict[str, Any]] = {}
+        legacy_file = self._cache_dir / LEGACY_METADATA_FILENAME
+        if legacy_file.exists():
+            try:
+                with open(legacy_file, "r") as f:
+                    legacy = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+
+        rows = []
+        for path in self._cache_dir.iterdir():
+            if not path.is_file() or path.name.startswith(
+                (INDEX_FILENAME, TEMP_PREFIX)
+            ):
+                continue
+            if path.name == LEGACY_METADATA_FILENAME:
+                continue
+            meta = legacy.get(path.stem, {})
+            rows.append(
+                (
+                    path.stem,
+                    path.suffix,
+                    meta.get("resource_type", ""),
+                    path.stat().st_size,
+                    meta.get("last_access", 0),
+                )
+            )
+
+        self._execute_many("INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+
+        if legacy_file.exists():
+            try:
+                legacy_file.unlink()
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Dictionary with extension, resource_type, size and last_access,
+            or None if the key is not indexed
+        """
+        rows = self._execute(
+            "SELECT extension, resource_type, size, last_access"
+            " FROM entries WHERE key = ?",
+            (key,),
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        return {
+            "extension": row[0],
+            "resource_type": row[1],
+            "size": row[2],
+            "last_access": row[3],
+        }
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self._execute("SELECT 1 FROM entries WHERE key = ?", (key,)))
+
+    def put(
+        self,
+        key: str,
+        size: int,
+        extension: str = "",
+        resource_type: str = "",
+        last_access: Optional[float] = None,
+    ) -> None:
+        """
+        Add or replace an entry.
+
+        Args:
+            key: Cache key
+            size: Size of the cached file in bytes
+            extension: File extension of the cached file
+            resource_type: Type of the cached resource
+            last_access: Access time (defaults to now)
+        """
+        if last_access is None:
+            last_access = time.time()
+        self._execute(
+            "INSERT INTO entries VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT (key) DO UPDATE SET extension = excluded.extension,"
+            " resource_type = excluded.resource_type, size = excluded.size,"
+            " last_access = excluded.last_access",
+            (key, extension, resource_type, size, last_access),
+        )
+
+    def touch(self, key: str) -> None:
+        """
+        Record an access to an entry. The update is written in a later batch.
+
+        A batch that cannot be written (e.g. the database stayed locked by
+        another process) is logged and kept for the next batch, so a cache
+        hit never fails because of the index.
+
+        Args:
+            key: Cache key
+        """
+        now = time.time()
+        with self._lock:
+            if not self._pending:
+                self._pending_since = now
+            self._pending[key] = now
+            if now < self._retry_at:
+                return
+            if (
+                len(self._pending) >= TOUCH_BATCH_SIZE
+                or now - self._pending_since >= TOUCH_FLUSH_INTERVAL
+            ):
+                try:
+                    self.flush()
+                except ResourceError as e:
+                    self._retry_at = now + TOUCH_FLUSH_INTERVAL
+                    logger.warning(f"Cache access times not saved, will retry: {e}")
+
+    def flush(self) -> None:
+        """
+        Write pending last-access updates.
+
+        Raises:
+            ResourceError: If the index cannot be written; the updates stay
+                pending
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            updates = [(t, key) for key, t in self._pending.items()]
+            self._execute_many(
+                "UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?",
+                updates,
+            )
+            self._pending = {}
+
+    def remove(self, key: str) -> None:
+        """
+        Remove an entry from the index (the file is left to the caller).
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._pending.pop(key, None)
+            self._execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def oldest(self, limit: int) -> List[Tuple[str, str, int]]:
+        """
+        Get the least recently accessed entries.
+
+        Args:
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of (key, extension, size) tuples, oldest first
+        """
+        self.flush()
+        return self._execute(
+            "SELECT key, extension, size FROM entries ORDER BY last_access LIMIT ?",
+            (limit,),
+        )
+
+    def total_size(self) -> int:
+        """Get the total size of all indexed files in bytes."""
+        return self._execute("SELECT value FROM totals WHERE name = 'size'")[0][0]
+
+    def __len__(self) -> int:
+        return self._execute("SELECT value FROM totals WHERE name = 'entries'")[0][0]
+
+    def clear(self) -> None:
+        """Remove every entry from the index."""
+        with self._lock:
+            self._pending = {}
+            self._execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Write pending updates and close this process's connection."""
+        with self._lock:
+            try:
+                self.flush()
+            except ResourceError:
+                pass
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
@@ -1,9 +1,75 @@
 """
 Utility functions for image processing.
 """
-from typing import Tuple, Optional
+import mmap
+import struct
+from typing import BinaryIO, Tuple, Optional, Union
+from pathlib import Path
 from PIL import Image, ImageOps, ImageFilter
 
+# Formats decoded at reduced resolution when a target size is known
+REDUCE_ON_LOAD_FORMATS = ("JPEG", "WEBP")
+
+# Oversized images are reduced on load until they are at most this many times
+# larger than the target size; the final resize does the rest
+DEFAULT_REDUCING_GAP = 2.0
+
+# File extension of images stored as raw pixels
+RAW_IMAGE_EXTENSION = ".dzraw"
+
+# Raw image header: magic, mode, width, height, padded to 32 bytes
+RAW_IMAGE_MAGIC = b"DZRAW\x00\x00\x01"
+RAW_IMAGE_HEADER = struct.Struct("<8s8sII8x")
+
+# Modes stored as is; anything else is converted to RGBA first
+RAW_IMAGE_MODES = ("RGBA", "RGB", "L", "LA")
+
+
+def open_image(
+    fp: Union[str, Path, BinaryIO],
+    target_size: Optional[Tuple[int, int]] = None,
+    reducing_gap: float = DEFAULT_REDUCING_GAP,
+) -> Image.Image:
+    """
+    Open and decode an image, reducing oversized JPEG and WebP sources on load.
+
+    When target_size is given, JPEG images are decoded in draft mode at the
+    smallest DCT scale that still covers reducing_gap times the target size,
+    and JPEG and WebP images are then reduced by an integer factor to the
+    same bound. Other formats are decoded at full size. A reduced image keeps
+    its original size in image.info["source_size"], so callers can fit it by
+    the exact source aspect ratio.
+
+    Args:
+        fp: File path or binary file object
+        target_size: Size (width, height) the image will be resized to, if known
+        reducing_gap: How much larger than target_size the result may stay
+
+    Returns:
+        Decoded PIL Image
+    """
+    image = Image.open(fp)
+    if (
+        not target_size
+        or min(target_size) <= 0
+        or image.format not in REDUCE_ON_LOAD_FORMATS
+    ):
+        image.load()
+        return image
+
+    source_size = image.size
+    bound = (target_size[0] * reducing_gap, target_size[1] * reducing_gap)
+    if image.format == "JPEG":
+        image.draft(image.mode, bound)
+    image.load()
+
+    factor = int(min(image.width / bound[0], image.height / bound[1]))
+    if factor > 1:
+        image = image.reduce(factor)
+    if image.size != source_size:
+        image.info["source_size"] = source_size
+    return image
+
 
 def resize_image(
     image: Image.Image,
@@ -167,3 +233,64 @@ def create_gradient(
             draw.line([(0, y), (width, y)], fill=(r, g, b, a))
     
     return gradient
+
+
+def save_raw_image(image: Image.Image, fp: Union[str, Path, BinaryIO]) -> None:
+    """
+    Save decoded pixels with a small header, for fast reloading with load_raw_image.
+
+    Args:
+        image: Image to save (modes other than RGBA, RGB, L and LA become RGBA)
+        fp: File path or binary file object to write to
+    """
+    if image.mode not in RAW_IMAGE_MODES:
+        image = image.convert("RGBA")
+    header = RAW_IMAGE_HEADER.pack(
+        RAW_IMAGE_MAGIC, image.mode.encode("ascii"), image.width, image.height
+    )
+
+    if isinstance(fp, (str, Path)):
+        with open(fp, "wb") as f:
+            f.write(header)
+            f.write(image.tobytes())
+    else:
+        fp.write(header)
+        fp.write(image.tobytes())
+
+
+def load_raw_image(path: Union[str, Path]) -> Image.Image:
+    """
+    Load an image saved by save_raw_image by memory-mapping it.
+
+    RGBA and L images use the mapped file directly as their pixel buffer, so
+    loading does not copy the pixels and processes loading the same file
+    share it through the page cache. The image is read-only; PIL copies it
+    before any in-place modification.
+
+    Args:
+        path: Path of the raw image file
+
+    Returns:
+        PIL Image
+
+    Raises:
+        IOError: If the file is not a valid raw image
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapped) < RAW_IMAGE_HEADER.size:
+        raise IOError(f"Truncated raw image: {path}")
+    magic, mode, width, height = RAW_IMAGE_HEADER.unpack_from(mapped)
+    mode = mode.rstrip(b"\x00").decode("ascii")
+    if magic != RAW_IMAGE_MAGIC or mode not in RAW_IMAGE_MODES:
+        raise IOError(f"Not a raw image: {path}")
+
+    expected = RAW_IMAGE_HEADER.size + width * height * len(mode)
+    if len(mapped) != expected:
+        raise IOError(f"Truncated raw image: {path}")
+    if not width or not height:
+        return Image.new(mode, (width, height))
+
+    pixels = memoryview(mapped)[RAW_IMAGE_HEADER.size :]
+    return Image.frombuffer(mode, (width, height), pixels, "raw", mode, 0, 1)
@@ -0,0 +1,431 @@
+"""
+In-process metrics - counters and histograms for renders, caches, fetches,
+encodes and font loads.
+
+Metrics are kept in a MetricsRegistry in the current process and can be read
+as a plain dictionary (get_metrics_snapshot) or in the Prometheus text
+exposition format (get_prometheus_metrics), e.g. from an HTTP handler that a
+scraper polls. Worker processes of a parallel batch keep their own metrics.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Upper bounds in seconds of the buckets latency histograms count into
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# A metric family as reported by collectors:
+# (name, type, help text, [(labels, value), ...])
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+LabelValues = Tuple[str, ...]
+
+
+class Metric(ABC):
+    """Base class for metrics: a name, help text and label names."""
+
+    type = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ):
+        """
+        Initialize a metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels samples are split by
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, Any]) -> LabelValues:
+        """Get the label values in labelnames order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[Dict[str, Any]]:
+        """Get the current samples as dictionaries."""
+        pass
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget all recorded values."""
+        pass
+
+
+class Counter(Metric):
+    """A monotonically increasing count, optionally split by labels."""
+
+    type = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ):
+        """
+        Initialize a counter.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels samples are split by
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.reset()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount: Amount to add (must not be negative)
+            **labels: Label values
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Get the current value for the given label values."""
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self) -> List[Dict[str, Any]]:
+        """Get the current samples as dictionaries."""
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            {"labels": dict(zip(self.labelnames, key)), "value": value}
+            for key, value in items
+        ]
+
+    def reset(self) -> None:
+        """Forget all recorded values."""
+        with self._lock:
+            self._values.clear()
+            if not self.labelnames:
+                # Report unlabelled counters from the start, as 0
+                self._values[()] = 0.0
+
+
+class Histogram(Metric):
+    """A distribution of observed values, counted into cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        """
+        Initialize a histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels samples are split by
+            buckets: Increasing bucket upper bounds
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: [bucket counts..., count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value (e.g. a duration in seconds)
+            **labels: Label values
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """
+        Observe the wall time of a with block, in seconds.
+
+        Args:
+            **labels: Label values
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Dict[str, Any]]:
+        """Get the current samples as dictionaries with cumulative buckets."""
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        samples = []
+        for key, series in items:
+            cumulative = 0.0
+            buckets = {}
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                buckets[_format_value(bound)] = cumulative
+            buckets["+Inf"] = series[-2]
+            samples.append(
+                {
+                    "labels": dict(zip(self.labelnames, key)),
+                    "count": series[-2],
+                    "sum": series[-1],
+                    "buckets": buckets,
+                }
+            )
+        return samples
+
+    def reset(self) -> None:
+        """Forget all recorded observations."""
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    A set of metrics, plus collectors that report values read at snapshot time.
+
+    Counters and histograms are updated as things happen; collectors report
+    values that are already tracked elsewhere (such as cache statistics)
+    when a snapshot is taken.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], List[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, *args: Any, **kwargs: Any) -> Any:
+        """Get the metric registered under name, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(
+                    f"Metric {name} is already registered as a {metric.type}"
+                )
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """
+        Get a counter, creating it on first use.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels samples are split by
+
+        Returns:
+            Counter instance
+        """
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """
+        Get a histogram, creating it on first use.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels samples are split by
+            buckets: Increasing bucket upper bounds
+
+        Returns:
+            Histogram instance
+        """
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def register_collector(self, collector: Callable[[], List[MetricFamily]]) -> None:
+        """
+        Register a function reporting metric values at snapshot time.
+
+        Args:
+            collector: Function returning a list of
+                (name, type, help text, [(labels, value), ...]) tuples,
+                where type is 'counter' or 'gauge'
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current value of every metric.
+
+        Returns:
+            Dictionary mapping metric names to dictionaries with the metric's
+            type, help text and samples. Counter and gauge samples have labels
+            and value; histogram samples have labels, count, sum and
+            cumulative buckets keyed by upper bound.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        result: Dict[str, Dict[str, Any]] = {}
+        for metric in metrics:
+            result[metric.name] = {
+                "type": metric.type,
+                "help": metric.documentation,
+                "samples": metric.samples(),
+            }
+        for collector in collectors:
+            for name, metric_type, documentation, samples in collector():
+                family = result.setdefault(
+                    name, {"type": metric_type, "help": documentation, "samples": []}
+                )
+                family["samples"].extend(
+                    {"labels": labels, "value": value} for labels, value in samples
+                )
+        return result
+
+    def to_prometheus(self) -> str:
+        """
+        Format the current metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text, ending with a newline
+        """
+        lines = []
+        for name, family in sorted(self.snapshot().items()):
+            lines.append(f"# HELP {name} {_escape_help(family['help'])}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            for sample in family["samples"]:
+                labels = sample["labels"]
+                if family["type"] == "histogram":
+                    for bound, count in sample["buckets"].items():
+                        bucket_labels = dict(labels, le=bound)
+                        lines.append(
+                            f"{name}_bucket{_format_labels(bucket_labels)}"
+                            f" {_format_value(count)}"
+                        )
+                    lines.append(
+                        f"{name}_sum{_format_labels(labels)} {_format_value(sample['sum'])}"
+                    )
+                    lines.append(
+                        f"{name}_count{_format_labels(labels)}"
+                        f" {_format_value(sample['count'])}"
+                    )
+                else:
+                    lines.append(
+                        f"{name}{_format_labels(labels)} {_format_value(sample['value'])}"
+                    )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Reset all counters and histograms (collected values are unaffected)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+def _format_value(value: float) -> str:
+    """Format a number for the text format (integers without a fraction)."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    """Escape help text for the text format."""
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    """Format labels as {name="value",...} (empty for no labels)."""
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+# Registry of the package's metrics
+_metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Get the package's metrics registry.
+
+    Returns:
+        MetricsRegistry instance
+    """
+    return _metrics
+
+
+def get_metrics_snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Get the current value of every package metric as a dictionary.
+
+    Returns:
+        Dictionary as returned by MetricsRegistry.snapshot
+    """
+    return _metrics.snapshot()
+
+
+def get_prometheus_metrics() -> str:
+    """
+    Get the package metrics in the Prometheus text exposition format.
+
+    Returns:
+        Metrics text, served with content type
+        'text/plain; version=0.0.4; charset=utf-8'
+    """
+    return _metrics.to_prometheus()
@@ -1,4 +1,26 @@
+import os
+import sys
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithManifest(build_py):
+    """Build the package, then index the built templates in a frozen manifest."""
+
+    def run(self):
+        super().run()
+        if self.dry_run:
+            return
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from dolze_image_templates.core.template_manifest import build_manifest
+
+        templates_dir = os.path.join(
+            self.build_lib, "dolze_image_templates", "templates"
+        )
+        manifest = build_manifest(templates_dir, frozen=True)
+        print(f"Indexed {len(manifest.templates())} templates in {manifest.path}")
+
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -16,9 +38,11 @@ setup(
     package_data={
         "dolze_image_templates": ["templates/*", "fonts/*"],
     },
+    cmdclass={"build_py": BuildPyWithManifest},
     install_requires=[
         "Pillow>=9.0.0",
         "requests>=2.25.0",
+        "numpy>=1.17.0",
     ],
     classifiers=[
         "Programming Language :: Python :: 3",